@@ -50,6 +50,15 @@ class ProcessingConfig(BaseModel):
         default_factory=lambda: _safe_getenv("TOKENIZER_MODEL", DEFAULT_TOKENIZER),
         description="Tokenizer model/encoding name to use.",
     )
+    tokenizer_batch_mode: bool = Field(
+        default=False,
+        description="Tokenize sentences in windows with tiktoken's batch encoder.",
+    )
+    tokenizer_batch_window: int = Field(
+        default=1024,
+        ge=1,
+        description="Number of sentences tokenized per batch call in batch mode.",
+    )
 
     # Semantic Chunking Configuration
     semantic_chunking_mode: bool = Field(
@@ -67,6 +76,19 @@ class ProcessingConfig(BaseModel):
         le=100,
         description="Percentile threshold for breakpoint detection (if using percentile mode).",
     )
+    semantic_chunking_streaming: bool = Field(
+        default=False,
+        description="Chunk in a single pass using an online percentile estimate.",
+    )
+    semantic_chunking_warmup: int = Field(
+        default=64,
+        ge=1,
+        description="Sentence gaps buffered to seed the threshold in streaming semantic chunking.",
+    )
+    semantic_chunking_pool_embeddings: bool = Field(
+        default=False,
+        description="Pool sentence embeddings into chunk embeddings (implies single-pass chunking).",
+    )
 
     # Embedding Configuration
     embedding_model: str = Field(
@@ -76,6 +98,43 @@ class ProcessingConfig(BaseModel):
     embedding_batch_size: int = Field(
         default=32, ge=1, description="Batch size for embedding generation."
     )
+    embedding_adaptive_batching: bool = Field(
+        default=False,
+        description="Split embedding batches into encode calls sized by padded token length.",
+    )
+    embedding_max_batch_tokens: int = Field(
+        default=16384,
+        ge=1,
+        description="Maximum padded tokens per encode call in adaptive batching mode.",
+    )
+    embedding_memory_budget_mb: int | None = Field(
+        default=None,
+        ge=1,
+        description="Memory budget per encode call in adaptive mode (None derives it from free RAM).",
+    )
+    embedding_bytes_per_token: int = Field(
+        # ~256 KiB: a 24-layer, 1024-wide encoder (e.g. multilingual-e5-large) holds about
+        # 4 KiB of fp32 hidden state, 16 KiB of FFN intermediate and up to ~32 KiB of
+        # attention scores (16 heads x 512 positions) per token and layer, and PyTorch
+        # keeps a few layers' worth alive at once during inference.
+        default=256 * 1024,
+        ge=1,
+        description="Estimated activation memory per padded token, used to size adaptive batches.",
+    )
+    embedding_length_bucketing: bool = Field(
+        default=False,
+        description="Sort chunks by length within a window before batching to reduce padding.",
+    )
+    embedding_bucket_window: int = Field(
+        default=512,
+        ge=1,
+        description="Number of chunks read and length-sorted at once in bucketing mode.",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=1_000_000,
+        ge=1,
+        description="Maximum number of entries in the persistent embedding cache (LRU eviction).",
+    )
 
     # Clustering Configuration
     clustering_algorithm: ClusteringAlgorithm = Field(
@@ -97,6 +156,21 @@ class ProcessingConfig(BaseModel):
     umap_n_components: int = Field(
         default=2, ge=2, description="UMAP parameter: Number of dimensions to reduce to."
     )
+    knn_exact_max_samples: int = Field(
+        default=8192,
+        ge=1,
+        description="Largest level whose UMAP k-NN graph is computed exactly (NN-descent above).",
+    )
+    bic_search_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Threads fitting candidate GMMs in parallel during BIC cluster-count selection.",
+    )
+    bic_patience: int | None = Field(
+        default=None,
+        ge=1,
+        description="Stop the BIC search after this many consecutive rises (None tries every count).",
+    )
     write_batch_size: int = Field(
         default=1000,
         ge=1,
@@ -154,6 +228,41 @@ class ProcessingConfig(BaseModel):
     max_retries: int = Field(
         default=3, ge=0, description="Maximum number of retries for LLM calls."
     )
+    summarization_concurrency: int = Field(
+        default=1,
+        ge=1,
+        le=64,
+        description="Maximum number of cluster summarization requests in flight at once.",
+    )
+    pipeline_levels: bool = Field(
+        default=False,
+        description="Embed and store each level's summaries while the level is still being summarized.",
+    )
+    pipeline_queue_size: int = Field(
+        default=64,
+        ge=1,
+        description="Maximum number of summaries buffered between pipeline stages.",
+    )
+    llm_requests_per_minute: int | None = Field(
+        default=None,
+        ge=1,
+        description="Shared LLM request budget per minute (None disables the limit).",
+    )
+    llm_tokens_per_minute: int | None = Field(
+        default=None,
+        ge=1,
+        description="Shared LLM token budget per minute, using estimated tokens (None disables).",
+    )
+    llm_cache_ttl_seconds: int | None = Field(
+        default=None,
+        ge=1,
+        description="Time-to-live of cached LLM responses (None keeps them until evicted).",
+    )
+    llm_cache_max_entries: int = Field(
+        default=100_000,
+        ge=1,
+        description="Maximum number of entries in the persistent LLM response cache.",
+    )
     llm_temperature: float = Field(
         default=0.0, ge=0.0, le=1.0, description="Sampling temperature for LLM."
     )
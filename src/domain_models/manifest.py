@@ -1,6 +1,15 @@
 import logging
-
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from collections.abc import Mapping
+from typing import Any
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+    model_validator,
+)
 
 from domain_models.types import Metadata, NodeID
 
@@ -121,13 +130,23 @@ class DocumentTree(BaseModel):
     Designed for scalability:
     - Does not store full leaf chunks in memory to avoid O(N) memory usage for large documents.
     - Stores IDs allowing retrieval from the associated `DiskChunkStore`.
+    - `all_nodes` may be a store-backed mapping (`matome.utils.store.StoredSummaryNodes`)
+      that reads summary nodes on access instead of holding them all in memory.
     """
 
     model_config = ConfigDict(extra="forbid")
 
     root_node: SummaryNode = Field(..., description="The root summary node.")
-    all_nodes: dict[str, SummaryNode] = Field(..., description="Map of all summary nodes by ID.")
+    all_nodes: Mapping[str, SummaryNode] = Field(..., description="Map of all summary nodes by ID.")
     leaf_chunk_ids: list[NodeID] = Field(
         ..., description="IDs of the original leaf chunks (Level 0)."
     )
     metadata: Metadata = Field(default_factory=dict, description="Global metadata for the tree.")
+
+    @field_validator("all_nodes", mode="wrap")
+    @classmethod
+    def keep_lazy_node_mapping(cls, value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+        """Accept lazy (non-dict) node mappings as-is; validating them would load every node."""
+        if isinstance(value, Mapping) and not isinstance(value, dict):
+            return value
+        return handler(value)
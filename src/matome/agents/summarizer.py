@@ -7,36 +7,57 @@ import logging
 import re
 import unicodedata
 import uuid
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from tenacity import Retrying, stop_after_attempt, wait_exponential
 
 from domain_models.config import ProcessingConfig
 from domain_models.constants import PROMPT_INJECTION_PATTERNS
 from matome.config import get_openrouter_api_key, get_openrouter_base_url
 from matome.exceptions import SummarizationError
+from matome.utils.lazy import lazy_import
+from matome.utils.llm_cache import LLMResponseCache
+from matome.utils.llm_invoke import CachedLLMInvoker, resolve_llm_temperature
 from matome.utils.prompts import COD_TEMPLATE
+from matome.utils.rate_limit import TokenBucketRateLimiter
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+else:
+    # langchain_openai (and the openai client) are imported when the first LLM is created
+    ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 
 logger = logging.getLogger(__name__)
 
 
-class SummarizationAgent:
+class SummarizationAgent(CachedLLMInvoker):
     """
     Agent responsible for summarizing text using an LLM.
     """
 
-    def __init__(self, config: ProcessingConfig, llm: ChatOpenAI | None = None) -> None:
+    prompt_template = COD_TEMPLATE
+    error_class = SummarizationError
+
+    def __init__(
+        self,
+        config: ProcessingConfig,
+        llm: "ChatOpenAI | None" = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        response_cache: LLMResponseCache | None = None,
+    ) -> None:
         """
         Initialize the SummarizationAgent.
 
         Args:
             config: Processing configuration containing model name, retries, etc.
             llm: Optional pre-configured LLM instance. If None, it will be initialized from config.
+            rate_limiter: Optional limiter shared with other agents. If None, one is created
+                          from config when `llm_requests_per_minute`/`llm_tokens_per_minute` are set.
         """
         self.config = config
         self.model_name = config.summarization_model
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.from_config(config)
+        self.response_cache = response_cache
 
         # Determine API key and Base URL
         api_key = get_openrouter_api_key()
@@ -45,6 +66,8 @@ class SummarizationAgent:
         self.mock_mode = api_key == "mock"
 
         self.llm: ChatOpenAI | None = None
+        # Sampling temperature the LLM was created with; part of the response cache key
+        self.llm_temperature = resolve_llm_temperature(llm, config.llm_temperature)
 
         if llm:
             self.llm = llm
@@ -73,14 +96,66 @@ class SummarizationAgent:
         effective_config = config or self.config
         request_id = str(uuid.uuid4())
 
+        prepared = self._prepare_messages(text, effective_config, request_id)
+        if isinstance(prepared, str):
+            return prepared
+
+        try:
+            response = self._invoke_llm(prepared, effective_config, request_id)
+            return self._process_response(response, request_id)
+
+        except Exception as e:
+            logger.exception(f"[{request_id}] Summarization failed for text length {len(text)}")
+            msg = f"Summarization failed: {e}"
+            raise SummarizationError(msg) from e
+
+    async def asummarize(self, text: str, config: ProcessingConfig | None = None) -> str:
+        """
+        Asynchronous variant of `summarize` built on `llm.ainvoke`.
+
+        Many calls can be awaited concurrently; the shared rate limiter (if any)
+        keeps the aggregate request and token rate within the configured budget.
+
+        Args:
+            text: The text to summarize.
+            config: Optional config override. Uses self.config if None.
+        """
+        effective_config = config or self.config
+        request_id = str(uuid.uuid4())
+
+        prepared = self._prepare_messages(text, effective_config, request_id)
+        if isinstance(prepared, str):
+            return prepared
+
+        try:
+            response = await self._ainvoke_llm(prepared, effective_config, request_id)
+            return self._process_response(response, request_id)
+
+        except Exception as e:
+            logger.exception(f"[{request_id}] Summarization failed for text length {len(text)}")
+            msg = f"Summarization failed: {e}"
+            raise SummarizationError(msg) from e
+
+    def _prepare_messages(
+        self, text: str, config: ProcessingConfig, request_id: str
+    ) -> list[HumanMessage] | str:
+        """
+        Validate input and build the prompt messages.
+
+        Returns:
+            The messages to send, or a final result string when no LLM call is needed
+            (empty input or mock mode).
+
+        Raises:
+            ValueError: If input validation fails.
+            SummarizationError: If the LLM is not initialized.
+        """
         if not text:
             logger.debug(f"[{request_id}] Skipping empty text summarization.")
             return ""
 
         # Validate input for security
-        self._validate_input(
-            text, effective_config.max_input_length, effective_config.max_word_length
-        )
+        self._validate_input(text, config.max_input_length, config.max_word_length)
 
         # Sanitize prompt injection
         safe_text = self._sanitize_prompt_injection(text)
@@ -94,22 +169,19 @@ class SummarizationAgent:
             logger.error(msg)
             raise SummarizationError(msg)
 
-        if effective_config.summarization_model != self.model_name:
+        if config.summarization_model != self.model_name:
             logger.debug(
-                f"[{request_id}] Config model {effective_config.summarization_model} differs from agent model {self.model_name}. Using agent model."
+                f"[{request_id}] Config model {config.summarization_model} differs from agent model {self.model_name}. Using agent model."
             )
 
-        try:
-            prompt = COD_TEMPLATE.format(context=safe_text)
-            messages = [HumanMessage(content=prompt)]
-
-            response = self._invoke_llm(messages, effective_config, request_id)
-            return self._process_response(response, request_id)
+        prompt = COD_TEMPLATE.format(context=safe_text)
+        return [HumanMessage(content=prompt)]
 
-        except Exception as e:
-            logger.exception(f"[{request_id}] Summarization failed for text length {len(text)}")
-            msg = f"Summarization failed: {e}"
-            raise SummarizationError(msg) from e
+    def _estimate_request_tokens(
+        self, messages: list[HumanMessage], config: ProcessingConfig
+    ) -> int:
+        """Estimate prompt + completion tokens of a request for rate limiting."""
+        return super()._estimate_request_tokens(messages, config) + config.max_summary_tokens
 
     def _validate_input(self, text: str, max_input_length: int, max_word_length: int) -> None:
         """
@@ -186,53 +258,6 @@ class SummarizationAgent:
 
         return sanitized
 
-    def _invoke_llm(
-        self, messages: list[HumanMessage], config: ProcessingConfig, request_id: str
-    ) -> BaseMessage:
-        """
-        Invoke the LLM with exponential backoff retry logic.
-
-        Args:
-            messages: List of LangChain messages to send.
-            config: Configuration containing retry settings.
-            request_id: Unique ID for logging purposes.
-
-        Returns:
-            The response message from the LLM.
-
-        Raises:
-            SummarizationError: If the LLM call fails after all retries or returns no response.
-        """
-        if not self.llm:
-            msg = "LLM not initialized"
-            raise SummarizationError(msg)
-
-        response = None
-        # Use Tenacity for retries based on config
-        for attempt in Retrying(
-            stop=stop_after_attempt(config.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=10),
-            reraise=True,
-        ):
-            with attempt:
-                if attempt.retry_state.attempt_number > 1:
-                    logger.warning(
-                        f"[{request_id}] Retrying LLM call (Attempt {attempt.retry_state.attempt_number}/{config.max_retries})"
-                    )
-
-                # Check if LLM is chat model or simple LLM (though typed as ChatOpenAI)
-                if hasattr(self.llm, "invoke"):
-                    response = self.llm.invoke(messages)
-                else:
-                    # Fallback for mock objects that might not have invoke
-                    response = self.llm(messages)  # type: ignore[operator]
-
-        if not response:
-            msg = f"[{request_id}] No response received from LLM."
-            raise SummarizationError(msg)
-
-        return response
-
     def _process_response(self, response: BaseMessage, request_id: str) -> str:
         """
         Process and extract content from the LLM response.
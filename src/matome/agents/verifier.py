@@ -6,41 +6,65 @@ This module implements the hallucination verification logic using an LLM.
 import json
 import logging
 import uuid
+from typing import TYPE_CHECKING
 
 from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from tenacity import Retrying, stop_after_attempt, wait_exponential
 
 from domain_models.config import ProcessingConfig
 from domain_models.verification import VerificationResult
 from matome.config import get_openrouter_api_key, get_openrouter_base_url
 from matome.exceptions import VerificationError
+from matome.utils.lazy import lazy_import
+from matome.utils.llm_cache import LLMResponseCache
+from matome.utils.llm_invoke import CachedLLMInvoker, resolve_llm_temperature
 from matome.utils.prompts import VERIFICATION_TEMPLATE
+from matome.utils.rate_limit import TokenBucketRateLimiter
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+else:
+    # langchain_openai (and the openai client) are imported when the first LLM is created
+    ChatOpenAI = lazy_import("langchain_openai", "ChatOpenAI")
 
 logger = logging.getLogger(__name__)
 
 
-class VerifierAgent:
+class VerifierAgent(CachedLLMInvoker):
     """
     Agent responsible for verifying summary content against source text.
     """
 
-    def __init__(self, config: ProcessingConfig, llm: ChatOpenAI | None = None) -> None:
+    prompt_template = VERIFICATION_TEMPLATE
+    error_class = VerificationError
+    call_label = "Verification LLM call"
+
+    def __init__(
+        self,
+        config: ProcessingConfig,
+        llm: "ChatOpenAI | None" = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+        response_cache: LLMResponseCache | None = None,
+    ) -> None:
         """
         Initialize the VerifierAgent.
 
         Args:
             config: Processing configuration.
             llm: Optional pre-configured LLM instance.
+            rate_limiter: Optional limiter shared with other agents (e.g. SummarizationAgent).
         """
         self.config = config
         self.model_name = config.verification_model
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.from_config(config)
+        self.response_cache = response_cache
 
         api_key = get_openrouter_api_key()
         base_url = get_openrouter_base_url()
 
         self.mock_mode = api_key == "mock"
         self.llm: ChatOpenAI | None = None
+        # Strict verification; part of the response cache key
+        self.llm_temperature = resolve_llm_temperature(llm, 0.0)
 
         if llm:
             self.llm = llm
@@ -49,7 +73,7 @@ class VerifierAgent:
                 model=self.model_name,
                 api_key=api_key,
                 base_url=base_url,
-                temperature=0.0,  # Strict verification
+                temperature=self.llm_temperature,
                 max_retries=config.max_retries,
                 model_kwargs={"response_format": {"type": "json_object"}},  # Enforce JSON
             )
@@ -69,6 +93,58 @@ class VerifierAgent:
         """
         request_id = str(uuid.uuid4())
 
+        prepared = self._prepare_messages(summary, source_text, request_id)
+        if isinstance(prepared, VerificationResult):
+            return prepared
+
+        try:
+            response = self._invoke_llm(prepared, self.config, request_id)
+            return self._process_response(response, request_id)
+
+        except VerificationError:
+            logger.exception(f"[{request_id}] Verification failed.")
+            raise
+        except Exception as e:
+            logger.exception(f"[{request_id}] Verification failed.")
+            raise self._categorize_error(e, source_text) from e
+
+    async def averify(self, summary: str, source_text: str) -> VerificationResult:
+        """
+        Asynchronous variant of `verify` built on `llm.ainvoke`.
+
+        Args:
+            summary: The generated summary.
+            source_text: The original source text (or combined chunks).
+
+        Returns:
+            VerificationResult containing score and details.
+        """
+        request_id = str(uuid.uuid4())
+
+        prepared = self._prepare_messages(summary, source_text, request_id)
+        if isinstance(prepared, VerificationResult):
+            return prepared
+
+        try:
+            response = await self._ainvoke_llm(prepared, self.config, request_id)
+            return self._process_response(response, request_id)
+
+        except VerificationError:
+            logger.exception(f"[{request_id}] Verification failed.")
+            raise
+        except Exception as e:
+            logger.exception(f"[{request_id}] Verification failed.")
+            raise self._categorize_error(e, source_text) from e
+
+    def _prepare_messages(
+        self, summary: str, source_text: str, request_id: str
+    ) -> list[HumanMessage] | VerificationResult:
+        """
+        Build the verification prompt, or short-circuit with a result when no LLM call is needed.
+
+        Raises:
+            VerificationError: If the LLM is not initialized.
+        """
         if not summary or not source_text:
             logger.warning(f"[{request_id}] Empty summary or source text. Skipping verification.")
             return VerificationResult(
@@ -86,60 +162,31 @@ class VerifierAgent:
             logger.error(msg)
             raise VerificationError(msg)
 
-        try:
-            prompt = VERIFICATION_TEMPLATE.format(source_text=source_text, summary_text=summary)
-            messages = [HumanMessage(content=prompt)]
-
-            response = self._invoke_llm(messages, self.config, request_id)
-            return self._process_response(response, request_id)
-
-        except Exception as e:
-            logger.exception(f"[{request_id}] Verification failed.")
-            if isinstance(e, VerificationError):
-                raise
-
-            # Basic error categorization
-            err_str = str(e).lower()
-            if "context_length_exceeded" in err_str:
-                msg = f"Verification failed: Context length exceeded. (Source length: {len(source_text)})"
-            elif "rate_limit" in err_str:
-                msg = "Verification failed: Rate limit exceeded."
-            else:
-                msg = f"Verification failed: {e}"
-
-            raise VerificationError(msg) from e
+        prompt = VERIFICATION_TEMPLATE.format(source_text=source_text, summary_text=summary)
+        return [HumanMessage(content=prompt)]
 
-    def _invoke_llm(
-        self, messages: list[HumanMessage], config: ProcessingConfig, request_id: str
-    ) -> BaseMessage:
-        """Invoke LLM with retries."""
-        if not self.llm:
-            msg = "LLM not initialized"
-            raise VerificationError(msg)
+    def _categorize_error(self, e: Exception, source_text: str) -> VerificationError:
+        """Map an unexpected exception raised during verification to a VerificationError."""
+        # Basic error categorization
+        err_str = str(e).lower()
+        if "context_length_exceeded" in err_str:
+            msg = (
+                f"Verification failed: Context length exceeded. (Source length: {len(source_text)})"
+            )
+        elif "rate_limit" in err_str:
+            msg = "Verification failed: Rate limit exceeded."
+        else:
+            msg = f"Verification failed: {e}"
 
-        response = None
-        for attempt in Retrying(
-            stop=stop_after_attempt(config.max_retries),
-            wait=wait_exponential(multiplier=1, min=2, max=10),
-            reraise=True,
-        ):
-            with attempt:
-                if attempt.retry_state.attempt_number > 1:
-                    logger.warning(
-                        f"[{request_id}] Retrying Verification LLM call (Attempt {attempt.retry_state.attempt_number})"
-                    )
-
-                # Check invoke capability (standard ChatOpenAI has it)
-                if hasattr(self.llm, "invoke"):
-                    response = self.llm.invoke(messages)
-                else:
-                    response = self.llm(messages)  # type: ignore[operator]
-
-        if not response:
-            msg = f"[{request_id}] No response received from LLM."
-            raise VerificationError(msg)
+        return VerificationError(msg)
 
-        return response
+    def _is_cacheable(self, content: str) -> bool:
+        """Only cache parseable JSON, so a malformed reply is retried on the next run."""
+        try:
+            json.loads(self._extract_json_text(content))
+        except json.JSONDecodeError:
+            return False
+        return True
 
     def _process_response(self, response: BaseMessage, request_id: str) -> VerificationResult:
         """Parse JSON response from LLM."""
@@ -147,12 +194,7 @@ class VerifierAgent:
         if not isinstance(content, str):
             content = str(content)
 
-        # Basic cleanup for JSON
-        content = content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
+        content = self._extract_json_text(content)
 
         try:
             data = json.loads(content)
@@ -169,3 +211,12 @@ class VerifierAgent:
             logger.exception(f"[{request_id}] Validation failed for response data.")
             msg = f"Invalid verification result structure: {e}"
             raise VerificationError(msg) from e
+
+    def _extract_json_text(self, content: str) -> str:
+        """Basic cleanup for JSON (strips Markdown code fences)."""
+        content = content.strip()
+        if content.startswith("```json"):
+            content = content[7:]
+        if content.endswith("```"):
+            content = content[:-3]
+        return content
@@ -1,10 +1,12 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Annotated
 
 import typer
 
 from domain_models.config import ProcessingConfig
+from domain_models.manifest import DocumentTree
 from matome.agents.summarizer import SummarizationAgent
 from matome.agents.verifier import VerifierAgent
 from matome.engines.cluster import GMMClusterer
@@ -13,6 +15,11 @@ from matome.engines.raptor import RaptorEngine
 from matome.engines.token_chunker import JapaneseTokenChunker
 from matome.exporters.markdown import export_to_markdown
 from matome.exporters.obsidian import ObsidianCanvasExporter
+from matome.server import JobManager, create_server
+from matome.utils.embedding_cache import EmbeddingCache
+from matome.utils.knn_cache import KNNGraphCache
+from matome.utils.llm_cache import LLMResponseCache
+from matome.utils.rate_limit import TokenBucketRateLimiter
 from matome.utils.store import DiskChunkStore
 
 # Configure logging to stderr so it doesn't interfere with stdout output if needed
@@ -61,12 +68,49 @@ def run(
         bool, typer.Option("--verify/--no-verify", help="Enable/Disable verification.")
     ] = True,
     max_tokens: Annotated[int, typer.Option(help="Max tokens per chunk.")] = 500,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            help="Directory for persistent caches (embeddings, LLM responses, k-NN graphs) reused across runs.",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    stream: Annotated[
+        bool,
+        typer.Option(
+            "--stream/--no-stream",
+            help="Read the input incrementally instead of loading it whole (for very large files).",
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Resume an interrupted run from the chunks.db in the output directory.",
+        ),
+    ] = False,
+    update: Annotated[
+        bool,
+        typer.Option(
+            "--update",
+            help=(
+                "Incrementally update the tree in the output directory's chunks.db for an "
+                "edited input, re-summarizing only the changed parts."
+            ),
+        ),
+    ] = False,
 ) -> None:
     """
     Run the full summarization pipeline on a text file.
     """
     typer.echo(f"Starting Matome Pipeline for: {input_file}")
 
+    if update and (stream or resume):
+        typer.echo("--update cannot be combined with --stream or --resume.", err=True)
+        raise typer.Exit(code=1)
+
     # ensure output dir exists
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -80,39 +124,94 @@ def run(
         max_tokens=max_tokens,
     )
 
-    try:
-        text = input_file.read_text(encoding="utf-8")
-    except Exception as e:
-        typer.echo(f"Error reading file: {e}", err=True)
-        raise typer.Exit(code=1) from e
+    text: str | None = None
+    if not stream:
+        try:
+            text = input_file.read_text(encoding="utf-8")
+        except Exception as e:
+            typer.echo(f"Error reading file: {e}", err=True)
+            raise typer.Exit(code=1) from e
 
     # Initialize components with progress bars where possible
     # Note: engines don't take tqdm bar directly, but we can wrap iterators if needed.
     # For now, just logging progress steps.
 
     typer.echo("Initializing engines...")
-    chunker = JapaneseTokenChunker()
-    embedder = EmbeddingService(config)
-    clusterer = GMMClusterer()
-    summarizer = SummarizationAgent(config)
-    verifier = VerifierAgent(config) if config.verifier_enabled else None
+    embedding_cache, response_cache, knn_cache = _create_caches(config, cache_dir)
+    engine, verifier = _create_engine(config, embedding_cache, response_cache, knn_cache)
 
     store_path = output_dir / "chunks.db"
     store = DiskChunkStore(db_path=store_path)
 
-    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
-
     typer.echo("Running RAPTOR process (Chunk -> Embed -> Cluster -> Summarize)...")
     # We could add a spinner here
     with typer.progressbar(length=100, label="Processing") as progress:
         # RaptorEngine.run is blocking. We can't easily update progress bar unless we modify RaptorEngine to accept a callback.
         # Given constraints, we'll just run it and rely on logs for detailed progress if verbose.
         # Or we can just show a spinner.
-        tree = engine.run(text, store=store)
+        tree = _build_tree(engine, input_file, text, store, resume=resume, update=update)
         progress.update(100)
 
     typer.echo("Tree construction complete.")
 
+    _verify_and_export(tree, store, verifier, config, output_dir)
+    _echo_cache_stats(embedding_cache, response_cache, knn_cache)
+
+    typer.echo(f"Done! Results saved in {output_dir}")
+
+
+def _create_caches(
+    config: ProcessingConfig, cache_dir: Path | None
+) -> tuple[EmbeddingCache | None, LLMResponseCache | None, KNNGraphCache | None]:
+    """Open the persistent embedding, LLM response and k-NN graph caches in `cache_dir`."""
+    if cache_dir is None:
+        return None, None, None
+
+    embedding_cache = EmbeddingCache(
+        cache_dir / "embeddings.db", config.embedding_cache_max_entries
+    )
+    response_cache = LLMResponseCache(
+        cache_dir / "llm_responses.db",
+        ttl_seconds=config.llm_cache_ttl_seconds,
+        max_entries=config.llm_cache_max_entries,
+    )
+    return embedding_cache, response_cache, KNNGraphCache(cache_dir / "knn")
+
+
+def _create_engine(
+    config: ProcessingConfig,
+    embedding_cache: EmbeddingCache | None,
+    response_cache: LLMResponseCache | None,
+    knn_cache: KNNGraphCache | None = None,
+) -> tuple[RaptorEngine, VerifierAgent | None]:
+    """Create the RAPTOR engine and (if enabled) the verifier, sharing one rate limiter."""
+    # Initialize components with progress bars where possible
+    # Note: engines don't take tqdm bar directly, but we can wrap iterators if needed.
+    # For now, just logging progress steps.
+    chunker = JapaneseTokenChunker()
+    embedder = EmbeddingService(config, cache=embedding_cache)
+    clusterer = GMMClusterer(knn_cache=knn_cache)
+    # One limiter shared by both agents so their calls draw from the same budget
+    rate_limiter = TokenBucketRateLimiter.from_config(config)
+    summarizer = SummarizationAgent(
+        config, rate_limiter=rate_limiter, response_cache=response_cache
+    )
+    verifier = (
+        VerifierAgent(config, rate_limiter=rate_limiter, response_cache=response_cache)
+        if config.verifier_enabled
+        else None
+    )
+    return RaptorEngine(chunker, embedder, clusterer, summarizer, config), verifier
+
+
+def _verify_and_export(
+    tree: DocumentTree,
+    store: DiskChunkStore,
+    verifier: VerifierAgent | None,
+    config: ProcessingConfig,
+    output_dir: Path,
+) -> None:
+    """Verify the root summary (if a verifier is given) and write the exports to `output_dir`."""
     if verifier and config.verifier_enabled:
         typer.echo("Running Verification...")
         # Verify the root node or all summary nodes?
@@ -134,11 +233,8 @@ def run(
 
         # Let's verify the root node against its direct children text combined.
         # Retrieve children
-        child_texts = []
-        for idx in tree.root_node.children_indices:
-            node = store.get_node(idx)
-            if node:
-                child_texts.append(node.text)
+        child_nodes = store.get_nodes(tree.root_node.children_indices, with_embeddings=False)
+        child_texts = [node.text for node in child_nodes if node]
 
         source_text_for_verification = "\n\n".join(child_texts)
 
@@ -162,9 +258,250 @@ def run(
     obs_exporter = ObsidianCanvasExporter(config)
     obs_exporter.export(tree, output_dir / "summary_kj.canvas", store)
 
+
+def _echo_cache_stats(
+    embedding_cache: EmbeddingCache | None,
+    response_cache: LLMResponseCache | None,
+    knn_cache: KNNGraphCache | None = None,
+) -> None:
+    """Print hit/miss counts of the persistent caches that are in use."""
+    caches = (
+        ("Embedding", embedding_cache),
+        ("LLM response", response_cache),
+        ("k-NN graph", knn_cache),
+    )
+    for cache_name, cache in caches:
+        if cache is not None:
+            stats = cache.stats()
+            typer.echo(f"{cache_name} cache: {stats['hits']} hits, {stats['misses']} misses.")
+
+
+@app.command()
+def batch(
+    inputs: Annotated[
+        str,
+        typer.Argument(
+            help="Directory of .txt files, or a glob pattern (e.g. 'docs/**/*.txt').",
+        ),
+    ],
+    *,
+    output_dir: Annotated[
+        Path,
+        typer.Option(
+            "--output-dir",
+            "-o",
+            help="Directory to save the results (one subdirectory per document).",
+            file_okay=False,
+            dir_okay=True,
+            writable=True,
+        ),
+    ] = Path("results"),
+    model: Annotated[
+        str, typer.Option("--model", "-m", help="Summarization model to use.")
+    ] = "openai/gpt-4o-mini",
+    verifier_model: Annotated[
+        str, typer.Option("--verifier-model", "-v", help="Verification model to use.")
+    ] = "openai/gpt-4o-mini",
+    verify: Annotated[
+        bool, typer.Option("--verify/--no-verify", help="Enable/Disable verification.")
+    ] = True,
+    max_tokens: Annotated[int, typer.Option(help="Max tokens per chunk.")] = 500,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            help="Directory for persistent caches (embeddings, LLM responses, k-NN graphs) reused across runs.",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            min=1,
+            help=(
+                "Documents processed at once. With 2 or more, embedding one document "
+                "overlaps summarizing another."
+            ),
+        ),
+    ] = 2,
+) -> None:
+    """
+    Run the summarization pipeline on many text files in one process.
+
+    The embedding model, LLM clients and caches are created once and shared by all
+    documents. Results for each document are saved in `<output-dir>/<file name>/`.
+    """
+    input_files = _resolve_batch_inputs(inputs)
+    if not input_files:
+        typer.echo(f"No input files found for '{inputs}'.", err=True)
+        raise typer.Exit(code=1)
+
+    config = ProcessingConfig(
+        summarization_model=model,
+        verification_model=verifier_model,
+        verifier_enabled=verify,
+        max_tokens=max_tokens,
+    )
+
+    typer.echo(f"Processing {len(input_files)} documents with {workers} workers...")
+    embedding_cache, response_cache, knn_cache = _create_caches(config, cache_dir)
+    engine, verifier = _create_engine(config, embedding_cache, response_cache, knn_cache)
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _process_document, engine, verifier, config, input_file, document_dir
+            ): input_file
+            for input_file, document_dir in _batch_output_dirs(input_files, output_dir)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            input_file = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                logger.exception(f"Failed to process {input_file}")
+                typer.echo(f"[{done}/{len(futures)}] Failed: {input_file}: {e}", err=True)
+            else:
+                typer.echo(f"[{done}/{len(futures)}] Done: {input_file}")
+
+    _echo_cache_stats(embedding_cache, response_cache, knn_cache)
+
+    if failures:
+        typer.echo(f"{failures} of {len(input_files)} documents failed.", err=True)
+        raise typer.Exit(code=1)
     typer.echo(f"Done! Results saved in {output_dir}")
 
 
+@app.command()
+def serve(
+    *,
+    host: Annotated[str, typer.Option(help="Host to listen on.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="Port to listen on.")] = 8765,
+    socket_path: Annotated[
+        Path | None,
+        typer.Option("--socket", help="Listen on this Unix domain socket instead of host/port."),
+    ] = None,
+    workers: Annotated[
+        int, typer.Option("--workers", "-w", min=1, help="Jobs processed at once.")
+    ] = 1,
+    queue_size: Annotated[
+        int, typer.Option("--queue-size", min=1, help="Maximum number of waiting jobs.")
+    ] = 100,
+    output_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--output-dir",
+            "-o",
+            help="Keep each job's chunks.db and summary_all.md in <output-dir>/<job id>/.",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+    model: Annotated[
+        str, typer.Option("--model", "-m", help="Summarization model to use.")
+    ] = "openai/gpt-4o-mini",
+    max_tokens: Annotated[int, typer.Option(help="Max tokens per chunk.")] = 500,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--cache-dir",
+            help="Directory for persistent caches (embeddings, LLM responses, k-NN graphs) reused across runs.",
+            file_okay=False,
+            dir_okay=True,
+        ),
+    ] = None,
+) -> None:
+    """
+    Serve summarization jobs over local HTTP, keeping the models loaded between jobs.
+
+    POST /jobs with {"text": ...} queues a job; GET /jobs/<id>/events streams its
+    progress and result as newline-delimited JSON.
+    """
+    config = ProcessingConfig(summarization_model=model, max_tokens=max_tokens)
+    embedding_cache, response_cache, knn_cache = _create_caches(config, cache_dir)
+    engine, _ = _create_engine(config, embedding_cache, response_cache, knn_cache)
+
+    typer.echo("Loading models...")
+    _ = engine.embedder.model
+
+    manager = JobManager(engine, workers=workers, queue_size=queue_size, output_dir=output_dir)
+    server = create_server(manager, host=host, port=port, socket_path=socket_path)
+    manager.start()
+    address = socket_path if socket_path is not None else f"http://{host}:{port}"
+    typer.echo(f"Serving on {address} with {workers} workers (Ctrl+C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo("Shutting down...")
+    finally:
+        server.server_close()
+        manager.shutdown()
+
+
+def _resolve_batch_inputs(inputs: str) -> list[Path]:
+    """Input files of a batch: the .txt files of a directory, or the files matching a glob."""
+    path = Path(inputs)
+    if path.is_dir():
+        return sorted(p for p in path.glob("*.txt") if p.is_file())
+
+    # Path.glob only takes relative patterns, so absolute ones are matched from their anchor
+    root = Path(path.anchor) if path.is_absolute() else Path()
+    pattern = str(path.relative_to(root)) if path.is_absolute() else inputs
+    return sorted(p for p in root.glob(pattern) if p.is_file())
+
+
+def _batch_output_dirs(input_files: list[Path], output_dir: Path) -> list[tuple[Path, Path]]:
+    """Pair each input with its own output directory, named after the file (deduplicated)."""
+    pairs: list[tuple[Path, Path]] = []
+    used: set[str] = set()
+    for input_file in input_files:
+        name = input_file.stem
+        suffix = 1
+        while name in used:
+            suffix += 1
+            name = f"{input_file.stem}_{suffix}"
+        used.add(name)
+        pairs.append((input_file, output_dir / name))
+    return pairs
+
+
+def _process_document(
+    engine: RaptorEngine,
+    verifier: VerifierAgent | None,
+    config: ProcessingConfig,
+    input_file: Path,
+    output_dir: Path,
+) -> None:
+    """Build, verify and export the tree of one batch document into `output_dir`."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    text = input_file.read_text(encoding="utf-8")
+    with DiskChunkStore(db_path=output_dir / "chunks.db") as store:
+        tree = engine.run(text, store=store)
+        _verify_and_export(tree, store, verifier, config, output_dir)
+
+
+def _build_tree(
+    engine: RaptorEngine,
+    input_file: Path,
+    text: str | None,
+    store: DiskChunkStore,
+    *,
+    resume: bool,
+    update: bool,
+) -> DocumentTree:
+    """Build the tree: streamed from the file if `text` is None, else from the text."""
+    if text is None:
+        return engine.run_stream(input_file, store=store, resume=resume)
+    if update:
+        return engine.update(text, store=store)
+    return engine.run(text, store=store, resume=resume)
+
+
 @app.command()
 def export(
     store_path: Annotated[
@@ -186,16 +523,32 @@ def export(
 ) -> None:
     """
     Export an existing database to a specific format.
+
+    Reloads the tree saved by `matome run` from the store, without re-running the pipeline.
     """
-    # This would require loading the tree from DB.
-    # Currently DocumentTree is not persisted as a whole object, but nodes are.
-    # We would need to reconstruct the tree.
-    # RaptorEngine._finalize_tree does this but it needs current_level_ids.
-    # If we persist tree metadata, we can reload.
-    # For now, this might be a placeholder or we just dump what we can.
-
-    typer.echo("Export from DB is not fully implemented in this cycle (requires tree persistence).")
-    # Implementing minimal dump if needed.
+    if output_format not in ("markdown", "canvas"):
+        typer.echo(f"Unknown format '{output_format}'. Use 'markdown' or 'canvas'.", err=True)
+        raise typer.Exit(code=1)
+
+    store = DiskChunkStore(db_path=store_path)
+    try:
+        if not store.has_tree():
+            typer.echo("No saved tree in this database. Run `matome run` first.", err=True)
+            raise typer.Exit(code=1)
+
+        tree = store.load_tree()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        if output_format == "markdown":
+            output_path = output_dir / "summary_all.md"
+            output_path.write_text(export_to_markdown(tree, store), encoding="utf-8")
+        else:
+            output_path = output_dir / "summary_kj.canvas"
+            ObsidianCanvasExporter(ProcessingConfig()).export(tree, output_path, store)
+    finally:
+        store.close()
+
+    typer.echo(f"Exported {len(tree.leaf_chunk_ids)} chunks to {output_path}")
 
 
 if __name__ == "__main__":
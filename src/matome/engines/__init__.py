@@ -1,4 +1,49 @@
 """
 Core processing engines for Matome.
 This package contains the logic for text chunking, clustering, and recursive processing (RAPTOR).
+
+Engine classes are exported lazily: `from matome.engines import GMMClusterer` imports only
+the module that defines it, and that module defers its heavy dependencies (umap, sklearn,
+sentence_transformers) until the engine is first used.
 """
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from matome.engines.cluster import GMMClusterer
+    from matome.engines.embedder import EmbeddingService
+    from matome.engines.raptor import RaptorEngine
+    from matome.engines.semantic_chunker import JapaneseSemanticChunker
+    from matome.engines.token_chunker import JapaneseTokenChunker
+
+# Exported name -> defining module
+_LAZY_EXPORTS = {
+    "EmbeddingService": "matome.engines.embedder",
+    "GMMClusterer": "matome.engines.cluster",
+    "JapaneseSemanticChunker": "matome.engines.semantic_chunker",
+    "JapaneseTokenChunker": "matome.engines.token_chunker",
+    "RaptorEngine": "matome.engines.raptor",
+}
+
+__all__ = [
+    "EmbeddingService",
+    "GMMClusterer",
+    "JapaneseSemanticChunker",
+    "JapaneseTokenChunker",
+    "RaptorEngine",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
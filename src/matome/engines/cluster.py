@@ -1,24 +1,48 @@
 import contextlib
+import itertools
 import logging
 import os
 import tempfile
-from collections.abc import Iterable
+import warnings
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import BinaryIO
+from typing import TYPE_CHECKING, BinaryIO
 
 import numpy as np
-from sklearn.cluster import MiniBatchKMeans
-from sklearn.decomposition import IncrementalPCA
-from sklearn.mixture import GaussianMixture
-from umap import UMAP
 
 from domain_models.config import ClusteringAlgorithm, ProcessingConfig
 from domain_models.manifest import Cluster
 from domain_models.types import NodeID
+from matome.engines.knn import default_neighbor_search
+from matome.interfaces import NeighborSearch
+from matome.utils.compat import batched
+from matome.utils.knn_cache import KNNGraphCache
+from matome.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.decomposition import IncrementalPCA
+    from sklearn.mixture import GaussianMixture
+    from umap import UMAP
+else:
+    # umap (numba JIT) and sklearn are imported when clustering first runs
+    MiniBatchKMeans = lazy_import("sklearn.cluster", "MiniBatchKMeans")
+    IncrementalPCA = lazy_import("sklearn.decomposition", "IncrementalPCA")
+    GaussianMixture = lazy_import("sklearn.mixture", "GaussianMixture")
+    UMAP = lazy_import("umap", "UMAP")
 
 logger = logging.getLogger(__name__)
 
 
+def _bic_rising(bics: list[float], patience: int) -> bool:
+    """Whether each of the last `patience` BIC values is higher than the one before it."""
+    if len(bics) <= patience:
+        return False
+    recent = bics[-patience - 1 :]
+    return all(later > earlier for earlier, later in itertools.pairwise(recent))
+
+
 class GMMClusterer:
     """
     Engine for clustering text chunks/nodes using UMAP and GMM.
@@ -27,8 +51,26 @@ class GMMClusterer:
     Uses memory mapping to handle large datasets without loading everything into RAM.
     While UMAP/GMM require the full dataset structure for global optimization,
     np.memmap allows the OS to handle paging efficiently, preventing OOM on the Python side.
+
+    UMAP is given a precomputed k-NN graph from a pluggable `NeighborSearch` backend,
+    optionally cached by the content of the memmap file so unchanged levels (re-runs,
+    parameter sweeps) skip the neighbor search.
     """
 
+    def __init__(
+        self,
+        neighbor_search: NeighborSearch | None = None,
+        knn_cache: KNNGraphCache | None = None,
+    ) -> None:
+        """
+        Args:
+            neighbor_search: Backend that builds UMAP's k-NN graph. None uses exact search
+                             up to `knn_exact_max_samples` nodes and NN-descent above.
+            knn_cache: Cache of k-NN graphs; None computes every graph.
+        """
+        self.neighbor_search = neighbor_search
+        self.knn_cache = knn_cache
+
     def cluster_nodes(
         self, embeddings: Iterable[list[float]], config: ProcessingConfig
     ) -> list[Cluster]:
@@ -42,10 +84,46 @@ class GMMClusterer:
         Returns:
             A list of Cluster objects containing indices of grouped nodes.
         """
-        self._validate_algorithm(config)
+        # Stream write embeddings to disk.
+        # This ensures we never hold the full list of embeddings in Python memory.
+        return self._cluster_streamed(
+            lambda path_obj: self._stream_write_embeddings(
+                embeddings, path_obj, config.write_batch_size
+            ),
+            config,
+        )
+
+    def cluster_arrays(
+        self, blocks: Iterable[np.ndarray], config: ProcessingConfig
+    ) -> list[Cluster]:
+        """
+        Clusters the nodes based on blocks of embeddings.
+
+        Each (n, dim) block is written to the memmap file as-is, without per-vector
+        Python objects or intermediate buffering.
+
+        Args:
+            blocks: An iterable of 2-D float arrays; rows are nodes in order.
+            config: Processing configuration.
+
+        Returns:
+            A list of Cluster objects containing indices of grouped nodes.
+        """
+        return self._cluster_streamed(
+            lambda path_obj: self._stream_write_arrays(blocks, path_obj), config
+        )
 
-        # Batch size for disk writing (from config)
-        write_batch_size = config.write_batch_size
+    def _cluster_streamed(
+        self, write: Callable[[Path], tuple[int, int]], config: ProcessingConfig
+    ) -> list[Cluster]:
+        """
+        Write embeddings to a temporary file with `write`, then cluster them via memmap.
+
+        Args:
+            write: Writes the embeddings to the given path and returns (n_samples, dim).
+            config: Processing configuration.
+        """
+        self._validate_algorithm(config)
 
         # Create temp file for memory mapping
         fd, tf_name = tempfile.mkstemp()
@@ -53,27 +131,28 @@ class GMMClusterer:
         path_obj = Path(tf_name)
 
         try:
-            # Stream write embeddings to disk.
-            # This ensures we never hold the full list of embeddings in Python memory.
-            n_samples, dim = self._stream_write_embeddings(embeddings, path_obj, write_batch_size)
+            n_samples, dim = write(path_obj)
 
             if n_samples == 0:
                 return []
 
-            # Handle edge cases (small datasets)
-            edge_case_result = self._handle_edge_cases(n_samples)
-            if edge_case_result:
-                return edge_case_result
-
             # Open as memmap
             # This allows us to access the data as if it were in memory, backed by disk
             mm_array = np.memmap(tf_name, dtype="float32", mode="r", shape=(n_samples, dim))
 
             try:
-                if n_samples > config.large_scale_threshold:
-                    return self._perform_approximate_clustering(mm_array, n_samples, config)
-
-                return self._perform_clustering(mm_array, n_samples, config)
+                # Handle edge cases (small datasets)
+                clusters = self._handle_edge_cases(n_samples)
+                if clusters is None:
+                    if n_samples > config.large_scale_threshold:
+                        clusters = self._perform_approximate_clustering(mm_array, n_samples, config)
+                    else:
+                        clusters = self._perform_clustering(
+                            mm_array, n_samples, config, data_path=path_obj
+                        )
+
+                self._attach_centroids(clusters, mm_array, config.write_batch_size)
+                return clusters
             finally:
                 # Ensure memmap is closed/deleted from python view
                 del mm_array
@@ -83,6 +162,22 @@ class GMMClusterer:
                 with contextlib.suppress(OSError):
                     path_obj.unlink()
 
+    def _attach_centroids(self, clusters: list[Cluster], data: np.ndarray, batch_size: int) -> None:
+        """
+        Set each cluster's centroid to the mean of its members' original embeddings.
+
+        Centroids live in the input embedding space (not the reduced UMAP/PCA space), so
+        new nodes can later be assigned to the nearest existing cluster without refitting.
+        Members are read from the memmap in batches.
+        """
+        for cluster in clusters:
+            if not cluster.node_indices:
+                continue
+            total = np.zeros(data.shape[1], dtype=np.float64)
+            for index_batch in batched(cluster.node_indices, batch_size):
+                total += data[np.asarray(index_batch, dtype=np.intp)].sum(axis=0, dtype=np.float64)
+            cluster.centroid = (total / len(cluster.node_indices)).tolist()
+
     def _stream_write_embeddings(
         self, embeddings: Iterable[list[float]], path_obj: Path, batch_size: int
     ) -> tuple[int, int]:
@@ -136,6 +231,47 @@ class GMMClusterer:
 
         return n_samples, dim
 
+    def _stream_write_arrays(self, blocks: Iterable[np.ndarray], path_obj: Path) -> tuple[int, int]:
+        """
+        Stream blocks of embeddings to disk.
+
+        Validates shape, dimension consistency and values per block, then writes each
+        block as contiguous float32 bytes.
+
+        Returns:
+            A tuple (n_samples, dim).
+        """
+        n_samples = 0
+        dim = 0
+
+        with path_obj.open("wb") as f:
+            for block in blocks:
+                arr = np.ascontiguousarray(block, dtype=np.float32)
+                if arr.ndim != 2:
+                    msg = f"Embedding blocks must be 2-D, got shape {arr.shape}."
+                    raise ValueError(msg)
+                if arr.shape[0] == 0:
+                    continue
+
+                if n_samples == 0:
+                    dim = arr.shape[1]
+                    if dim == 0:
+                        msg = "Embedding dimension cannot be zero."
+                        raise ValueError(msg)
+
+                if arr.shape[1] != dim:
+                    msg = f"Embedding dimension mismatch at index {n_samples}."
+                    raise ValueError(msg)
+
+                if not np.isfinite(arr).all():
+                    msg = "Embeddings contain NaN or Infinity values."
+                    raise ValueError(msg)
+
+                arr.tofile(f)
+                n_samples += arr.shape[0]
+
+        return n_samples, dim
+
     def _flush_buffer(self, f: BinaryIO, buffer: list[list[float]]) -> None:
         """Helper to write a buffer of vectors to disk."""
         try:
@@ -188,7 +324,11 @@ class GMMClusterer:
         return None
 
     def _perform_clustering(
-        self, data: np.ndarray, n_samples: int, config: ProcessingConfig
+        self,
+        data: np.ndarray,
+        n_samples: int,
+        config: ProcessingConfig,
+        data_path: Path | None = None,
     ) -> list[Cluster]:
         """
         Execute UMAP reduction and GMM clustering on the data.
@@ -198,6 +338,8 @@ class GMMClusterer:
             data: The dataset (numpy array or memmap).
             n_samples: Number of samples.
             config: Configuration object.
+            data_path: File holding `data` as raw float32 (the memmap), used to key the
+                       k-NN graph cache.
 
         Returns:
             List of resulting Cluster objects.
@@ -225,26 +367,34 @@ class GMMClusterer:
         try:
             # 1. Dimensionality Reduction (UMAP)
             logger.debug("Running UMAP dimensionality reduction...")
+            knn_graph = self._knn_graph(data, effective_n_neighbors, config, data_path)
             reducer = UMAP(
                 n_neighbors=effective_n_neighbors,
                 min_dist=min_dist,
                 n_components=n_components,
                 random_state=config.random_state,
+                precomputed_knn=knn_graph,
             )
-            reduced_embeddings = reducer.fit_transform(data)
+            with warnings.catch_warnings():
+                # Without a search index UMAP cannot `transform` new points; we never do.
+                warnings.filterwarnings("ignore", message=r"precomputed_knn\[2\]")
+                reduced_embeddings = reducer.fit_transform(data)
 
             # 2. GMM Clustering
+            gmm = None
             if config.n_clusters:
                 gmm_n_components = config.n_clusters
             else:
                 logger.debug("Calculating optimal cluster count using BIC...")
-                gmm_n_components = self._calculate_optimal_clusters(
-                    reduced_embeddings, config.random_state
-                )
+                gmm_n_components, gmm = self._calculate_optimal_clusters(reduced_embeddings, config)
 
             logger.info(f"Clustering into {gmm_n_components} components.")
-            gmm = GaussianMixture(n_components=gmm_n_components, random_state=config.random_state)
-            gmm.fit(reduced_embeddings)
+            # The winning BIC candidate is this exact fit, so it is reused rather than refitted
+            if gmm is None:
+                gmm = GaussianMixture(
+                    n_components=gmm_n_components, random_state=config.random_state
+                )
+                gmm.fit(reduced_embeddings)
 
             # 3. Soft Clustering (Probabilistic Assignment)
             probs = gmm.predict_proba(reduced_embeddings)
@@ -257,6 +407,27 @@ class GMMClusterer:
             msg = f"Clustering failed: {e}"
             raise RuntimeError(msg) from e
 
+    def _knn_graph(
+        self, data: np.ndarray, k: int, config: ProcessingConfig, data_path: Path | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """UMAP's k-NN graph of `data`, from the cache when these embeddings were seen before."""
+        backend = self.neighbor_search or default_neighbor_search(len(data), config)
+        backend_name = type(backend).__name__
+
+        digest = None
+        if self.knn_cache is not None and data_path is not None:
+            digest = self.knn_cache.digest(data_path, data.shape)
+            cached = self.knn_cache.get(digest, backend_name, k)
+            if cached is not None:
+                logger.debug(f"Reusing cached k-NN graph ({backend_name}, k={k}).")
+                return cached
+
+        logger.debug(f"Building k-NN graph with {backend_name} (k={k}).")
+        indices, distances = backend.kneighbors(data, k)
+        if self.knn_cache is not None and digest is not None:
+            self.knn_cache.put(digest, backend_name, indices, distances)
+        return indices, distances
+
     def _form_clusters(self, labels: np.ndarray) -> list[Cluster]:
         """Convert hard clustering labels into Cluster objects (used for approx clustering)."""
         clusters: list[Cluster] = []
@@ -371,9 +542,20 @@ class GMMClusterer:
             msg = f"Approximate clustering failed: {e}"
             raise RuntimeError(msg) from e
 
-    def _calculate_optimal_clusters(self, embeddings: np.ndarray, random_state: int) -> int:
+    def _calculate_optimal_clusters(
+        self, embeddings: np.ndarray, config: ProcessingConfig
+    ) -> tuple[int, "GaussianMixture | None"]:
         """
         Helper to find optimal number of clusters using BIC (Bayesian Information Criterion).
+
+        Candidates are fitted `config.bic_search_workers` at a time on a thread pool. With
+        `config.bic_patience` set, the search stops once BIC has risen for that many
+        consecutive candidates. Every candidate is seeded with `config.random_state`, so the
+        result does not depend on the number of workers.
+
+        Returns:
+            The chosen number of clusters and the fitted winning model (None when
+            defaulting to 1 cluster), which callers reuse instead of fitting it again.
         """
         # Limit max clusters to avoid overfitting or excessive fragmentation.
         # 20 is a heuristic upper bound often sufficient for typical document sectioning tasks.
@@ -381,28 +563,27 @@ class GMMClusterer:
         max_clusters = min(20, len(embeddings))
 
         if max_clusters < 2:
-            return 1
+            return 1, None
 
-        bics = []
-        n_range = range(2, max_clusters + 1)
+        patience = config.bic_patience
+        bics: list[float] = []
+        best: tuple[int, GaussianMixture | None] = (1, None)
 
         try:
-            for n in n_range:
-                gmm = GaussianMixture(n_components=n, random_state=random_state)
-                gmm.fit(embeddings)
-                bics.append(gmm.bic(embeddings))
-
-            if not bics:
-                return 1
-
-            # Find n with minimum BIC
-            optimal_n = n_range[np.argmin(bics)]
-            return int(optimal_n)
+            candidates = self._fit_bic_candidates(embeddings, range(2, max_clusters + 1), config)
+            for n, gmm, bic in candidates:
+                # Strict comparison keeps the smallest n among equal BICs
+                if not bics or bic < min(bics):
+                    best = (n, gmm)
+                bics.append(bic)
+                if patience is not None and _bic_rising(bics, patience):
+                    logger.debug(f"BIC rose for {patience} candidates in a row; stopped at n={n}.")
+                    break
 
         except (ValueError, RuntimeError) as e:
             # Catch specific errors like convergence failure
             logger.warning(f"Error during BIC calculation: {e!s}. Defaulting to 1 cluster.")
-            return 1
+            return 1, None
         except Exception:
             # Catch import errors or other unexpected issues
             logger.exception("Unexpected error during BIC calculation. Defaulting to 1 cluster.")
@@ -410,3 +591,26 @@ class GMMClusterer:
             # unless we explicitly want fallback.
             # Given requirement "Catch specific exceptions and propagate errors appropriately", re-raising is safer.
             raise
+
+        return best
+
+    def _fit_bic_candidates(
+        self, embeddings: np.ndarray, n_range: range, config: ProcessingConfig
+    ) -> Iterator[tuple[int, "GaussianMixture", float]]:
+        """
+        Fit a GMM for each cluster count in `n_range`, yielding (n, model, BIC) in order.
+
+        Waves of `config.bic_search_workers` candidates are fitted concurrently, so a
+        consumer that stops early wastes at most one wave of fits.
+        """
+        workers = min(config.bic_search_workers, len(n_range))
+
+        def fit_candidate(n: int) -> tuple["GaussianMixture", float]:
+            gmm = GaussianMixture(n_components=n, random_state=config.random_state)
+            gmm.fit(embeddings)
+            return gmm, float(gmm.bic(embeddings))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for wave in batched(n_range, workers):
+                for n, (gmm, bic) in zip(wave, executor.map(fit_candidate, wave), strict=True):
+                    yield n, gmm, bic
@@ -1,37 +1,101 @@
 import logging
+import os
+import threading
 from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk
 from matome.utils.compat import batched
+from matome.utils.embedding_cache import EmbeddingCache, embedding_cache_key
+from matome.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+else:
+    # sentence_transformers (and torch) are imported when the model is first loaded
+    SentenceTransformer = lazy_import("sentence_transformers", "SentenceTransformer")
 
 logger = logging.getLogger(__name__)
 
+# Share of currently available RAM one encode call may use when no budget is set.
+AUTO_MEMORY_FRACTION = 0.25
+
+
+def _estimate_tokens(text_value: str, max_seq_length: int | None) -> int:
+    """
+    Cheap upper-bound token estimate used for adaptive batching.
+
+    Subword tokenizers emit at most about one token per character for Japanese text,
+    so the character count is used, clipped to the model's truncation length.
+    """
+    tokens = max(1, len(text_value))
+    if isinstance(max_seq_length, int) and max_seq_length > 0:
+        return min(tokens, max_seq_length)
+    return tokens
+
+
+def _available_memory_bytes() -> int | None:
+    """Available physical memory in bytes, or None if the platform doesn't report it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def embed_string_blocks(
+    embedder: "EmbeddingService", texts: Iterable[str], batch_size: int
+) -> Iterator[np.ndarray]:
+    """
+    Embed strings as (n, dim) float32 blocks with any embedder.
+
+    Uses `embed_strings_batched` when the embedder provides it. Otherwise (embedders that
+    only implement `embed_strings`, including EmbeddingService subclasses that override
+    just `embed_strings`), the vectors are grouped into blocks of up to `batch_size`.
+    """
+    embedder_type = type(embedder)
+    list_only = not callable(getattr(embedder, "embed_strings_batched", None)) or (
+        issubclass(embedder_type, EmbeddingService)
+        and embedder_type.embed_strings is not EmbeddingService.embed_strings
+        and embedder_type.embed_strings_batched is EmbeddingService.embed_strings_batched
+    )
+    if not list_only:
+        yield from embedder.embed_strings_batched(texts)
+        return
+
+    for vectors in batched(embedder.embed_strings(texts), batch_size):
+        yield np.asarray(vectors, dtype=np.float32)
+
 
 class EmbeddingService:
     """Service for generating vector embeddings for text and chunks."""
 
-    def __init__(self, config: ProcessingConfig) -> None:
+    def __init__(self, config: ProcessingConfig, cache: EmbeddingCache | None = None) -> None:
         """
         Initialize the embedding service.
 
         Args:
             config: Processing configuration containing `embedding_model` and `embedding_batch_size`.
+            cache: Optional persistent embedding cache consulted before encoding.
         """
         self.config = config
         self.model_name = config.embedding_model
+        self.cache = cache
         # Lazy loading: Do not initialize model here.
         self._model: SentenceTransformer | None = None
+        # Guards the lazy load when one service is shared by worker threads
+        self._model_lock = threading.Lock()
 
     @property
-    def model(self) -> SentenceTransformer:
-        """Lazy loader for the SentenceTransformer model."""
+    def model(self) -> "SentenceTransformer":
+        """Lazy loader for the SentenceTransformer model (loaded once, thread-safe)."""
         if self._model is None:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(f"Loading embedding model: {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name)
         return self._model
 
     def embed_strings(self, texts: Iterable[str]) -> Iterator[list[float]]:
@@ -39,7 +103,7 @@ class EmbeddingService:
         Embeds an iterable of strings and yields their vectors.
 
         This method processes inputs in batches to avoid loading all texts or embeddings into memory.
-        Uses batched utility (Python 3.12+ compatible) for efficient streaming.
+        Prefer `embed_strings_batched` when the consumer can work on NumPy blocks.
 
         Args:
             texts: Iterable of strings to embed.
@@ -47,6 +111,22 @@ class EmbeddingService:
         Yields:
             Embedding vectors (lists of floats).
         """
+        for block in self.embed_strings_batched(texts):
+            yield from block.tolist()
+
+    def embed_strings_batched(self, texts: Iterable[str]) -> Iterator[np.ndarray]:
+        """
+        Embeds an iterable of strings and yields one array per batch.
+
+        Uses batched utility (Python 3.12+ compatible) for efficient streaming, so only one
+        batch of texts and vectors is held in memory at a time.
+
+        Args:
+            texts: Iterable of strings to embed.
+
+        Yields:
+            Contiguous (n, dim) float32 arrays, in input order, with n <= `embedding_batch_size`.
+        """
         batch_size = self.config.embedding_batch_size
         processed_count = 0
 
@@ -57,46 +137,136 @@ class EmbeddingService:
                 logger.info(f"Embedded {processed_count} items...")
 
             # batch is a tuple of strings
-            yield from self._process_batch(batch)
+            yield self._embed_batch(batch)
+
+    def _embed_batch(self, batch_texts: list[str] | tuple[str, ...]) -> np.ndarray:
+        """
+        Embed a batch, serving cached vectors where possible.
+
+        Only cache misses are sent to the model (which is therefore never loaded when
+        every text is cached). New vectors are written back to the cache.
+
+        Returns:
+            A contiguous (n, dim) float32 array in input order.
+        """
+        if self.cache is None or not batch_texts:
+            return self._process_batch(batch_texts)
+
+        keys = [embedding_cache_key(self.model_name, t) for t in batch_texts]
+        cached = self.cache.get_many(keys)
+
+        miss_positions = [i for i, key in enumerate(keys) if key not in cached]
+        if not miss_positions:
+            return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
 
-    def _process_batch(self, batch_texts: list[str] | tuple[str, ...]) -> Iterator[list[float]]:
-        """Helper to process a single batch."""
+        miss_texts = [batch_texts[i] for i in miss_positions]
+        computed = self._process_batch(miss_texts)
+        self.cache.put_many((keys[i], row) for i, row in zip(miss_positions, computed, strict=True))
+
+        result = np.empty((len(keys), computed.shape[1]), dtype=np.float32)
+        result[miss_positions] = computed
+        for i, key in enumerate(keys):
+            hit = cached.get(key)
+            if hit is not None:
+                result[i] = hit
+        return result
+
+    def _process_batch(self, batch_texts: list[str] | tuple[str, ...]) -> np.ndarray:
+        """
+        Encode a batch with the model.
+
+        By default the whole batch is one encode call. With `embedding_adaptive_batching`,
+        it is split into consecutive groups whose padded token count fits the token and
+        memory budgets (see `_plan_encode_groups`).
+
+        Returns:
+            A contiguous (n, dim) float32 array in input order.
+        """
         if not batch_texts:
-            return
+            return np.empty((0, 0), dtype=np.float32)
+
+        if self.config.embedding_adaptive_batching:
+            groups = self._plan_encode_groups(batch_texts)
+        else:
+            groups = [(0, len(batch_texts))]
 
         try:
-            # Access self.model (property) to trigger lazy load if needed
-            # Process in strict mini-batches to avoid any large memory allocation
-            # SentenceTransformer.encode internally batches, but returns full result.
-            # We must call encode on smaller chunks if we want to avoid full result in memory.
-            MINI_BATCH_SIZE = 8
-
-            for i in range(0, len(batch_texts), MINI_BATCH_SIZE):
-                chunk_texts = batch_texts[i : i + MINI_BATCH_SIZE]  # slice works on list/tuple
-
-                chunk_embeddings = self.model.encode(
-                    list(chunk_texts),
-                    batch_size=len(chunk_texts),
-                    convert_to_numpy=True,
-                    show_progress_bar=False,
+            result: np.ndarray | None = None
+            for start, end in groups:
+                group_texts = list(batch_texts[start:end])
+                # Access self.model (property) to trigger lazy load if needed
+                block = np.asarray(
+                    self.model.encode(
+                        group_texts,
+                        batch_size=len(group_texts),
+                        convert_to_numpy=True,
+                        show_progress_bar=False,
+                    ),
+                    dtype=np.float32,
                 )
-
-                if isinstance(chunk_embeddings, np.ndarray):
-                    for j in range(chunk_embeddings.shape[0]):
-                        yield chunk_embeddings[j].tolist()
-                else:
-                    for emb in chunk_embeddings:
-                        yield emb.tolist()
-
+                if result is None:
+                    result = np.empty((len(batch_texts), block.shape[-1]), dtype=np.float32)
+                result[start:end] = block
         except Exception:
             logger.exception("Failed to encode batch.")
             raise
 
+        return result if result is not None else np.empty((0, 0), dtype=np.float32)
+
+    def _plan_encode_groups(
+        self, batch_texts: list[str] | tuple[str, ...]
+    ) -> list[tuple[int, int]]:
+        """
+        Split a batch into consecutive (start, end) ranges for adaptive encoding.
+
+        Each group is padded to its longest member, so its cost is
+        `len(group) * max_tokens_in_group`. A group is closed before that cost would
+        exceed the token budget. A single text longer than the budget gets its own group.
+        """
+        budget = self._token_budget()
+        max_seq_length = getattr(self.model, "max_seq_length", None)
+
+        groups: list[tuple[int, int]] = []
+        start = 0
+        longest = 0
+        for i, text_value in enumerate(batch_texts):
+            tokens = _estimate_tokens(text_value, max_seq_length)
+            candidate = max(longest, tokens)
+            if i > start and candidate * (i - start + 1) > budget:
+                groups.append((start, i))
+                start = i
+                candidate = tokens
+            longest = candidate
+        groups.append((start, len(batch_texts)))
+        return groups
+
+    def _token_budget(self) -> int:
+        """Padded tokens allowed per encode call: the smaller of the token and memory budgets."""
+        budget_mb = self.config.embedding_memory_budget_mb
+        if budget_mb is not None:
+            memory_bytes = budget_mb * 1024 * 1024
+        else:
+            available = _available_memory_bytes()
+            if available is None:
+                return self.config.embedding_max_batch_tokens
+            memory_bytes = int(available * AUTO_MEMORY_FRACTION)
+
+        memory_tokens = max(1, memory_bytes // self.config.embedding_bytes_per_token)
+        return min(self.config.embedding_max_batch_tokens, memory_tokens)
+
     def embed_chunks(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
         """
         Embeds an iterable of chunks and yields them with embeddings.
         This enables streaming processing of chunks.
+
+        With `embedding_length_bucketing`, chunks are read in windows of
+        `embedding_bucket_window`, encoded in length-sorted batches (so each padded batch
+        holds texts of similar length), and yielded in their original order.
         """
+        if self.config.embedding_length_bucketing:
+            yield from self._embed_chunks_bucketed(chunks)
+            return
+
         batch_size = self.config.embedding_batch_size
 
         # Use batched utility to stream chunks in batches
@@ -104,10 +274,25 @@ class EmbeddingService:
             # batch_chunks is a tuple of Chunk objects
             texts = [c.text for c in batch_chunks]
 
-            # Embed batch (returns iterator, consumed immediately)
-            embeddings_gen = self._process_batch(texts)
+            # Embed batch as one (n, dim) array, converted to lists once
+            embeddings = self._embed_batch(texts).tolist()
 
             # Assign and yield
-            for chunk, embedding in zip(batch_chunks, embeddings_gen, strict=True):
+            for chunk, embedding in zip(batch_chunks, embeddings, strict=True):
                 chunk.embedding = embedding
                 yield chunk
+
+    def _embed_chunks_bucketed(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        """Embed chunks window by window, batching them in order of estimated token length."""
+        batch_size = self.config.embedding_batch_size
+
+        for window in batched(chunks, self.config.embedding_bucket_window):
+            # Stable sort, so equal-length chunks keep document order within a bucket
+            order = sorted(range(len(window)), key=lambda i: len(window[i].text))
+
+            for positions in batched(order, batch_size):
+                embeddings = self._embed_batch([window[i].text for i in positions]).tolist()
+                for i, embedding in zip(positions, embeddings, strict=True):
+                    window[i].embedding = embedding
+
+            yield from window
@@ -0,0 +1,133 @@
+"""
+k-nearest-neighbor search backends for the UMAP step of GMMClusterer.
+
+UMAP starts every fit by finding each point's `n_neighbors` nearest neighbors, which
+dominates its cost for thousands of nodes. GMMClusterer builds that graph itself with a
+`NeighborSearch` backend and hands it to UMAP as `precomputed_knn`, so backends can be
+swapped and graphs can be cached between runs (see `matome.utils.knn_cache`).
+"""
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from domain_models.config import ProcessingConfig
+from matome.interfaces import NeighborSearch
+from matome.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from pynndescent import NNDescent
+else:
+    NNDescent = lazy_import("pynndescent", "NNDescent")
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of entries of the (rows, n) distance block of ExactNeighborSearch
+MAX_BLOCK_ELEMENTS = 16_000_000
+
+
+def _check_k(k: int, n_samples: int) -> None:
+    if not 1 <= k <= n_samples:
+        msg = f"k must be between 1 and the number of samples ({n_samples}), got {k}."
+        raise ValueError(msg)
+
+
+class ExactNeighborSearch:
+    """
+    Exact euclidean k-NN by blocked matrix multiplication.
+
+    Squared distances |x|^2 + |y|^2 - 2 x.y are computed for a block of rows against all
+    rows at a time, so memory stays at one (block, n) matrix instead of the full (n, n)
+    distance matrix UMAP builds for small inputs. The work is O(n^2 dim), which suits
+    levels of up to several thousand nodes.
+    """
+
+    def __init__(self, block_size: int = 1024) -> None:
+        """
+        Args:
+            block_size: Maximum number of query rows per matrix multiply (also capped so a
+                        block holds at most MAX_BLOCK_ELEMENTS distances).
+        """
+        if block_size < 1:
+            msg = "block_size must be at least 1."
+            raise ValueError(msg)
+        self.block_size = block_size
+
+    def kneighbors(self, data: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Exact `k` nearest neighbors of every row (see `NeighborSearch.kneighbors`)."""
+        n_samples = data.shape[0]
+        _check_k(k, n_samples)
+        points = np.asarray(data, dtype=np.float32)  # no copy for float32 memmaps
+        rows = max(1, min(self.block_size, MAX_BLOCK_ELEMENTS // n_samples))
+
+        sq_norms = np.empty(n_samples, dtype=np.float32)
+        for start in range(0, n_samples, rows):
+            block = points[start : start + rows]
+            sq_norms[start : start + len(block)] = np.einsum("ij,ij->i", block, block)
+
+        indices = np.empty((n_samples, k), dtype=np.int64)
+        distances = np.empty((n_samples, k), dtype=np.float32)
+        for start in range(0, n_samples, rows):
+            block = points[start : start + rows]
+            stop = start + len(block)
+            dist2 = block @ points.T
+            dist2 *= -2.0
+            dist2 += sq_norms[start:stop, None]
+            dist2 += sq_norms[None, :]
+            # Each row is its own nearest neighbor, even when duplicates tie with it
+            local = np.arange(len(block))
+            dist2[local, start + local] = -np.inf
+
+            nearest = np.argpartition(dist2, k - 1, axis=1)[:, :k]
+            nearest_dist2 = np.take_along_axis(dist2, nearest, axis=1)
+            order = np.argsort(nearest_dist2, axis=1)
+            nearest_dist2 = np.take_along_axis(nearest_dist2, order, axis=1)
+            nearest_dist2[:, 0] = 0.0
+
+            indices[start:stop] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:stop] = np.sqrt(np.maximum(nearest_dist2, 0.0))
+        return indices, distances
+
+
+class NNDescentNeighborSearch:
+    """
+    Approximate euclidean k-NN with NN-descent (pynndescent, the search UMAP itself uses).
+
+    Index parameters follow UMAP's own defaults for its nearest-neighbor step.
+    """
+
+    def __init__(self, random_state: int | None = None, n_jobs: int = -1) -> None:
+        """
+        Args:
+            random_state: Seed for the random projection trees and descent.
+            n_jobs: Threads used by pynndescent (-1 uses all cores).
+        """
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+
+    def kneighbors(self, data: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate `k` nearest neighbors of every row (see `NeighborSearch.kneighbors`)."""
+        n_samples = data.shape[0]
+        _check_k(k, n_samples)
+        index = NNDescent(
+            data,
+            n_neighbors=k,
+            metric="euclidean",
+            n_trees=min(64, 5 + round(n_samples**0.5 / 20.0)),
+            n_iters=max(5, round(np.log2(n_samples))),
+            max_candidates=60,
+            low_memory=True,
+            random_state=self.random_state,
+            n_jobs=self.n_jobs,
+            verbose=False,
+        )
+        indices, distances = index.neighbor_graph
+        return indices.astype(np.int64, copy=False), distances.astype(np.float32, copy=False)
+
+
+def default_neighbor_search(n_samples: int, config: ProcessingConfig) -> NeighborSearch:
+    """Exact search up to `config.knn_exact_max_samples` nodes, NN-descent above."""
+    if n_samples <= config.knn_exact_max_samples:
+        return ExactNeighborSearch()
+    return NNDescentNeighborSearch(random_state=config.random_state)
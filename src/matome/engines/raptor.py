@@ -1,19 +1,35 @@
 import contextlib
+import functools
+import hashlib
+import heapq
 import logging
+import operator
 import uuid
-from collections.abc import Iterable, Iterator
+from collections import deque
+from collections.abc import Container, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
 
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk, Cluster, DocumentTree, SummaryNode
 from domain_models.types import NodeID
-from matome.engines.embedder import EmbeddingService
-from matome.interfaces import Chunker, Clusterer, Summarizer
+from matome.engines.embedder import EmbeddingService, embed_string_blocks
+from matome.interfaces import ArrayClusterer, Chunker, Clusterer, SentenceSplitter, Summarizer
 from matome.utils.compat import batched
-from matome.utils.store import DiskChunkStore
+from matome.utils.io import SentenceSource, file_digest
+from matome.utils.pipeline import Stage, pipelined
+from matome.utils.store import QUERY_BATCH_SIZE, DiskChunkStore, StoredSummaryNodes
 
 logger = logging.getLogger(__name__)
 
 
+def _text_hash(text: str) -> bytes:
+    """Digest of a chunk's text, used to match unchanged chunks across document versions."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
 class RaptorEngine:
     """
     Recursive Abstractive Processing for Tree-Organized Retrieval (RAPTOR) Engine.
@@ -57,7 +73,7 @@ class RaptorEngine:
             # 1. initial_chunks (Iterator)
             # 2. embedder.embed_chunks (Iterator) -> Yields Chunk with embedding
 
-            chunk_stream = self.embedder.embed_chunks(initial_chunks)
+            chunk_stream = self._embed_level_zero(initial_chunks)
 
             # We assume store.add_chunks handles lists efficiently.
             # But to strictly stream, we should batch manually here and call store.add_chunks on batches.
@@ -89,17 +105,54 @@ class RaptorEngine:
 
         return clusters, current_level_ids
 
-    def run(self, text: str, store: DiskChunkStore | None = None) -> DocumentTree:
+    def _embed_level_zero(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        """
+        Embed Level 0 chunks, in order.
+
+        With `semantic_chunking_pool_embeddings`, chunks that already carry an embedding
+        (pooled from sentence embeddings by the chunker) are passed through, and only the
+        rest of each `chunk_buffer_size` window is sent to the embedder.
+        """
+        if not self.config.semantic_chunking_pool_embeddings:
+            yield from self.embedder.embed_chunks(chunks)
+            return
+
+        for window in batched(chunks, self.config.chunk_buffer_size):
+            pooled = [chunk.embedding is not None for chunk in window]
+            missing = [chunk for chunk, has in zip(window, pooled, strict=True) if not has]
+            embedded = iter(self.embedder.embed_chunks(missing) if missing else ())
+            for chunk, has in zip(window, pooled, strict=True):
+                yield chunk if has else next(embedded)
+
+    def run(
+        self, text: str, store: DiskChunkStore | None = None, resume: bool = False
+    ) -> DocumentTree:
         """
         Execute the RAPTOR pipeline.
 
         Args:
             text: Input text to process.
             store: Optional persistent store. If None, a temporary store is used (and closed on exit).
+            resume: Continue an interrupted build recorded in `store`'s run manifest,
+                skipping finished levels and already summarized clusters.
+
+        Returns:
+            The tree. With a `store`, its `all_nodes` reads summaries from the store on
+            access, so the store must stay open while the tree is used.
 
         Raises:
-            ValueError: If input text is empty or invalid.
+            ValueError: If input text is empty or invalid, or the run cannot be resumed.
         """
+        self._validate_text(text)
+
+        logger.info("Starting RAPTOR process: Chunking text.")
+        initial_chunks_iter = self.chunker.split_text(text, self.config)
+
+        input_digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return self._build_tree(initial_chunks_iter, store, input_digest, resume)
+
+    def _validate_text(self, text: str) -> None:
+        """Reject empty, non-string or over-long input text."""
         if not text or not isinstance(text, str):
             msg = "Input text must be a non-empty string."
             raise ValueError(msg)
@@ -109,10 +162,318 @@ class RaptorEngine:
             msg = f"Input text length ({len(text)}) exceeds maximum allowed ({self.config.max_input_length})."
             raise ValueError(msg)
 
-        logger.info("Starting RAPTOR process: Chunking text.")
-        initial_chunks_iter = self.chunker.split_text(text, self.config)
+    def update(self, text: str, store: DiskChunkStore) -> DocumentTree:
+        """
+        Update the tree saved in `store` for an edited version of its document.
+
+        New chunks are diffed against the stored leaves by text hash: unchanged chunks keep
+        their IDs and embeddings, and only changed chunks are embedded. Changed chunks join
+        the existing Level 0 cluster with the nearest centroid, and only clusters whose
+        members changed, and their ancestors, are re-summarized. Everything else in the
+        tree is reused.
 
-        all_summaries: dict[str, SummaryNode] = {}
+        Falls back to a full `run` if the store has no finished tree with cluster
+        centroids to update (e.g. a single-chunk tree or an older store).
+
+        Args:
+            text: The edited input text.
+            store: Persistent store holding the tree of the previous version.
+
+        Raises:
+            ValueError: If input text is empty or invalid, or produces no chunks.
+        """
+        self._validate_text(text)
+
+        run_levels = store.get_run_levels()
+        if not self._is_updatable(store, run_levels):
+            logger.info("No incrementally updatable tree in store; running a full build.")
+            return self.run(text, store=store)
+
+        input_digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if store.get_run_input_digest() == input_digest:
+            logger.info("Input unchanged; reusing the saved tree.")
+            return store.load_tree()
+
+        old_leaf_ids = run_levels[0][0]
+        leaf_ids, changed_leaves = self._diff_leaves(
+            self.chunker.split_text(text, self.config), old_leaf_ids, store
+        )
+        if not leaf_ids:
+            msg = "Input text produced no chunks."
+            raise ValueError(msg)
+        logger.info(f"Incremental update: {len(changed_leaves)} of {len(leaf_ids)} chunks changed.")
+
+        additions = self._assign_to_nearest_centroid(run_levels[0][1], changed_leaves)
+        kept_leaf_ids = set(leaf_ids)
+        superseded: list[NodeID] = [nid for nid in old_leaf_ids if nid not in kept_leaf_ids]
+
+        # successor: old node ID -> its node in the updated level (absent if removed)
+        successor: dict[NodeID, NodeID] = {nid: nid for nid in leaf_ids}
+        current_level_ids = leaf_ids
+        new_levels: dict[int, tuple[list[NodeID], list[Cluster], dict[int, str]]] = {}
+        top_level = max(run_levels)
+        for level in range(top_level):
+            clusters, summaries, successor = self._update_level(
+                level,
+                run_levels[level],
+                store.get_cluster_summaries(level),
+                current_level_ids,
+                store,
+                successor=successor,
+                additions=additions if level == 0 else {},
+                superseded=superseded,
+            )
+            new_levels[level] = (current_level_ids, clusters, summaries)
+            current_level_ids = [summaries[pos] for pos in sorted(summaries)]
+        new_levels[top_level] = (current_level_ids, [], {})
+
+        store.reset_run(input_digest)
+        summary_ids: list[str] = []
+        for level, (node_ids, clusters, summaries) in new_levels.items():
+            store.save_run_level(level, node_ids, clusters)
+            store.record_cluster_summaries(level, summaries.items())
+            if level > 0:
+                summary_ids.extend(str(nid) for nid in node_ids)
+
+        tree = self._finalize_tree(current_level_ids, store, summary_ids, leaf_ids)
+        store.delete_nodes(superseded)
+        return tree
+
+    def _is_updatable(
+        self, store: DiskChunkStore, run_levels: dict[int, tuple[list[NodeID], list[Cluster]]]
+    ) -> bool:
+        """Whether the store's finished tree can be updated incrementally."""
+        if not store.has_tree() or not run_levels:
+            return False
+
+        top_level = max(run_levels)
+        if sorted(run_levels) != list(range(top_level + 1)) or run_levels[top_level][1]:
+            return False
+
+        for level in range(top_level):
+            clusters = run_levels[level][1]
+            # Every cluster needs its summary (no forced reductions or skipped clusters)
+            if not clusters or len(store.get_cluster_summaries(level)) != len(clusters):
+                return False
+
+        return all(cluster.centroid is not None for cluster in run_levels[0][1])
+
+    def _diff_leaves(
+        self, chunks: Iterable[Chunk], old_leaf_ids: list[NodeID], store: DiskChunkStore
+    ) -> tuple[list[NodeID], list[Chunk]]:
+        """
+        Match new chunks to stored leaves by text hash.
+
+        Matched chunks keep the stored leaf's ID and embedding (their offsets are
+        rewritten). Unmatched chunks get fresh IDs and are embedded and stored.
+
+        Returns:
+            (leaf IDs of the new document in order, the changed chunks with embeddings)
+        """
+        old_by_hash: dict[bytes, deque[NodeID]] = {}
+        for node in store.iter_nodes(old_leaf_ids, with_embeddings=False):
+            if isinstance(node, Chunk):
+                old_by_hash.setdefault(_text_hash(node.text), deque()).append(node.index)
+
+        next_index = max((int(nid) for nid in old_leaf_ids), default=-1) + 1
+        leaf_ids: list[NodeID] = []
+        kept_buffer: list[Chunk] = []
+        changed: list[Chunk] = []
+
+        for chunk in chunks:
+            matches = old_by_hash.get(_text_hash(chunk.text))
+            if matches:
+                kept = chunk.model_copy(update={"index": matches.popleft(), "embedding": None})
+                kept_buffer.append(kept)
+                leaf_ids.append(kept.index)
+                if len(kept_buffer) >= self.config.chunk_buffer_size:
+                    store.update_chunk_contents(kept_buffer)
+                    kept_buffer.clear()
+            else:
+                changed.append(chunk.model_copy(update={"index": next_index}))
+                leaf_ids.append(next_index)
+                next_index += 1
+
+        if kept_buffer:
+            store.update_chunk_contents(kept_buffer)
+
+        changed = list(self._embed_level_zero(changed))
+        store.add_chunks(changed)
+        return leaf_ids, changed
+
+    def _assign_to_nearest_centroid(
+        self, clusters: list[Cluster], chunks: list[Chunk]
+    ) -> dict[int, list[NodeID]]:
+        """Assign chunks to the cluster with the nearest centroid: cluster position -> chunk IDs."""
+        if not chunks:
+            return {}
+
+        centroids = np.asarray([cluster.centroid for cluster in clusters], dtype=np.float32)
+        vectors = np.asarray([chunk.embedding for chunk in chunks], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != centroids.shape[1]:
+            msg = "Changed chunk embeddings do not match the stored cluster centroids."
+            raise ValueError(msg)
+
+        # argmin ||v - c||^2 == argmax (2 v.c - ||c||^2)
+        scores = 2.0 * (vectors @ centroids.T) - np.einsum("ij,ij->i", centroids, centroids)
+        assignments: dict[int, list[NodeID]] = {}
+        for chunk, pos in zip(chunks, np.argmax(scores, axis=1), strict=True):
+            assignments.setdefault(int(pos), []).append(chunk.index)
+        return assignments
+
+    def _update_level(
+        self,
+        level: int,
+        old_level: tuple[list[NodeID], list[Cluster]],
+        old_summaries: dict[int, str],
+        current_level_ids: list[NodeID],
+        store: DiskChunkStore,
+        *,
+        successor: dict[NodeID, NodeID],
+        additions: dict[int, list[NodeID]],
+        superseded: list[NodeID],
+    ) -> tuple[list[Cluster], dict[int, str], dict[NodeID, NodeID]]:
+        """
+        Carry the clusters of `level` over to the updated nodes and re-summarize dirty ones.
+
+        A cluster is dirty if a member was removed or replaced, or a node was added to it.
+        Clusters left without members are dropped. Superseded summary IDs are appended to
+        `superseded`.
+
+        Returns:
+            (updated clusters, summary ID by cluster position, successor map for the next level)
+        """
+        old_ids, old_clusters = old_level
+        positions = {nid: pos for pos, nid in enumerate(current_level_ids)}
+
+        clusters: list[Cluster] = []
+        origins: list[str] = []  # Previous summary of each updated cluster
+        dirty: list[bool] = []
+        for old_pos, cluster in enumerate(old_clusters):
+            members: set[int] = set()
+            changed = old_pos in additions
+            for idx in cluster.node_indices:
+                old_id = old_ids[int(idx)]
+                new_id = successor.get(old_id)
+                changed = changed or new_id != old_id
+                if new_id is not None:
+                    members.add(positions[new_id])
+            members.update(positions[nid] for nid in additions.get(old_pos, ()))
+
+            if not members:
+                superseded.append(old_summaries[old_pos])
+                continue
+            clusters.append(cluster.model_copy(update={"node_indices": sorted(members)}))
+            origins.append(old_summaries[old_pos])
+            dirty.append(changed)
+
+        self._refresh_centroids(
+            [cluster for cluster, is_dirty in zip(clusters, dirty, strict=True) if is_dirty],
+            current_level_ids,
+            store,
+        )
+        summaries = {
+            pos: origin
+            for pos, (origin, is_dirty) in enumerate(zip(origins, dirty, strict=True))
+            if not is_dirty
+        }
+        next_successor: dict[NodeID, NodeID] = {sid: sid for sid in summaries.values()}
+
+        new_nodes: list[SummaryNode] = []
+        for pos, node in self._summarize_clusters(
+            clusters, current_level_ids, store, level + 1, skip=summaries.keys()
+        ):
+            summaries[pos] = node.id
+            next_successor[origins[pos]] = node.id
+            superseded.append(origins[pos])
+            new_nodes.append(node)
+
+        self._embed_summaries(new_nodes)
+        store.add_summaries(new_nodes)
+        return clusters, summaries, next_successor
+
+    def _refresh_centroids(
+        self, clusters: list[Cluster], node_ids: list[NodeID], store: DiskChunkStore
+    ) -> None:
+        """Recompute the centroids of clusters whose members changed from stored embeddings."""
+        for cluster in clusters:
+            member_ids = [node_ids[int(idx)] for idx in cluster.node_indices]
+            vectors = [
+                node.embedding
+                for node in store.get_nodes(member_ids)
+                if node is not None and node.embedding is not None
+            ]
+            cluster.centroid = (
+                np.asarray(vectors, dtype=np.float64).mean(axis=0).tolist() if vectors else None
+            )
+
+    def _embed_summaries(self, nodes: list[SummaryNode]) -> None:
+        """Set embeddings on new summary nodes (one batched call)."""
+        if not nodes:
+            return
+        offset = 0
+        texts = [node.text for node in nodes]
+        for block in embed_string_blocks(self.embedder, texts, self.config.embedding_batch_size):
+            for node, vector in zip(nodes[offset : offset + len(block)], block, strict=True):
+                node.embedding = vector.tolist()
+            offset += len(block)
+
+    def run_stream(
+        self,
+        source: Iterable[str] | Path,
+        store: DiskChunkStore | None = None,
+        resume: bool = False,
+    ) -> DocumentTree:
+        """
+        Execute the RAPTOR pipeline on a document that is never loaded as one string.
+
+        A file is memory-mapped and decoded incrementally, and its sentences are fed to
+        the chunker lazily, so memory stays bounded for very large inputs
+        (`max_input_length` does not apply). Two-pass chunkers re-read the file.
+        Chunkers without `split_sentences` get the newline-joined sentences as one text.
+
+        Args:
+            source: Path of a UTF-8 text file, or an iterable of text pieces whose
+                concatenation is the document.
+            store: Optional persistent store. If None, a temporary store is used (and closed on exit).
+            resume: Continue an interrupted build recorded in `store` (see `run`).
+
+        Raises:
+            ValueError: If the source produces no chunks, or the run cannot be resumed.
+        """
+        sentences: Iterable[str] = SentenceSource(source)
+        if isinstance(source, Iterator):
+            # One-shot piece streams can only be split once
+            sentences = iter(sentences)
+
+        logger.info(f"Starting RAPTOR process: Chunking streamed input ({type(source).__name__}).")
+        initial_chunks_iter: Iterable[Chunk]
+        if isinstance(self.chunker, SentenceSplitter):
+            initial_chunks_iter = self.chunker.split_sentences(sentences, self.config)
+        else:
+            logger.warning(
+                f"{type(self.chunker).__name__} cannot chunk a sentence stream; "
+                "reading the whole input into memory."
+            )
+            initial_chunks_iter = self.chunker.split_text("\n".join(sentences), self.config)
+
+        # Pieces from an arbitrary iterable can't be fingerprinted without consuming them
+        input_digest = file_digest(source) if isinstance(source, Path) else None
+        return self._build_tree(initial_chunks_iter, store, input_digest, resume)
+
+    def _build_tree(
+        self,
+        initial_chunks_iter: Iterable[Chunk],
+        store: DiskChunkStore | None,
+        input_digest: str | None = None,
+        resume: bool = False,
+    ) -> DocumentTree:
+        """Run Level 0 and the recursive levels over the chunk stream and build the tree."""
+        if resume and store is None:
+            msg = "Resuming a run requires a persistent store."
+            raise ValueError(msg)
+
+        summary_ids: list[str] = []
 
         # Use provided store or create a temporary one
         # If provided, we wrap it in a nullcontext so it doesn't close on exit
@@ -121,33 +482,76 @@ class RaptorEngine:
         )
 
         with store_ctx as active_store:
+            run_levels = self._load_run_manifest(active_store, input_digest) if resume else {}
+            if not run_levels:
+                active_store.reset_run(input_digest)
+
             # Level 0
-            clusters, current_level_ids = self._process_level_zero(
-                initial_chunks_iter, active_store
-            )
+            if 0 in run_levels:
+                current_level_ids, clusters = run_levels[0]
+                logger.info(f"Resuming: reusing {len(current_level_ids)} stored Level 0 chunks.")
+            else:
+                clusters, current_level_ids = self._process_level_zero(
+                    initial_chunks_iter, active_store
+                )
+                active_store.save_run_level(0, current_level_ids, clusters)
             # Capture L0 IDs for later reconstruction
             l0_ids = list(current_level_ids)
 
             current_level_ids = self._process_recursion(
-                clusters, current_level_ids, active_store, all_summaries
+                clusters, current_level_ids, active_store, summary_ids, run_levels=run_levels
             )
 
-            return self._finalize_tree(current_level_ids, active_store, all_summaries, l0_ids)
+            tree = self._finalize_tree(current_level_ids, active_store, summary_ids, l0_ids)
+            if store is None:
+                # The temporary store is deleted on exit, so load the nodes into memory
+                tree = tree.model_copy(update={"all_nodes": dict(tree.all_nodes.items())})
+            return tree
+
+    def _load_run_manifest(
+        self, store: DiskChunkStore, input_digest: str | None
+    ) -> dict[int, tuple[list[NodeID], list[Cluster]]]:
+        """
+        Load the recorded levels of an interrupted run for resuming.
+
+        Raises:
+            ValueError: If the store's run was built from a different input.
+        """
+        stored_digest = store.get_run_input_digest()
+        if input_digest and stored_digest and stored_digest != input_digest:
+            msg = "Cannot resume: the store's run manifest was built from a different input."
+            raise ValueError(msg)
+
+        run_levels = store.get_run_levels()
+        if run_levels:
+            logger.info(f"Resuming run: levels {sorted(run_levels)} already clustered.")
+        else:
+            logger.info("No run manifest in store; starting from scratch.")
+        return run_levels
 
     def _process_recursion(
         self,
         clusters: list[Cluster],
         current_level_ids: list[NodeID],
         store: DiskChunkStore,
-        all_summaries: dict[str, SummaryNode],
+        summary_ids: list[str],
         start_level: int = 0,
+        *,
+        run_levels: dict[int, tuple[list[NodeID], list[Cluster]]] | None = None,
     ) -> list[NodeID]:
         """
         Execute the recursive summarization loop.
 
         Iteratively clusters and summarizes nodes until a single root node is reached
         or no further reduction is possible.
+
+        Progress is recorded in the store's run manifest: each summarized cluster as soon
+        as its summary is stored, and each level's node IDs and clusters once computed.
+        Clusters and levels found there (from `run_levels` when resuming) are reused.
+        Only the IDs of new summaries are kept (appended to `summary_ids`); the nodes
+        themselves stay in the store.
         """
+        run_levels = run_levels or {}
         level = start_level
         while True:
             node_count = len(current_level_ids)
@@ -178,34 +582,158 @@ class RaptorEngine:
             logger.info(f"Level {level}: Generated {len(clusters)} clusters.")
 
             # Summarization
+            current_level_ids = self._summarize_level(clusters, current_level_ids, store, level)
+            summary_ids.extend(str(nid) for nid in current_level_ids)
             level += 1
-            new_nodes_iter = self._summarize_clusters(clusters, current_level_ids, store, level)
 
-            current_level_ids = []
+            recorded = run_levels.get(level)
+            if recorded is not None and recorded[0] == current_level_ids:
+                logger.info(f"Resuming: reusing stored clusters of Level {level}.")
+                clusters = recorded[1]
+            else:
+                if len(current_level_ids) <= 1:
+                    clusters = []
+                elif self.config.pipeline_levels:
+                    # Summaries were embedded and stored while the level was summarized
+                    clusters = self._cluster_stored_level(current_level_ids, store)
+                else:
+                    # Embed and Cluster for next level
+                    clusters = self._embed_and_cluster_next_level(current_level_ids, store)
+                store.save_run_level(level, current_level_ids, clusters)
 
-            # Process summary nodes in batches
-            summary_buffer: list[SummaryNode] = []
-            BATCH_SIZE = self.config.chunk_buffer_size
+        return current_level_ids
 
-            for node in new_nodes_iter:
-                all_summaries[node.id] = node
-                current_level_ids.append(node.id)
-                summary_buffer.append(node)
+    def _summarize_level(
+        self,
+        clusters: list[Cluster],
+        current_level_ids: list[NodeID],
+        store: DiskChunkStore,
+        cluster_level: int,
+    ) -> list[NodeID]:
+        """
+        Summarize the clusters of `cluster_level` into the next level and store the results.
 
-                if len(summary_buffer) >= BATCH_SIZE:
-                    store.add_summaries(summary_buffer)
-                    summary_buffer.clear()
+        Clusters already summarized before an interruption are reused. Returns the IDs of
+        the next level's nodes in cluster order.
+        """
+        pipeline = self.config.pipeline_levels
+        done = self._load_done_summaries(store, cluster_level, with_embeddings=pipeline)
+        new_nodes_iter = (
+            (pos, node, True)
+            for pos, node in self._summarize_clusters(
+                clusters, current_level_ids, store, cluster_level + 1, skip=done.keys()
+            )
+        )
+        summaries = heapq.merge(
+            ((pos, node, False) for pos, node in sorted(done.items())),
+            new_nodes_iter,
+            key=operator.itemgetter(0),
+        )
+        if pipeline:
+            return self._summarize_level_pipelined(summaries, store, cluster_level)
 
-            if summary_buffer:
-                store.add_summaries(summary_buffer)
+        next_level_ids: list[NodeID] = []
 
-            if len(current_level_ids) > 1:
-                # Embed and Cluster for next level
-                clusters = self._embed_and_cluster_next_level(current_level_ids, store)
-            else:
-                clusters = []
+        # Process summary nodes in batches
+        summary_buffer: list[tuple[int, SummaryNode]] = []
+        BATCH_SIZE = self.config.chunk_buffer_size
 
-        return current_level_ids
+        for pos, node, is_new in summaries:
+            next_level_ids.append(node.id)
+            if not is_new:
+                continue
+            summary_buffer.append((pos, node))
+
+            if len(summary_buffer) >= BATCH_SIZE:
+                self._flush_summaries(store, cluster_level, summary_buffer)
+                summary_buffer.clear()
+
+        if summary_buffer:
+            self._flush_summaries(store, cluster_level, summary_buffer)
+
+        return next_level_ids
+
+    def _summarize_level_pipelined(
+        self,
+        summaries: Iterable[tuple[int, SummaryNode, bool]],
+        store: DiskChunkStore,
+        cluster_level: int,
+    ) -> list[NodeID]:
+        """
+        Embed and store a level's summaries while later clusters are still being summarized.
+
+        `summaries` (position, node, is_new) are produced on one thread, embedded in
+        `embedding_batch_size` batches on a second and stored with their embeddings (then
+        recorded in the run manifest) on a third, with at most `pipeline_queue_size`
+        summaries queued between stages. Only clustering of the next level waits for the
+        whole level.
+        """
+        stages: list[Stage] = [
+            self._embed_summary_stage,
+            functools.partial(self._store_summary_stage, store=store, cluster_level=cluster_level),
+        ]
+        next_level_ids: list[NodeID] = []
+        for node in pipelined(summaries, stages, self.config.pipeline_queue_size):
+            next_level_ids.append(node.id)
+        return next_level_ids
+
+    def _embed_summary_stage(
+        self, items: Iterator[tuple[int, SummaryNode, bool]]
+    ) -> Iterator[tuple[int, SummaryNode, bool]]:
+        """Pipeline stage: embed summaries that have no embedding yet, one batch at a time."""
+        for batch in batched(items, self.config.embedding_batch_size):
+            self._embed_summaries([node for _, node, _ in batch if node.embedding is None])
+            yield from batch
+
+    def _store_summary_stage(
+        self,
+        items: Iterator[tuple[int, SummaryNode, bool]],
+        store: DiskChunkStore,
+        cluster_level: int,
+    ) -> Iterator[SummaryNode]:
+        """
+        Pipeline stage: store embedded summaries in batches and yield them.
+
+        Resumed summaries already in the store only get their embedding written. Yielded
+        nodes no longer carry their embedding, which now lives in the store.
+        """
+        for batch in batched(items, self.config.chunk_buffer_size):
+            new = [(pos, node) for pos, node, is_new in batch if is_new]
+            if new:
+                self._flush_summaries(store, cluster_level, new)
+            resumed = [
+                (node.id, node.embedding)
+                for _, node, is_new in batch
+                if not is_new and node.embedding is not None
+            ]
+            if resumed:
+                store.update_node_embeddings(resumed)
+            for _, node, _ in batch:
+                node.embedding = None
+                yield node
+
+    def _load_done_summaries(
+        self, store: DiskChunkStore, cluster_level: int, *, with_embeddings: bool = False
+    ) -> dict[int, SummaryNode]:
+        """Stored summaries of the clusters of `cluster_level` that are already done, by position."""
+        recorded = store.get_cluster_summaries(cluster_level)
+        if not recorded:
+            return {}
+
+        done: dict[int, SummaryNode] = {}
+        nodes = store.get_nodes(recorded.values(), with_embeddings=with_embeddings)
+        for pos, node in zip(recorded, nodes, strict=True):
+            if isinstance(node, SummaryNode):
+                done[pos] = node
+        logger.info(f"Resuming: {len(done)} clusters of Level {cluster_level} already summarized.")
+        return done
+
+    def _flush_summaries(
+        self, store: DiskChunkStore, cluster_level: int, summaries: list[tuple[int, SummaryNode]]
+    ) -> None:
+        """Store new summary nodes, then mark their clusters as done in the run manifest."""
+        store.add_summaries(node for _, node in summaries)
+        store.record_cluster_summaries(cluster_level, ((pos, node.id) for pos, node in summaries))
 
     def _embed_and_cluster_next_level(
         self, current_level_ids: list[NodeID], store: DiskChunkStore
@@ -217,27 +745,18 @@ class RaptorEngine:
         updates the store with new embeddings, and clusters them.
         """
 
-        def lx_embedding_generator() -> Iterator[list[float]]:
-            # Generator that yields (id, text) tuples
-            def node_text_generator() -> Iterator[tuple[NodeID, str]]:
-                for nid in current_level_ids:
-                    node = store.get_node(nid)
-                    if node:
-                        yield nid, node.text
-                    else:
-                        logger.warning(
-                            f"Node {nid} not found in store during next level clustering."
-                        )
+        def lx_embedding_generator() -> Iterator[np.ndarray]:
+            # Embedding updates are buffered and written with one transaction per flush
+            # instead of one commit per node.
+            pending_updates: list[tuple[NodeID, np.ndarray]] = []
 
             # Strategy: Batched processing manually
             # We process in batches to avoid loading all texts.
             # batch is a tuple of (NodeID, str) tuples.
             # batched is lazy, so we don't load everything.
-            for batch in batched(node_text_generator(), self.config.embedding_batch_size):
-                # batch is tuple of (id, text)
-                # To efficiently use embed_strings and keep synchronization with IDs,
-                # we unzip the batch into two iterators.
-
+            for batch in batched(
+                self._iter_node_texts(current_level_ids, store), self.config.embedding_batch_size
+            ):
                 # unzip: zip(*batch) returns two tuples: (id1, id2...), (text1, text2...)
                 unzipped = list(zip(*batch, strict=True))
                 if not unzipped:
@@ -246,39 +765,81 @@ class RaptorEngine:
                 ids_tuple = unzipped[0]
                 texts_tuple = unzipped[1]
 
-                # Embed batch (returns iterator)
+                # Embed batch as (n, dim) blocks that go to the clusterer unchanged
                 try:
-                    # embed_strings takes Iterable[str], so tuple is fine.
-                    embeddings = self.embedder.embed_strings(texts_tuple)
-
-                    # We iterate embeddings and match with IDs
-                    # zip ensures lock-step iteration
-                    for nid, embedding in zip(ids_tuple, embeddings, strict=True):
-                        store.update_node_embedding(nid, embedding)
-                        yield embedding
+                    offset = 0
+                    for block in embed_string_blocks(self.embedder, texts_tuple, len(texts_tuple)):
+                        block_ids = ids_tuple[offset : offset + len(block)]
+                        pending_updates.extend(zip(block_ids, block, strict=True))
+                        offset += len(block)
+                        yield block
                 except Exception as e:
                     logger.exception("Failed to embed batch during next level clustering.")
                     msg = "Embedding failed during recursion."
                     raise RuntimeError(msg) from e
 
+                if offset != len(ids_tuple):
+                    msg = f"Embedder returned {offset} vectors for {len(ids_tuple)} nodes."
+                    raise RuntimeError(msg)
+
+                if len(pending_updates) >= self.config.write_batch_size:
+                    store.update_node_embeddings(pending_updates)
+                    pending_updates.clear()
+
+            if pending_updates:
+                store.update_node_embeddings(pending_updates)
+
+        try:
+            return self._cluster_blocks(lx_embedding_generator())
+        except Exception as e:
+            logger.exception("Clustering failed during recursion.")
+            msg = "Clustering failed during recursion."
+            raise RuntimeError(msg) from e
+
+    def _cluster_stored_level(
+        self, current_level_ids: list[NodeID], store: DiskChunkStore
+    ) -> list[Cluster]:
+        """Cluster the next level from embeddings already in the store (`pipeline_levels`)."""
         try:
-            return self.clusterer.cluster_nodes(lx_embedding_generator(), self.config)
+            return self._cluster_blocks(store.iter_embedding_blocks(current_level_ids))
         except Exception as e:
             logger.exception("Clustering failed during recursion.")
             msg = "Clustering failed during recursion."
             raise RuntimeError(msg) from e
 
+    def _cluster_blocks(self, blocks: Iterable[np.ndarray]) -> list[Cluster]:
+        """Cluster embedding blocks, through `cluster_arrays` if the clusterer supports it."""
+        if isinstance(self.clusterer, ArrayClusterer):
+            return self.clusterer.cluster_arrays(blocks, self.config)
+        rows = (vector for block in blocks for vector in block.tolist())
+        return self.clusterer.cluster_nodes(rows, self.config)
+
+    def _iter_node_texts(
+        self, node_ids: list[NodeID], store: DiskChunkStore
+    ) -> Iterator[tuple[NodeID, str]]:
+        """Yield (id, text) tuples, fetching nodes from the store in bulk (text only)."""
+        for id_batch in batched(node_ids, QUERY_BATCH_SIZE):
+            nodes = store.get_nodes(id_batch, with_embeddings=False)
+            for nid, node in zip(id_batch, nodes, strict=True):
+                if node:
+                    yield nid, node.text
+                else:
+                    logger.warning(f"Node {nid} not found in store during next level clustering.")
+
     def _finalize_tree(
         self,
         current_level_ids: list[NodeID],
         store: DiskChunkStore,
-        all_summaries: dict[str, SummaryNode],
+        summary_ids: list[str],
         l0_ids: list[NodeID],
     ) -> DocumentTree:
         """
         Construct the final DocumentTree.
 
-        Builds the tree structure from the final root node down to the leaf chunks.
+        Builds the tree structure from the final root node down to the leaf chunks, and
+        saves it in the store so it can be reloaded with `DiskChunkStore.load_tree`.
+        `all_nodes` is a `StoredSummaryNodes` view over `summary_ids` that reads nodes
+        (with embeddings) from `store` on access.
         """
         if not current_level_ids:
             # If input was empty?
@@ -304,8 +865,6 @@ class RaptorEngine:
             if embeddings:
                 root_node_obj.embedding = embeddings[0]
                 store.update_node_embedding(root_id, embeddings[0])
-                if isinstance(root_node_obj, SummaryNode):
-                    all_summaries[str(root_id)] = root_node_obj
 
         if isinstance(root_node_obj, Chunk):
             root_node = SummaryNode(
@@ -315,16 +874,19 @@ class RaptorEngine:
                 children_indices=[root_node_obj.index],
                 metadata={"type": "single_chunk_root"},
             )
-            all_summaries[root_node.id] = root_node
+            summary_ids.append(root_node.id)
+            store.add_summary(root_node)
         else:
             root_node = root_node_obj
 
-        return DocumentTree(
+        tree = DocumentTree(
             root_node=root_node,
-            all_nodes=all_summaries,
+            all_nodes=StoredSummaryNodes(store, summary_ids, with_embeddings=True),
             leaf_chunk_ids=l0_ids,
             metadata={"levels": root_node.level},
         )
+        store.save_tree(tree)
+        return tree
 
     def _summarize_clusters(
         self,
@@ -332,26 +894,86 @@ class RaptorEngine:
         current_level_ids: list[NodeID],
         store: DiskChunkStore,
         level: int,
-    ) -> Iterator[SummaryNode]:
+        skip: Container[int] = (),
+    ) -> Iterator[tuple[int, SummaryNode]]:
         """
         Process clusters to generate summaries (streaming).
 
         Iterates over clusters, retrieves member texts, and invokes the summarizer.
-        Yields SummaryNodes for the next level.
+        Yields (cluster position, SummaryNode) for the next level in cluster order.
+        Clusters whose position is in `skip` (already summarized) are left out.
+
+        If `config.summarization_concurrency` > 1, up to that many summarizer calls are
+        kept in flight on a thread pool. Results are still yielded in cluster order so
+        the emitted nodes (and their storage order) are deterministic.
         """
-        for cluster in clusters:
-            children_indices: list[NodeID] = []
-            cluster_texts: list[str] = []
+        cluster_inputs = self._iter_cluster_inputs(clusters, current_level_ids, store, skip)
+        concurrency = self.config.summarization_concurrency
+
+        if concurrency <= 1:
+            for pos, cluster, children_indices, combined_text in cluster_inputs:
+                summary_text = self.summarizer.summarize(combined_text, self.config)
+                yield pos, self._build_summary_node(cluster, children_indices, summary_text, level)
+            return
+
+        logger.info(f"Level {level}: Summarizing clusters with concurrency {concurrency}.")
+        pending: deque[tuple[int, Cluster, list[NodeID], Future[str]]] = deque()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                for pos, cluster, children_indices, combined_text in cluster_inputs:
+                    future = executor.submit(self.summarizer.summarize, combined_text, self.config)
+                    pending.append((pos, cluster, children_indices, future))
+
+                    # Bound the number of in-flight requests (and buffered texts).
+                    if len(pending) >= concurrency:
+                        yield self._resolve_pending(pending.popleft(), level)
+
+                while pending:
+                    yield self._resolve_pending(pending.popleft(), level)
+            finally:
+                # On error (or early generator close), don't wait on queued requests.
+                for *_, future in pending:
+                    future.cancel()
+
+    def _resolve_pending(
+        self, entry: tuple[int, Cluster, list[NodeID], Future[str]], level: int
+    ) -> tuple[int, SummaryNode]:
+        """Wait for an in-flight summarization and wrap its result."""
+        pos, cluster, children_indices, future = entry
+        return pos, self._build_summary_node(cluster, children_indices, future.result(), level)
+
+    def _iter_cluster_inputs(
+        self,
+        clusters: list[Cluster],
+        current_level_ids: list[NodeID],
+        store: DiskChunkStore,
+        skip: Container[int] = (),
+    ) -> Iterator[tuple[int, Cluster, list[NodeID], str]]:
+        """
+        Resolve cluster members from the store.
 
+        Yields (position, cluster, children_indices, combined_text) for each cluster not in
+        `skip` with at least one valid member node. Store access stays on the calling thread.
+        """
+        for pos, cluster in enumerate(clusters):
+            if pos in skip:
+                continue
+            member_ids: list[NodeID] = []
             for idx_raw in cluster.node_indices:
                 idx = int(idx_raw)
                 # Check bounds
                 if idx < 0 or idx >= len(current_level_ids):
                     logger.warning(f"Cluster index {idx} out of bounds for current level nodes.")
                     continue
+                member_ids.append(current_level_ids[idx])
 
-                node_id = current_level_ids[idx]
-                node = store.get_node(node_id)
+            # One bulk query per cluster; embeddings are not needed for summarization.
+            children_indices: list[NodeID] = []
+            cluster_texts: list[str] = []
+            for node_id, node in zip(
+                member_ids, store.get_nodes(member_ids, with_embeddings=False), strict=True
+            ):
                 if not node:
                     continue
 
@@ -364,16 +986,20 @@ class RaptorEngine:
 
             # Note: For very large clusters, joining texts might still be memory intensive.
             # But the summarizer typically takes a string.
-            combined_text = "\n\n".join(cluster_texts)
-            summary_text = self.summarizer.summarize(combined_text, self.config)
-
-            node_id_str = str(uuid.uuid4())
-            summary_node = SummaryNode(
-                id=node_id_str,
-                text=summary_text,
-                level=level,
-                children_indices=children_indices,
-                metadata={"cluster_id": cluster.id},
-            )
+            yield pos, cluster, children_indices, "\n\n".join(cluster_texts)
 
-            yield summary_node
+    def _build_summary_node(
+        self,
+        cluster: Cluster,
+        children_indices: list[NodeID],
+        summary_text: str,
+        level: int,
+    ) -> SummaryNode:
+        """Wrap a summarizer result into a SummaryNode for the given level."""
+        return SummaryNode(
+            id=str(uuid.uuid4()),
+            text=summary_text,
+            level=level,
+            children_indices=children_indices,
+            metadata={"cluster_id": cluster.id},
+        )
@@ -1,24 +1,66 @@
 import logging
+from collections import deque
 from collections.abc import Iterable, Iterator
 
 import numpy as np
 
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk
-from matome.engines.embedder import EmbeddingService
-from matome.utils.text import iter_normalized_sentences
+from matome.engines.embedder import EmbeddingService, embed_string_blocks
+from matome.utils.io import SentenceSource
+from matome.utils.quantile import P2Quantile
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+class _PooledEmbedding:
+    """
+    Running length-weighted sum of a chunk's normalized sentence embeddings.
+
+    Only the sum is kept, so pooling costs one vector per chunk however long it is.
+    """
+
+    def __init__(self) -> None:
+        self.total: np.ndarray | None = None
+        self.weight = 0
+
+    def add(self, sentence: str, vector: np.ndarray) -> None:
+        weighted = len(sentence) * np.asarray(vector, dtype=np.float64)
+        self.total = weighted if self.total is None else self.total + weighted
+        self.weight += len(sentence)
+
+    def embedding(self) -> list[float] | None:
+        """
+        The re-normalized mean, or None when nothing was pooled (pooling disabled) or the
+        mean is the zero vector, so the chunk is embedded from its text instead.
+        """
+        if self.total is None or self.weight == 0:
+            return None
+        norm = np.linalg.norm(self.total)
+        if norm == 0 or not np.isfinite(norm):
+            return None
+        pooled: list[float] = (self.total / norm).tolist()
+        return pooled
+
+
 class JapaneseSemanticChunker:
     """
     Chunking engine that splits text based on semantic similarity using a Global Percentile Strategy.
     Optimized for memory safety by using a two-pass approach to avoid loading full text.
 
-    Pass 1: Stream sentences -> Embed -> Calculate Distances (store floats only).
+    Pass 1: Stream sentences -> Embed -> Calculate Distances (one float array).
     Pass 2: Stream sentences -> Chunk based on stored distances and threshold.
+
+    With `semantic_chunking_streaming`, a single pass is made instead: the percentile
+    threshold is estimated online (exact over a warm-up window, then P²), so chunks are
+    emitted while later sentences are still being embedded.
+
+    With `semantic_chunking_pool_embeddings`, each chunk's embedding is derived from the
+    sentence embeddings already computed for boundary detection (length-weighted mean of
+    the normalized sentence vectors, re-normalized), so Level 0 doesn't re-embed chunks.
+    Pooling always uses the single pass: two-pass chunking would have to keep every
+    sentence vector until pass 2, as chunk boundaries are unknown until pass 1 ends.
     """
 
     def __init__(self, embedder: EmbeddingService) -> None:
@@ -49,14 +91,49 @@ class JapaneseSemanticChunker:
         if not text:
             return
 
-        # Pass 1: Calculate Distances (Consumes text stream once)
+        yield from self.split_sentences(SentenceSource(text), config)
+
+    def split_sentences(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> Iterator[Chunk]:
+        """
+        Split a stream of normalized sentences into semantic chunks.
+
+        The two-pass strategy iterates `sentences` twice, so it needs a re-iterable source
+        (e.g. `SentenceSource`). A one-shot iterator is chunked in single-pass streaming
+        mode instead.
+
+        Args:
+            sentences: Normalized sentences, in document order.
+            config: Configuration including semantic_chunking_percentile and max_tokens.
+
+        Yields:
+            Chunk objects.
+        """
+        if config.semantic_chunking_streaming:
+            yield from self._split_text_streaming(sentences, config)
+            return
+
+        if config.semantic_chunking_pool_embeddings:
+            logger.info("Embedding pooling enabled; using single-pass streaming chunking.")
+            yield from self._split_text_streaming(sentences, config)
+            return
+
+        if isinstance(sentences, Iterator):
+            logger.warning(
+                "Sentence source can only be read once; using single-pass streaming chunking."
+            )
+            yield from self._split_text_streaming(sentences, config)
+            return
+
+        # Pass 1: Calculate Distances (Consumes sentence stream once)
         # We need to recreate the iterator for each pass
-        distances = self._calculate_semantic_distances(iter_normalized_sentences(text))
+        distances = self._calculate_semantic_distances(iter(sentences), config)
 
-        if not distances:
+        if distances.size == 0:
             # Handle single sentence or empty case
             # We need to peek at least one sentence to be sure
-            sentences_iter = iter_normalized_sentences(text)
+            sentences_iter = iter(sentences)
             first_sentence = next(sentences_iter, None)
             if first_sentence:
                 yield Chunk(
@@ -76,52 +153,173 @@ class JapaneseSemanticChunker:
             f"Global Semantic Chunking: Calculated threshold {threshold:.4f} at {percentile_val}th percentile."
         )
 
-        # Pass 2: Chunking (Consumes text stream again)
-        sentences_iter_2 = iter_normalized_sentences(text)
+        # Pass 2: Chunking (Consumes sentence stream again)
+        sentences_iter_2 = iter(sentences)
         yield from self._create_chunks(sentences_iter_2, distances, threshold, config)
 
-    def _calculate_semantic_distances(self, sentences: Iterable[str]) -> list[float]:
+    def _calculate_semantic_distances(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> np.ndarray:
         """
-        Stream embeddings and calculate cosine distances between adjacent sentences.
-        Returns a list of distances (floats).
+        Stream embedding blocks and calculate cosine distances between adjacent sentences.
+        Returns a 1-D float array of N-1 distances for N sentences.
         """
-        distances: list[float] = []
-        prev_embedding: np.ndarray | None = None
+        distance_blocks: list[np.ndarray] = []
+        prev_last: np.ndarray | None = None
 
         try:
-            # embed_strings streams embeddings
-            for embedding_list in self.embedder.embed_strings(sentences):
-                current_embedding = np.array(embedding_list)
+            # Stream (n, dim) blocks, honoring embedders that only override embed_strings
+            blocks = embed_string_blocks(self.embedder, sentences, config.embedding_batch_size)
+            for block in blocks:
+                distances, normalized = self._block_distances(block, prev_last)
+                distance_blocks.append(distances)
+                if len(normalized):
+                    prev_last = normalized[-1]
 
-                if prev_embedding is not None:
-                    # Validate Dimension Consistency
-                    self._validate_dimensions(prev_embedding, current_embedding)
+        except Exception:
+            logger.exception("Failed to generate embeddings for sentences.")
+            raise
 
-                    # Calculate Cosine Distance = 1 - Cosine Similarity
-                    norm_a = np.linalg.norm(prev_embedding)
-                    norm_b = np.linalg.norm(current_embedding)
+        if not distance_blocks:
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate(distance_blocks)
 
-                    if norm_a == 0 or norm_b == 0:
-                        sim = 0.0
-                    else:
-                        sim = float(np.dot(prev_embedding, current_embedding) / (norm_a * norm_b))
+    def _iter_sentence_distances(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> Iterator[tuple[str, float | None, np.ndarray]]:
+        """
+        Single pass over sentences: yield each sentence with its distance to the previous one
+        and its normalized embedding.
 
-                    # Clamp sim to [-1, 1]
-                    sim = max(-1.0, min(1.0, sim))
-                    distances.append(1.0 - sim)
+        The first sentence is paired with None. Sentences are buffered only until the
+        embedder returns their vectors (at most one embedding batch).
+        """
+        pending: deque[str] = deque()
 
-                prev_embedding = current_embedding
+        def record(source: Iterable[str]) -> Iterator[str]:
+            for sentence in source:
+                pending.append(sentence)
+                yield sentence
 
+        prev_last: np.ndarray | None = None
+        try:
+            blocks = embed_string_blocks(
+                self.embedder, record(sentences), config.embedding_batch_size
+            )
+            for block in blocks:
+                distances, normalized = self._block_distances(block, prev_last)
+                if not len(normalized):
+                    continue
+                rows = iter(normalized)
+                if prev_last is None:
+                    yield pending.popleft(), None, next(rows)
+                for distance, row in zip(distances.tolist(), rows, strict=True):
+                    yield pending.popleft(), distance, row
+                prev_last = normalized[-1]
         except Exception:
             logger.exception("Failed to generate embeddings for sentences.")
             raise
 
-        return distances
+    def _block_distances(
+        self, block: np.ndarray, prev_last: np.ndarray | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine distances between adjacent rows of an embedding block.
+
+        The block is L2-normalized once and the distances come from one row-wise dot
+        product. `prev_last` (the normalized last row of the previous block) carries the
+        distance across the block boundary.
+
+        Returns:
+            (distances, normalized block). Distances has one entry per row, or one fewer
+            for the very first block. Similarity is clamped to [-1, 1] and zero vectors
+            have similarity 0.
+        """
+        arr = np.asarray(block, dtype=np.float64)
+        if arr.ndim != 2:
+            msg = f"Embedding block must be 2-D, got shape {arr.shape}."
+            raise ValueError(msg)
+        if arr.shape[0] == 0:
+            return np.empty(0, dtype=np.float64), arr
+
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        normalized = np.divide(arr, norms, out=np.zeros_like(arr), where=norms > 0)
+
+        sims = np.einsum("ij,ij->i", normalized[:-1], normalized[1:])
+        if prev_last is not None:
+            # Validate Dimension Consistency across the block boundary
+            self._validate_dimensions(prev_last, normalized[0])
+            sims = np.concatenate(([prev_last @ normalized[0]], sims))
+
+        return 1.0 - np.clip(sims, -1.0, 1.0), normalized
+
+    def _split_text_streaming(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> Iterator[Chunk]:
+        """Single-pass semantic chunking with an online percentile threshold."""
+        pairs = self._iter_sentence_distances(sentences, config)
+        first = next(pairs, None)
+        if first is None:
+            return
+
+        pool = config.semantic_chunking_pool_embeddings
+        breaks = self._iter_streaming_breaks(pairs, config)
+        yield from self._merge_sentences(first[0], breaks, config, first[2] if pool else None)
+
+    def _iter_streaming_breaks(
+        self, pairs: Iterator[tuple[str, float | None, np.ndarray]], config: ProcessingConfig
+    ) -> Iterator[tuple[str, bool, np.ndarray | None]]:
+        """
+        Decide semantic breaks for a stream of (sentence, distance) pairs.
+
+        The first `semantic_chunking_warmup` gaps are buffered and judged against the exact
+        percentile of the buffer (so short documents match the two-pass result). Every
+        later gap is judged against the running P² estimate including its own distance.
+        """
+        percentile_val = config.semantic_chunking_percentile
+        pool = config.semantic_chunking_pool_embeddings
+        estimator = P2Quantile(percentile_val / 100)
+        warmup: list[tuple[str, float, np.ndarray | None]] | None = []
+
+        for sentence, distance, vector in pairs:
+            dist = distance if distance is not None else 0.0
+            kept = vector if pool else None
+            if warmup is not None:
+                warmup.append((sentence, dist, kept))
+                if len(warmup) >= config.semantic_chunking_warmup:
+                    yield from self._flush_warmup(warmup, estimator, percentile_val)
+                    warmup = None
+                continue
+
+            estimator.add(dist)
+            yield sentence, dist > estimator.value(), kept
+
+        if warmup:
+            yield from self._flush_warmup(warmup, estimator, percentile_val)
+
+    def _flush_warmup(
+        self,
+        warmup: list[tuple[str, float, np.ndarray | None]],
+        estimator: P2Quantile,
+        percentile_val: int,
+    ) -> Iterator[tuple[str, bool, np.ndarray | None]]:
+        """Judge the buffered warm-up gaps against their exact percentile and seed the estimator."""
+        distances = [dist for _, dist, _ in warmup]
+        threshold = float(np.percentile(distances, percentile_val))
+        for dist in distances:
+            estimator.add(dist)
+
+        logger.info(
+            f"Streaming Semantic Chunking: Initial threshold {threshold:.4f} at "
+            f"{percentile_val}th percentile over {len(distances)} gaps."
+        )
+        for sentence, dist, vector in warmup:
+            yield sentence, dist > threshold, vector
 
     def _create_chunks(
         self,
         sentences: Iterator[str],
-        distances: list[float],
+        distances: np.ndarray,
         threshold: float,
         config: ProcessingConfig,
     ) -> Iterator[Chunk]:
@@ -133,11 +331,6 @@ class JapaneseSemanticChunker:
         except StopIteration:
             return
 
-        current_chunk_sentences: list[str] = [first_sentence]
-        current_chunk_len = len(first_sentence)
-        current_start_idx = 0
-        current_chunk_index = 0
-
         # Zip distances with the *gaps* between sentences.
         # Sentences: S0, S1, S2...
         # Distances: D0 (S0-S1), D1 (S1-S2)...
@@ -146,16 +339,44 @@ class JapaneseSemanticChunker:
         # Validation: We expect distances to correspond exactly to gaps.
         # Since we use iterator for sentences, we can't check length upfront.
         # But we consume one distance per next_sentence.
+        def gaps() -> Iterator[tuple[str, bool, np.ndarray | None]]:
+            for dist in distances.tolist():
+                try:
+                    next_sentence = next(sentences)
+                except StopIteration:
+                    logger.warning("Mismatch: More distances than sentences remaining.")
+                    return
+                yield next_sentence, dist > threshold, None
+
+        yield from self._merge_sentences(first_sentence, gaps(), config)
+
+    def _merge_sentences(
+        self,
+        first_sentence: str,
+        gaps: Iterable[tuple[str, bool, np.ndarray | None]],
+        config: ProcessingConfig,
+        first_vector: np.ndarray | None = None,
+    ) -> Iterator[Chunk]:
+        """
+        Merge sentences into chunks.
 
-        for dist in distances:
-            try:
-                next_sentence = next(sentences)
-            except StopIteration:
-                logger.warning("Mismatch: More distances than sentences remaining.")
-                break
+        Args:
+            first_sentence: The first sentence of the text.
+            gaps: (next_sentence, is_semantic_break, vector) for every following sentence.
+                Vectors are None unless embeddings are pooled.
+            config: Configuration providing `max_tokens`.
+            first_vector: Normalized embedding of the first sentence, if pooling.
+        """
+        current_chunk_sentences: list[str] = [first_sentence]
+        pooled = _PooledEmbedding()
+        if first_vector is not None:
+            pooled.add(first_sentence, first_vector)
+        current_chunk_len = len(first_sentence)
+        current_start_idx = 0
+        current_chunk_index = 0
 
+        for next_sentence, is_semantic_break, vector in gaps:
             next_len = len(next_sentence)
-            is_semantic_break = dist > threshold
             is_token_overflow = (current_chunk_len + next_len) > config.max_tokens
 
             if is_semantic_break or is_token_overflow:
@@ -166,19 +387,23 @@ class JapaneseSemanticChunker:
                     text=chunk_text,
                     start_char_idx=current_start_idx,
                     end_char_idx=current_start_idx + len(chunk_text),
-                    embedding=None,
+                    embedding=pooled.embedding(),
                 )
 
                 # Reset for next chunk
                 current_chunk_index += 1
                 current_start_idx += len(chunk_text)
                 current_chunk_sentences = [next_sentence]
+                pooled = _PooledEmbedding()
                 current_chunk_len = next_len
             else:
                 # Merge
                 current_chunk_sentences.append(next_sentence)
                 current_chunk_len += next_len
 
+            if vector is not None:
+                pooled.add(next_sentence, vector)
+
         # Final flush
         if current_chunk_sentences:
             chunk_text = "".join(current_chunk_sentences)
@@ -187,7 +412,7 @@ class JapaneseSemanticChunker:
                 text=chunk_text,
                 start_char_idx=current_start_idx,
                 end_char_idx=current_start_idx + len(chunk_text),
-                embedding=None,
+                embedding=pooled.embedding(),
             )
 
     def _validate_input(self, text: str) -> None:
@@ -1,5 +1,5 @@
 import logging
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from functools import lru_cache
 
 import tiktoken
@@ -7,6 +7,7 @@ import tiktoken
 from domain_models.config import ProcessingConfig
 from domain_models.constants import ALLOWED_TOKENIZER_MODELS
 from domain_models.manifest import Chunk
+from matome.utils.compat import batched
 from matome.utils.text import iter_normalized_sentences
 
 # Configure logger
@@ -47,9 +48,34 @@ def get_cached_tokenizer(model_name: str) -> tiktoken.Encoding:
         raise ValueError(msg) from e
 
 
-def _perform_chunking(text: str, max_tokens: int, model_name: str) -> Iterator[Chunk]:
+def _iter_sentence_token_counts(
+    tokenizer: tiktoken.Encoding, sentences: Iterable[str], batch_window: int | None
+) -> Iterator[tuple[str, int]]:
     """
-    Core chunking logic using streaming.
+    Yield (sentence, token_count) pairs, in order.
+
+    Sentences are encoded as ordinary text (special tokens are not scanned for). With a
+    `batch_window`, that many sentences are read at a time and encoded with one
+    `encode_ordinary_batch` call, which runs on tiktoken's native thread pool.
+    """
+    if batch_window is None:
+        for sentence in sentences:
+            yield sentence, len(tokenizer.encode_ordinary(sentence))
+        return
+
+    for window in batched(sentences, batch_window):
+        token_lists = tokenizer.encode_ordinary_batch(list(window))
+        for sentence, tokens in zip(window, token_lists, strict=True):
+            yield sentence, len(tokens)
+
+
+def _perform_chunking(
+    sentences: Iterable[str], max_tokens: int, model_name: str, batch_window: int | None = None
+) -> Iterator[Chunk]:
+    """
+    Core chunking logic using streaming, over normalized sentences.
+
+    `batch_window` enables windowed batch tokenization; chunk boundaries are unchanged.
     """
     # Retrieve tokenizer
     tokenizer = get_cached_tokenizer(model_name)
@@ -69,9 +95,8 @@ def _perform_chunking(text: str, max_tokens: int, model_name: str) -> Iterator[C
         )
 
     # Use iterator for normalized sentences to allow streaming
-    for sentence in iter_normalized_sentences(text):
-        sentence_tokens = len(tokenizer.encode(sentence))
-
+    sentence_counts = _iter_sentence_token_counts(tokenizer, sentences, batch_window)
+    for sentence, sentence_tokens in sentence_counts:
         if current_tokens + sentence_tokens > max_tokens and current_chunk_sentences:
             chunk_text = "".join(current_chunk_sentences)
             yield create_chunk(chunk_index, chunk_text, start_char_idx)
@@ -128,10 +153,10 @@ class JapaneseTokenChunker:
         self.tokenizer = get_cached_tokenizer(config.tokenizer_model)
 
     def count_tokens(self, text: str) -> int:
-        """Count tokens in text."""
+        """Count tokens in text (as ordinary text, without special-token scanning)."""
         if not text:
             return 0
-        return len(self.tokenizer.encode(text))
+        return len(self.tokenizer.encode_ordinary(text))
 
     def split_text(self, text: str, config: ProcessingConfig) -> Iterator[Chunk]:
         """
@@ -150,7 +175,26 @@ class JapaneseTokenChunker:
 
         logger.debug(f"Splitting text of length {len(text)} with max_tokens={config.max_tokens}")
 
+        yield from self.split_sentences(iter_normalized_sentences(text), config)
+
+    def split_sentences(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> Iterator[Chunk]:
+        """
+        Split a stream of normalized sentences into chunks (streaming).
+
+        Args:
+            sentences: Normalized sentences, in document order (consumed once).
+            config: Configuration including max_tokens and tokenizer_model.
+
+        Yields:
+            Chunk objects.
+        """
         chunking_model_name = self.tokenizer.name  # e.g. "cl100k_base"
 
+        batch_window = config.tokenizer_batch_window if config.tokenizer_batch_mode else None
+
         # Yield from generator directly
-        yield from _perform_chunking(text, config.max_tokens, chunking_model_name)
+        yield from _perform_chunking(
+            sentences, config.max_tokens, chunking_model_name, batch_window=batch_window
+        )
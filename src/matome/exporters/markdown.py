@@ -71,8 +71,7 @@ def export_to_markdown(tree: DocumentTree, store: DiskChunkStore | None = None)
     chunk_map: dict[int, Chunk] = {}
 
     if store and tree.leaf_chunk_ids:
-        for chunk_id in tree.leaf_chunk_ids:
-            node = store.get_node(chunk_id)
+        for node in store.iter_nodes(tree.leaf_chunk_ids, with_embeddings=False):
             if isinstance(node, Chunk):
                 chunk_map[node.index] = node
 
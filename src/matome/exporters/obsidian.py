@@ -76,8 +76,7 @@ class ObsidianCanvasExporter:
 
         # Populate chunk map from store if available
         if store and tree.leaf_chunk_ids:
-            for chunk_id in tree.leaf_chunk_ids:
-                node = store.get_node(chunk_id)
+            for node in store.iter_nodes(tree.leaf_chunk_ids, with_embeddings=False):
                 if isinstance(node, Chunk):
                     self._chunk_map[node.index] = node
 
@@ -1,6 +1,8 @@
 from collections.abc import Iterable
 from typing import Protocol, runtime_checkable
 
+import numpy as np
+
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk, Cluster
 
@@ -32,6 +34,35 @@ class Chunker(Protocol):
         ...
 
 
+@runtime_checkable
+class SentenceSplitter(Protocol):
+    """
+    Optional capability of a `Chunker`: chunking a stream of sentences.
+
+    `RaptorEngine.run_stream` feeds sentences lazily to chunkers that provide it; other
+    chunkers get the joined text through `split_text`.
+    """
+
+    def split_sentences(
+        self, sentences: Iterable[str], config: ProcessingConfig
+    ) -> Iterable[Chunk]:
+        """
+        Split a stream of normalized sentences into chunks.
+
+        Lets callers feed documents that are never held as one string (e.g. a file read
+        incrementally). Chunk character offsets refer to the concatenated sentences.
+
+        Args:
+            sentences: Normalized sentences, in document order. Multi-pass implementations
+                       iterate it more than once if it is re-iterable (not an iterator).
+            config: Configuration parameters including `max_tokens` and `overlap`.
+
+        Yields:
+            `Chunk` objects. Yields nothing if there are no sentences.
+        """
+        ...
+
+
 @runtime_checkable
 class Clusterer(Protocol):
     """
@@ -62,6 +93,59 @@ class Clusterer(Protocol):
         ...
 
 
+@runtime_checkable
+class ArrayClusterer(Protocol):
+    """
+    Optional capability of a `Clusterer`: clustering embeddings given as NumPy blocks.
+
+    The engine uses `cluster_arrays` when the clusterer provides it and falls back to
+    `cluster_nodes` with per-vector lists otherwise.
+    """
+
+    def cluster_arrays(
+        self, blocks: Iterable[np.ndarray], config: ProcessingConfig
+    ) -> list[Cluster]:
+        """
+        Cluster nodes based on blocks of embeddings.
+
+        Equivalent to `cluster_nodes`, but takes the embeddings as a stream of (n, dim)
+        arrays so producers that already hold NumPy batches avoid per-vector lists.
+
+        Args:
+            blocks: An iterable of 2-D arrays. Rows, concatenated in order, are the nodes
+                    (0..N-1).
+            config: Configuration parameters such as `n_clusters` or `clustering_algorithm`.
+
+        Returns:
+            A list of `Cluster` objects whose `node_indices` refer to the concatenated rows.
+        """
+        ...
+
+
+@runtime_checkable
+class NeighborSearch(Protocol):
+    """
+    Protocol for k-nearest-neighbor search backends.
+
+    Used by the clusterer to build the k-NN graph that UMAP starts from, so exact and
+    approximate (ANN) implementations can be swapped.
+    """
+
+    def kneighbors(self, data: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the `k` nearest (euclidean) neighbors of every row of `data`.
+
+        Args:
+            data: (n, dim) float array; may be a memmap.
+            k: Neighbors per row, counting the row itself (1 <= k <= n).
+
+        Returns:
+            (indices, distances), both of shape (n, k): int64 row indices and float32
+            distances, each row sorted by distance and starting with the row itself.
+        """
+        ...
+
+
 @runtime_checkable
 class Summarizer(Protocol):
     """
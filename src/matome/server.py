@@ -0,0 +1,400 @@
+"""
+Long-running summarization server.
+
+Keeps one `RaptorEngine` (embedding model, LLM clients, caches) warm across requests,
+so small documents don't pay the cold start of every `matome run`. Jobs are queued and
+processed by a fixed number of worker threads; progress is streamed back as
+newline-delimited JSON.
+
+Endpoints:
+    POST /jobs              Body {"text": "..."}; returns 202 {"id": ..., "status": "queued"}.
+    GET  /jobs/<id>         Job status, with the result once done.
+    GET  /jobs/<id>/events  NDJSON stream of the job's events until it finishes.
+    GET  /health            Queue and worker counts.
+"""
+
+import json
+import logging
+import queue
+import socketserver
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from matome.engines.raptor import RaptorEngine
+from matome.exporters.markdown import export_to_markdown
+from matome.utils.store import DiskChunkStore
+
+logger = logging.getLogger(__name__)
+
+JobState = Literal["queued", "running", "done", "failed"]
+
+# Finished jobs kept for status queries before the oldest are forgotten
+MAX_RETAINED_JOBS = 1000
+# Seconds an event stream waits for news before sending a keep-alive line
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+
+class SummarizeJob:
+    """A queued summarization request and the events it has produced so far."""
+
+    def __init__(self, text: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.text = text
+        self.status: JobState = "queued"
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        self.events: list[dict[str, Any]] = []
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self.status in ("done", "failed")
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Append an event and wake up any streaming readers."""
+        with self._cond:
+            self.events.append({"event": event, **data})
+            self._cond.notify_all()
+
+    def start(self) -> None:
+        """Mark the job as running."""
+        self.status = "running"
+        self.emit("started")
+
+    def finish(self, result: dict[str, Any] | None = None, error: str | None = None) -> None:
+        """Mark the job as done (with `result`) or failed (with `error`)."""
+        with self._cond:
+            self.result = result
+            self.error = error
+            self.status = "failed" if error is not None else "done"
+            self.events.append({"event": self.status, **self.snapshot()})
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable status of the job."""
+        data: dict[str, Any] = {"id": self.id, "status": self.status}
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+    def iter_events(self, keepalive: float = EVENT_KEEPALIVE_SECONDS) -> Iterator[dict[str, Any]]:
+        """
+        Yield the job's events from the beginning, blocking for new ones until it finishes.
+
+        Yields `{"event": "keepalive"}` when nothing happened for `keepalive` seconds.
+        """
+        sent = 0
+        while True:
+            with self._cond:
+                if sent == len(self.events) and not self.finished:
+                    self._cond.wait(timeout=keepalive)
+                pending = self.events[sent:]
+                finished = self.finished
+            sent += len(pending)
+
+            yield from pending
+            if finished and sent == len(self.events):
+                return
+            if not pending:
+                yield {"event": "keepalive"}
+
+
+class _JobLogHandler(logging.Handler):
+    """Forwards log records emitted on a worker thread to the job that thread is running."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.INFO)
+        self._jobs: dict[int, SummarizeJob] = {}
+
+    def bind(self, job: SummarizeJob | None) -> None:
+        """Attach (or with None, detach) a job to the calling thread."""
+        thread_id = threading.get_ident()
+        if job is None:
+            self._jobs.pop(thread_id, None)
+        else:
+            self._jobs[thread_id] = job
+
+    def emit(self, record: logging.LogRecord) -> None:
+        job = self._jobs.get(record.thread) if record.thread is not None else None
+        if job is not None:
+            job.emit("progress", message=record.getMessage())
+
+
+class JobManager:
+    """
+    Queue of summarization jobs served by worker threads sharing one engine.
+
+    Worker threads run `engine.run` for one job at a time, so up to `workers` documents
+    are processed concurrently. Progress that matome logs at INFO on a worker thread
+    (when INFO logging is enabled, as the CLI does) is forwarded to its job's events.
+    """
+
+    def __init__(
+        self,
+        engine: RaptorEngine,
+        workers: int = 1,
+        queue_size: int = 100,
+        output_dir: Path | None = None,
+    ) -> None:
+        """
+        Initialize the manager (call `start` to launch the workers).
+
+        Args:
+            engine: Engine shared by all jobs.
+            workers: Number of jobs processed concurrently.
+            queue_size: Maximum number of queued jobs; `submit` rejects jobs beyond it.
+            output_dir: If given, each job's chunks.db and summary_all.md are kept in
+                `output_dir/<job id>/`. Otherwise a temporary store is used per job.
+        """
+        if workers < 1:
+            msg = "workers must be at least 1."
+            raise ValueError(msg)
+        self.engine = engine
+        self.workers = workers
+        self.output_dir = output_dir
+        self._queue: queue.Queue[SummarizeJob | None] = queue.Queue(maxsize=queue_size)
+        self._jobs: OrderedDict[str, SummarizeJob] = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._log_handler = _JobLogHandler()
+
+    def start(self) -> None:
+        """Launch the worker threads and start forwarding progress logs to jobs."""
+        logging.getLogger("matome").addHandler(self._log_handler)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"matome-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self) -> None:
+        """Stop the workers after the jobs already queued, and detach the log handler."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        logging.getLogger("matome").removeHandler(self._log_handler)
+
+    def submit(self, text: str) -> SummarizeJob:
+        """
+        Queue a summarization job.
+
+        Raises:
+            ValueError: If the text is empty.
+            queue.Full: If the queue is full.
+        """
+        if not isinstance(text, str) or not text.strip():
+            msg = "Job text must be a non-empty string."
+            raise ValueError(msg)
+
+        job = SummarizeJob(text)
+        job.emit("queued", position=self._queue.qsize() + 1)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._forget_finished_jobs()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                self._jobs.pop(job.id, None)
+            raise
+        return job
+
+    def get(self, job_id: str) -> SummarizeJob | None:
+        """Look up a job by ID."""
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict[str, int]:
+        """Number of workers and of queued jobs."""
+        return {"workers": self.workers, "queued": self._queue.qsize()}
+
+    def _forget_finished_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_RETAINED_JOBS (caller holds the lock)."""
+        excess = len(self._jobs) - MAX_RETAINED_JOBS
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished][: max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _work(self) -> None:
+        """Worker loop: run queued jobs until a None sentinel arrives."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._log_handler.bind(job)
+            try:
+                self._run_job(job)
+            finally:
+                self._log_handler.bind(None)
+
+    def _run_job(self, job: SummarizeJob) -> None:
+        """Build the tree for a job and record its result (or error)."""
+        job.start()
+        job_dir = self.output_dir / job.id if self.output_dir else None
+        try:
+            if job_dir:
+                job_dir.mkdir(parents=True, exist_ok=True)
+            with DiskChunkStore(job_dir / "chunks.db" if job_dir else None) as store:
+                tree = self.engine.run(job.text, store=store)
+                markdown = export_to_markdown(tree, store)
+            if job_dir:
+                (job_dir / "summary_all.md").write_text(markdown, encoding="utf-8")
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed.")
+            job.finish(error=str(e))
+            return
+
+        job.finish(
+            result={
+                "root_summary": tree.root_node.text,
+                "levels": tree.metadata.get("levels"),
+                "chunks": len(tree.leaf_chunk_ids),
+                "markdown": markdown,
+                "output_dir": str(job_dir) if job_dir else None,
+            }
+        )
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP API over a JobManager (set on the server as `manager`)."""
+
+    server_version = "matome"
+
+    @property
+    def manager(self) -> JobManager:
+        return cast("_JobServer", self.server).manager
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok", **self.manager.stats()})
+            return
+
+        job = self.manager.get(parts[1]) if len(parts) in (2, 3) and parts[0] == "jobs" else None
+        if job is None or (len(parts) == 3 and parts[2] != "events"):
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+
+        if len(parts) == 2:
+            self._send_json(HTTPStatus.OK, job.snapshot())
+        else:
+            self._stream_events(job)
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+
+        try:
+            length = self._content_length()
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            # The body cannot be framed without a valid length
+            self.close_connection = True
+            return
+
+        # UTF-8 needs at most 4 bytes per character, plus room for the JSON wrapping
+        if length > 4 * self.manager.engine.config.max_input_length + 1024:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Job text too long."})
+            self.close_connection = True
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            job = self.manager.submit(payload.get("text", ""))
+        except (ValueError, AttributeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid job: {e}"})
+            return
+        except queue.Full:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Job queue is full."})
+            return
+
+        self._send_json(HTTPStatus.ACCEPTED, job.snapshot())
+
+    def _content_length(self) -> int:
+        """Request body length from the Content-Length header (0 if absent)."""
+        value = self.headers.get("Content-Length") or "0"
+        length = int(value) if value.strip().isdecimal() else -1
+        if length < 0:
+            msg = f"Invalid Content-Length: {value!r}."
+            raise ValueError(msg)
+        return length
+
+    def _stream_events(self, job: SummarizeJob) -> None:
+        """Write the job's events as NDJSON lines until it finishes, then close."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for event in job.iter_events():
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug(f"Event stream client for job {job.id} disconnected.")
+        self.close_connection = True
+
+    def _send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class _JobServer(socketserver.ThreadingMixIn):
+    """Threaded server that hands requests a JobManager."""
+
+    daemon_threads = True
+    manager: JobManager
+
+
+class _TCPJobServer(_JobServer, HTTPServer):
+    """Job server listening on a TCP host and port."""
+
+
+class _UnixJobServer(_JobServer, socketserver.UnixStreamServer):
+    """Job server listening on a Unix domain socket."""
+
+
+def create_server(
+    manager: JobManager,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+) -> "_TCPJobServer | _UnixJobServer":
+    """
+    Create the HTTP server for `manager` (not yet serving).
+
+    Listens on `socket_path` if given (an existing socket file is replaced), else on
+    `host`:`port`.
+    """
+    server: _TCPJobServer | _UnixJobServer
+    if socket_path is not None:
+        if socket_path.is_socket():
+            socket_path.unlink()
+        server = _UnixJobServer(str(socket_path), _RequestHandler)
+    else:
+        server = _TCPJobServer((host, port), _RequestHandler)
+    server.manager = manager
+    return server
@@ -0,0 +1,102 @@
+"""
+Persistent embedding cache.
+Stores embeddings on disk keyed by (model name, normalized-text hash) so re-runs on
+mostly unchanged documents can skip the embedding model entirely.
+"""
+
+import hashlib
+import logging
+import time
+import unicodedata
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Column, LargeBinary, insert, select
+
+from matome.utils.compat import batched
+from matome.utils.sqlite_cache import SQLiteCache
+from matome.utils.store import QUERY_BATCH_SIZE, decode_embedding, encode_embedding
+
+logger = logging.getLogger(__name__)
+
+TABLE_EMBEDDINGS = "embeddings"
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+
+def embedding_cache_key(model_name: str, text_value: str) -> str:
+    """
+    Build the cache key for a text embedded with a given model.
+
+    The text is NFKC-normalized and stripped before hashing so trivially different
+    renderings of the same sentence share an entry.
+    """
+    normalized = unicodedata.normalize("NFKC", text_value).strip()
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode()).hexdigest()
+
+
+class EmbeddingCache(SQLiteCache):
+    """
+    SQLite-backed embedding cache with LRU eviction.
+
+    Vectors are stored as float32 BLOBs. Each lookup refreshes the `last_used` timestamp
+    of the hit entries; when the number of entries exceeds `max_entries`, the least
+    recently used entries are evicted.
+    """
+
+    entry_label = "embeddings"
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite cache file (created if missing).
+            max_entries: Maximum number of cached embeddings before LRU eviction.
+        """
+        super().__init__(
+            db_path,
+            TABLE_EMBEDDINGS,
+            [Column("embedding", LargeBinary, nullable=False)],
+            max_entries,
+        )
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """
+        Look up embeddings for the given keys.
+
+        Returns:
+            Mapping of key to float32 vector for the keys found in the cache.
+        """
+        found: dict[str, np.ndarray] = {}
+        for key_batch in batched(dict.fromkeys(keys), QUERY_BATCH_SIZE):
+            stmt = select(self.table.c.key, self.table.c.embedding).where(
+                self.table.c.key.in_(key_batch)
+            )
+            with self.engine.connect() as conn:
+                for key, blob in conn.execute(stmt):
+                    found[key] = decode_embedding(blob, "float32")
+
+        if found:
+            with self.engine.begin() as conn:
+                self._touch(conn, list(found), time.time())
+
+        hit_count = sum(1 for key in keys if key in found)
+        self._record_lookups(hit_count, len(keys) - hit_count)
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, list[float] | np.ndarray]]) -> None:
+        """Store embeddings, then evict least recently used entries beyond `max_entries`."""
+        now = time.time()
+        stmt = insert(self.table).prefix_with("OR REPLACE")
+        written = 0
+        for item_batch in batched(items, QUERY_BATCH_SIZE):
+            params = [
+                {"key": key, "embedding": encode_embedding(vec, "float32"), "last_used": now}
+                for key, vec in item_batch
+            ]
+            with self.engine.begin() as conn:
+                conn.execute(stmt, params)
+            written += len(params)
+
+        self._entries_added(written)
@@ -1,20 +1,21 @@
+import codecs
+import hashlib
+import io
 import logging
+import mmap
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
+from matome.utils.text import iter_normalized_sentences, iter_normalized_sentences_from_stream
 
+logger = logging.getLogger(__name__)
 
-def read_file(filepath: str | Path) -> str:
-    """
-    Read content from a file (UTF-8).
+# Bytes decoded per step when streaming a file.
+READ_BLOCK_SIZE = 1024 * 1024
 
-    Args:
-        filepath: Path to the file.
 
-    Raises:
-        FileNotFoundError: If the file does not exist.
-        ValueError: If the path attempts directory traversal or is absolute/unsafe (basic check).
-    """
+def _validate_file_path(filepath: str | Path) -> Path:
+    """Return the path if it points to an existing regular file."""
     path = Path(filepath)
 
     if not path.exists():
@@ -27,5 +28,96 @@ def read_file(filepath: str | Path) -> str:
         logger.error(msg)
         raise ValueError(msg)
 
+    return path
+
+
+def read_file(filepath: str | Path) -> str:
+    """
+    Read content from a file (UTF-8).
+
+    Args:
+        filepath: Path to the file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the path attempts directory traversal or is absolute/unsafe (basic check).
+    """
+    path = _validate_file_path(filepath)
+
     logger.debug(f"Reading file: {path}")
     return path.read_text(encoding="utf-8")
+
+
+def iter_file_text(filepath: str | Path, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Stream the content of a UTF-8 file as text pieces.
+
+    The file is memory-mapped and decoded `block_size` bytes at a time with an
+    incremental decoder, so multi-byte characters split across blocks are handled and
+    only one block of text is held at a time. Newlines are translated like `read_file`.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the path is not a file, or `block_size` < 1.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    if block_size < 1:
+        msg = "block_size must be at least one"
+        raise ValueError(msg)
+
+    path = _validate_file_path(filepath)
+    logger.debug(f"Streaming file: {path}")
+
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    with path.open("rb") as f:
+        # mmap rejects empty files
+        if path.stat().st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, len(mm), block_size):
+                    piece = decoder.decode(mm[offset : offset + block_size])
+                    if piece:
+                        yield piece
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def file_digest(filepath: str | Path) -> str:
+    """SHA-256 hex digest of a file's bytes, read in blocks."""
+    path = _validate_file_path(filepath)
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class SentenceSource:
+    """
+    Re-iterable stream of normalized sentences.
+
+    Each iteration re-reads the source from the start: a file is streamed again with
+    `iter_file_text`, and an iterable of text pieces is iterated again. This lets
+    multi-pass chunkers walk a large document twice without holding it in memory.
+    """
+
+    def __init__(
+        self, source: str | Path | Iterable[str], block_size: int = READ_BLOCK_SIZE
+    ) -> None:
+        """
+        Initialize the source.
+
+        Args:
+            source: Full text, path of a UTF-8 file, or an iterable of text pieces.
+                A one-shot iterator of pieces can only be iterated once.
+            block_size: Bytes decoded per step when streaming a file.
+        """
+        self.source = source
+        self.block_size = block_size
+
+    def __iter__(self) -> Iterator[str]:
+        if isinstance(self.source, str):
+            return iter_normalized_sentences(self.source)
+        if isinstance(self.source, Path):
+            return iter_normalized_sentences_from_stream(
+                iter_file_text(self.source, self.block_size)
+            )
+        return iter_normalized_sentences_from_stream(self.source)
@@ -0,0 +1,92 @@
+"""
+Persistent k-NN graph cache.
+Stores the nearest-neighbor graphs UMAP starts from as .npz files keyed by a digest of
+the exact embedding matrix (the clusterer's memmap file) and the search backend, so
+re-runs on unchanged embeddings and UMAP/GMM parameter sweeps skip the neighbor search.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from matome.utils.io import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+class KNNGraphCache:
+    """
+    Directory of cached k-NN graphs, one `<digest>-<backend>.npz` file per graph.
+
+    A graph computed with k neighbors also serves any smaller k (rows are sorted by
+    distance, so the first k columns are the k nearest). A request for more neighbors
+    than cached is a miss, and the larger graph then replaces the cached one.
+    Hit/miss counters are safe to update from worker threads.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the graph files (created if missing).
+        """
+        self.directory = directory.absolute()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(data_path: Path, shape: tuple[int, ...]) -> str:
+        """Key for the float32 matrix of the given shape stored raw in `data_path`."""
+        shape_tag = "x".join(str(dim) for dim in shape)
+        return hashlib.sha256(f"{file_digest(data_path)}:{shape_tag}".encode()).hexdigest()
+
+    def _path(self, digest: str, backend: str) -> Path:
+        return self.directory / f"{digest}-{backend}.npz"
+
+    def get(self, digest: str, backend: str, k: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """Cached (indices, distances) with `k` neighbors, or None on a miss."""
+        path = self._path(digest, backend)
+        graph = None
+        if path.exists():
+            try:
+                with np.load(path, allow_pickle=False) as stored:
+                    indices, distances = stored["indices"], stored["distances"]
+                if indices.shape[1] >= k:
+                    graph = (
+                        np.ascontiguousarray(indices[:, :k]),
+                        np.ascontiguousarray(distances[:, :k]),
+                    )
+            except (OSError, ValueError, KeyError):
+                logger.warning(f"Ignoring unreadable k-NN cache file {path}.")
+
+        with self._lock:
+            if graph is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return graph
+
+    def put(self, digest: str, backend: str, indices: np.ndarray, distances: np.ndarray) -> None:
+        """Store a graph, replacing any cached graph for the same data and backend."""
+        # Write to a temporary file first so readers never see a partial graph
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, indices=indices, distances=distances)
+            Path(tmp_name).replace(self._path(digest, backend))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counts since the cache was opened."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,56 @@
+"""
+Deferred imports for heavy dependencies.
+
+`lazy_import("umap", "UMAP")` returns a stand-in that imports `umap` and resolves `UMAP`
+the first time it is called or one of its attributes is read. Modules bind their heavy
+third-party names this way, so importing matome (e.g. for `matome --help`) does not pay
+for torch, numba or langchain until the stage that needs them runs.
+"""
+
+import importlib
+from typing import Any
+
+
+class LazyImport:
+    """Proxy for a module, or an object in a module, imported on first use."""
+
+    __slots__ = ("_module_name", "_name", "_target")
+
+    def __init__(self, module_name: str, name: str | None = None) -> None:
+        """
+        Args:
+            module_name: Module to import, e.g. "sklearn.mixture".
+            name: Attribute of the module to resolve (e.g. "GaussianMixture");
+                  None proxies the module itself.
+        """
+        self._module_name = module_name
+        self._name = name
+        self._target: Any = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the target has been imported."""
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        """Import and return the target (cached after the first call)."""
+        if self._target is None:
+            module = importlib.import_module(self._module_name)
+            self._target = module if self._name is None else getattr(module, self._name)
+        return self._target
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        target = f"{self._module_name}.{self._name}" if self._name else self._module_name
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyImport {target} ({state})>"
+
+
+def lazy_import(module_name: str, name: str | None = None) -> Any:
+    """Return a proxy that imports `module_name` (and resolves `name` in it) on first use."""
+    return LazyImport(module_name, name)
@@ -0,0 +1,114 @@
+"""
+Persistent LLM response cache.
+Stores LLM responses on disk keyed by (model, temperature, prompt template hash, input hash)
+so re-running the pipeline never pays twice for an identical request.
+"""
+
+import hashlib
+import logging
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from sqlalchemy import Column, Float, Text, delete, insert, select
+
+from matome.utils.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+TABLE_RESPONSES = "responses"
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def llm_cache_key(model: str, temperature: float, template: str, inputs: Sequence[str]) -> str:
+    """
+    Build the cache key for an LLM request.
+
+    Args:
+        model: Model name the request is sent to.
+        temperature: Sampling temperature of the request.
+        template: The prompt template the messages were built from.
+        inputs: The rendered message contents sent to the model.
+    """
+    input_hash = _sha256("\0".join(inputs))
+    return _sha256(f"{model}\0{temperature!r}\0{_sha256(template)}\0{input_hash}")
+
+
+class LLMResponseCache(SQLiteCache):
+    """
+    SQLite-backed cache of LLM response texts with TTL and LRU size-bounded eviction.
+
+    Entries older than `ttl_seconds` (if set) are treated as misses and removed.
+    When the number of entries exceeds `max_entries`, the least recently used are evicted.
+    Safe to share between concurrent summarization workers.
+    """
+
+    entry_label = "LLM responses"
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: float | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite cache file (created if missing).
+            ttl_seconds: Optional time-to-live of an entry. None keeps entries until evicted.
+            max_entries: Maximum number of cached responses before LRU eviction.
+        """
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            msg = "ttl_seconds must be positive."
+            raise ValueError(msg)
+        self.ttl_seconds = ttl_seconds
+        super().__init__(
+            db_path,
+            TABLE_RESPONSES,
+            [
+                Column("response", Text, nullable=False),
+                Column("created_at", Float, nullable=False),
+            ],
+            max_entries,
+        )
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for `key`, or None if absent or expired."""
+        now = time.time()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(self.table.c.response, self.table.c.created_at).where(
+                    self.table.c.key == key
+                )
+            ).fetchone()
+
+            if row is not None and self._is_expired(row[1], now):
+                conn.execute(delete(self.table).where(self.table.c.key == key))
+                row = None
+
+            if row is not None:
+                self._touch(conn, [key], now)
+
+        if row is None:
+            self._record_lookups(0, 1)
+            return None
+        self._record_lookups(1, 0)
+        return str(row[0])
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, then evict least recently used entries beyond `max_entries`."""
+        now = time.time()
+        stmt = insert(self.table).prefix_with("OR REPLACE")
+        with self.engine.begin() as conn:
+            conn.execute(
+                stmt, {"key": key, "response": response, "created_at": now, "last_used": now}
+            )
+        self._entries_added(1)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
@@ -0,0 +1,198 @@
+"""
+Shared LLM invocation for the agents.
+Sends prompts with exponential backoff retries, waits on the shared rate limiter and
+serves or stores responses in the persistent LLM response cache.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from tenacity import AsyncRetrying, Retrying, stop_after_attempt, wait_exponential
+
+from domain_models.config import ProcessingConfig
+from matome.utils.llm_cache import LLMResponseCache, llm_cache_key
+from matome.utils.rate_limit import TokenBucketRateLimiter, estimate_tokens
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_llm_temperature(llm: object | None, default: float) -> float:
+    """Sampling temperature of an injected LLM if it exposes one, else `default`."""
+    temperature = getattr(llm, "temperature", None)
+    if isinstance(temperature, int | float):
+        return float(temperature)
+    return default
+
+
+class CachedLLMInvoker:
+    """
+    Mixin providing retrying, rate-limited and cached (a)sync LLM calls.
+
+    Subclasses set `prompt_template` and `error_class`, and the instance attributes
+    `llm`, `model_name`, `llm_temperature`, `rate_limiter` and `response_cache`.
+    """
+
+    # Template the prompts are rendered from; part of the response cache key
+    prompt_template: str
+    # Raised when the LLM is missing or returns no response
+    error_class: type[Exception]
+    # Name of the call in retry log messages
+    call_label = "LLM call"
+
+    llm: "ChatOpenAI | None"
+    model_name: str
+    llm_temperature: float
+    rate_limiter: TokenBucketRateLimiter | None
+    response_cache: LLMResponseCache | None
+
+    def _estimate_request_tokens(
+        self, messages: list[HumanMessage], config: ProcessingConfig
+    ) -> int:
+        """Estimate the tokens of a request for rate limiting (prompt only by default)."""
+        return sum(estimate_tokens(str(m.content)) for m in messages)
+
+    def _is_cacheable(self, content: str) -> bool:
+        """Whether a text response may be stored in the response cache."""
+        return True
+
+    def _invoke_llm(
+        self, messages: list[HumanMessage], config: ProcessingConfig, request_id: str
+    ) -> BaseMessage:
+        """
+        Invoke the LLM with exponential backoff retry logic.
+
+        Args:
+            messages: List of LangChain messages to send.
+            config: Configuration containing retry settings.
+            request_id: Unique ID for logging purposes.
+
+        Returns:
+            The response message from the LLM (or the response cache).
+
+        Raises:
+            error_class: If the LLM is not initialized or returns no response.
+        """
+        if not self.llm:
+            msg = "LLM not initialized"
+            raise self.error_class(msg)
+
+        cache_key = self._response_cache_key(messages)
+        cached = self._get_cached_response(cache_key, request_id)
+        if cached is not None:
+            return cached
+
+        response = None
+        # Use Tenacity for retries based on config
+        for attempt in Retrying(
+            stop=stop_after_attempt(config.max_retries),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            reraise=True,
+        ):
+            with attempt:
+                self._log_retry(attempt.retry_state.attempt_number, config, request_id)
+
+                if self.rate_limiter:
+                    self.rate_limiter.acquire_sync(self._estimate_request_tokens(messages, config))
+
+                # Check if LLM is chat model or simple LLM (though typed as ChatOpenAI)
+                if hasattr(self.llm, "invoke"):
+                    response = self.llm.invoke(messages)
+                else:
+                    # Fallback for mock objects that might not have invoke
+                    response = self.llm(messages)  # type: ignore[operator]
+
+        if not response:
+            msg = f"[{request_id}] No response received from LLM."
+            raise self.error_class(msg)
+
+        self._cache_response(cache_key, response)
+        return response
+
+    async def _ainvoke_llm(
+        self, messages: list[HumanMessage], config: ProcessingConfig, request_id: str
+    ) -> BaseMessage:
+        """
+        Asynchronously invoke the LLM with exponential backoff retry logic.
+
+        Each attempt first waits on the shared rate limiter (if configured).
+
+        Raises:
+            error_class: If the LLM is not initialized or returns no response.
+        """
+        if not self.llm:
+            msg = "LLM not initialized"
+            raise self.error_class(msg)
+
+        cache_key = self._response_cache_key(messages)
+        cached = self._get_cached_response(cache_key, request_id)
+        if cached is not None:
+            return cached
+
+        response = None
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(config.max_retries),
+            wait=wait_exponential(multiplier=1, min=2, max=10),
+            reraise=True,
+        ):
+            with attempt:
+                self._log_retry(attempt.retry_state.attempt_number, config, request_id)
+
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire(self._estimate_request_tokens(messages, config))
+
+                if hasattr(self.llm, "ainvoke"):
+                    response = await self.llm.ainvoke(messages)
+                else:
+                    # Fallback for objects without native async support
+                    response = await asyncio.to_thread(self.llm.invoke, messages)
+
+        if not response:
+            msg = f"[{request_id}] No response received from LLM."
+            raise self.error_class(msg)
+
+        self._cache_response(cache_key, response)
+        return response
+
+    def _log_retry(self, attempt_number: int, config: ProcessingConfig, request_id: str) -> None:
+        if attempt_number > 1:
+            logger.warning(
+                f"[{request_id}] Retrying {self.call_label} (Attempt {attempt_number}/{config.max_retries})"
+            )
+
+    def _response_cache_key(self, messages: list[HumanMessage]) -> str | None:
+        """
+        Cache key of a request, or None when no response cache is configured.
+
+        Keyed on the temperature the LLM was created with, not the per-call config,
+        which cannot change the temperature of an existing LLM.
+        """
+        if self.response_cache is None:
+            return None
+        return llm_cache_key(
+            self.model_name,
+            self.llm_temperature,
+            self.prompt_template,
+            [str(m.content) for m in messages],
+        )
+
+    def _get_cached_response(self, cache_key: str | None, request_id: str) -> BaseMessage | None:
+        """Return a cached response as a message, if available."""
+        if self.response_cache is None or cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.debug(f"[{request_id}] Using cached LLM response.")
+        return AIMessage(content=cached)
+
+    def _cache_response(self, cache_key: str | None, response: BaseMessage) -> None:
+        """Store a (text) response in the cache, if configured and cacheable."""
+        if self.response_cache is None or cache_key is None:
+            return
+        if isinstance(response.content, str) and self._is_cacheable(response.content):
+            self.response_cache.put(cache_key, response.content)
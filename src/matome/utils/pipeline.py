@@ -0,0 +1,155 @@
+"""
+Staged producer/consumer pipelines over bounded queues.
+
+`pipelined(source, [stage_a, stage_b])` runs the source and each stage on its own thread,
+connected by bounded queues, and yields the last stage's output in order. A stage is a
+function from an iterator of items to an iterable of items (typically a generator), so
+stages can batch, transform or write items as they stream past. Bounded queues keep at
+most `queue_size` items between two stages: a fast stage blocks instead of buffering an
+entire level in memory while a slow one catches up.
+
+When the source or a stage fails, the next stage sees the end of its input, so it still
+finishes (e.g. flushes a partial batch of) everything received before the failure; the
+error is then passed on and re-raised in the consuming thread. If the consumer stops
+early, every thread is stopped and joined before `pipelined` returns.
+"""
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+Stage = Callable[[Iterator[Any]], Iterable[Any]]
+
+# How often blocked threads check whether the pipeline was stopped.
+_POLL_SECONDS = 0.1
+_END = object()
+
+
+class _Failure:
+    """An exception travelling downstream in place of the remaining items."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _PipelineStoppedError(Exception):
+    """Raised inside a stage when the consumer has abandoned the pipeline."""
+
+
+def _put(q: "queue.Queue[Any]", item: object, stop: threading.Event) -> bool:
+    """Put `item` on `q`, giving up (returning False) once `stop` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+class _Inbox:
+    """A stage's input: iterates its queue until the end marker or an upstream failure."""
+
+    def __init__(self, q: "queue.Queue[Any]", stop: threading.Event) -> None:
+        self.queue = q
+        self.stop = stop
+        self.failure: BaseException | None = None
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                item = self.queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self.stop.is_set():
+                    raise _PipelineStoppedError from None
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                # End the input normally so the stage completes; _pump passes this on.
+                self.failure = item.error
+                return
+            yield item
+
+
+def _pump(
+    items: Callable[[], Iterable[Any]],
+    out: "queue.Queue[Any]",
+    stop: threading.Event,
+    inbox: _Inbox | None = None,
+) -> None:
+    """Thread body: move everything `items()` yields to `out`, then an end or failure marker."""
+    try:
+        for item in items():
+            if not _put(out, item, stop):
+                return
+    except _PipelineStoppedError:
+        return
+    except BaseException as e:
+        _put(out, _Failure(e), stop)
+        return
+    failure = inbox.failure if inbox is not None else None
+    _put(out, _END if failure is None else _Failure(failure), stop)
+
+
+def pipelined(source: Iterable[Any], stages: Sequence[Stage], queue_size: int) -> Iterator[Any]:
+    """
+    Run `source` and `stages` concurrently and yield the output of the last stage.
+
+    Args:
+        source: Items fed into the first stage (consumed on a worker thread).
+        stages: Functions mapping an iterator of items to an iterable of items.
+        queue_size: Maximum number of items buffered between two stages (>= 1).
+
+    Raises:
+        ValueError: If queue_size < 1.
+    """
+    if queue_size < 1:
+        msg = "queue_size must be at least one"
+        raise ValueError(msg)
+
+    stop = threading.Event()
+    queues: list[queue.Queue[Any]] = [
+        queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+    ]
+
+    inboxes = [_Inbox(q, stop) for q in queues[:-1]]
+
+    def stage_input(index: int) -> Callable[[], Iterable[Any]]:
+        return lambda: stages[index](iter(inboxes[index]))
+
+    threads = [
+        threading.Thread(
+            target=_pump,
+            args=(lambda: source, queues[0], stop),
+            name="pipeline-source",
+            daemon=True,
+        )
+    ]
+    threads.extend(
+        threading.Thread(
+            target=_pump,
+            args=(stage_input(i), queues[i + 1], stop, inboxes[i]),
+            name=f"pipeline-stage-{i}",
+            daemon=True,
+        )
+        for i in range(len(stages))
+    )
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,112 @@
+"""
+Streaming quantile estimation.
+Implements the P² algorithm (Jain & Chlamtac, 1985), which tracks a single quantile
+of a stream in O(1) memory using five markers and piecewise-parabolic interpolation.
+"""
+
+import numpy as np
+
+P2_MARKERS = 5
+
+
+class P2Quantile:
+    """
+    Online estimator for one quantile of a stream of floats.
+
+    The first five observations are kept and the quantile is computed exactly (with
+    NumPy's linear interpolation); after that the estimate is maintained by P² in
+    constant memory. The minimum and maximum are always exact.
+    """
+
+    def __init__(self, q: float) -> None:
+        """
+        Initialize the estimator.
+
+        Args:
+            q: Quantile to track, in [0, 1] (e.g. 0.9 for the 90th percentile).
+        """
+        if not 0.0 <= q <= 1.0:
+            msg = f"Quantile must be in [0, 1], got {q}."
+            raise ValueError(msg)
+
+        self.q = q
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions = [0.0, 1.0, 2.0, 3.0, 4.0]
+        self._desired = [0.0, 2 * q, 4 * q, 2 + 2 * q, 4.0]
+        self._increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        if self.count <= P2_MARKERS:
+            self._heights.append(float(x))
+            if self.count == P2_MARKERS:
+                self._heights.sort()
+            return
+
+        k = self._locate(float(x))
+        for i in range(k + 1, P2_MARKERS):
+            self._positions[i] += 1
+        for i in range(P2_MARKERS):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, P2_MARKERS - 1):
+            self._adjust(i)
+
+    def value(self) -> float:
+        """
+        Current quantile estimate.
+
+        Raises:
+            ValueError: If no observations have been added.
+        """
+        if self.count == 0:
+            msg = "No observations added."
+            raise ValueError(msg)
+        if self.count < P2_MARKERS:
+            return float(np.quantile(self._heights, self.q))
+        if self.q == 0.0:
+            return self._heights[0]
+        if self.q == 1.0:
+            return self._heights[-1]
+        return self._heights[2]
+
+    def _locate(self, x: float) -> int:
+        """Find the marker cell containing x, extending the extremes if needed."""
+        h = self._heights
+        if x < h[0]:
+            h[0] = x
+            return 0
+        if x >= h[-1]:
+            h[-1] = x
+            return P2_MARKERS - 2
+        for k in range(P2_MARKERS - 1):
+            if h[k] <= x < h[k + 1]:
+                return k
+        return P2_MARKERS - 2
+
+    def _adjust(self, i: int) -> None:
+        """Move marker i towards its desired position if it has drifted by a full step."""
+        n = self._positions
+        d = self._desired[i] - n[i]
+        if not ((d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1)):
+            return
+
+        step = 1 if d > 0 else -1
+        h = self._heights
+        candidate = self._parabolic(i, step)
+        if h[i - 1] < candidate < h[i + 1]:
+            h[i] = candidate
+        else:
+            h[i] += step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+        n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic (P²) prediction of marker i's height after moving by step."""
+        n = self._positions
+        h = self._heights
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
@@ -0,0 +1,140 @@
+"""
+Rate limiting utilities for LLM calls.
+Provides a token-bucket limiter that can be shared between agents (sync and async callers).
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from typing import Self
+
+from domain_models.config import ProcessingConfig
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the token count of a text without loading a tokenizer.
+
+    Uses UTF-8 byte length / 4, which approximates both English (~4 chars/token)
+    and Japanese (3 bytes/char, ~1 token/char) reasonably well for budgeting purposes.
+    """
+    return max(1, math.ceil(len(text.encode("utf-8")) / 4))
+
+
+class _Bucket:
+    """A single token bucket refilled continuously at `limit` units per minute."""
+
+    def __init__(self, limit_per_minute: int, now: float) -> None:
+        self.capacity = float(limit_per_minute)
+        self.rate = limit_per_minute / SECONDS_PER_MINUTE
+        self.level = self.capacity
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        deficit = amount - self.level
+        return 0.0 if deficit <= 0 else deficit / self.rate
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket rate limiter for requests/min and tokens/min.
+
+    A single instance is meant to be shared across agents (e.g. SummarizationAgent and
+    VerifierAgent) so that all in-flight LLM calls draw from the same budget.
+    State is guarded by a threading lock, so the limiter is safe to use from worker
+    threads (`acquire_sync`) and from any event loop (`acquire`) at the same time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Maximum number of requests per minute. None disables the limit.
+            tokens_per_minute: Maximum number of (estimated) tokens per minute. None disables the limit.
+            clock: Monotonic clock function (injectable for testing).
+        """
+        if requests_per_minute is not None and requests_per_minute < 1:
+            msg = "requests_per_minute must be at least 1."
+            raise ValueError(msg)
+        if tokens_per_minute is not None and tokens_per_minute < 1:
+            msg = "tokens_per_minute must be at least 1."
+            raise ValueError(msg)
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self._requests = _Bucket(requests_per_minute, now) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute, now) if tokens_per_minute else None
+
+    @classmethod
+    def from_config(cls, config: ProcessingConfig) -> Self | None:
+        """Build a limiter from config, or return None if no limits are configured."""
+        if config.llm_requests_per_minute is None and config.llm_tokens_per_minute is None:
+            return None
+        return cls(
+            requests_per_minute=config.llm_requests_per_minute,
+            tokens_per_minute=config.llm_tokens_per_minute,
+        )
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Attempt to take one request and `tokens` tokens from the buckets.
+
+        Returns:
+            0.0 if the budget was taken, otherwise the number of seconds to wait before retrying.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = 0.0
+
+            if self._requests is not None:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.wait_time(1.0))
+
+            token_amount = 0.0
+            if self._tokens is not None:
+                self._tokens.refill(now)
+                # A single request larger than the whole budget can never fit; clamp it
+                # so it waits for a full bucket instead of blocking forever.
+                token_amount = min(float(tokens), self._tokens.capacity)
+                wait = max(wait, self._tokens.wait_time(token_amount))
+
+            if wait > 0:
+                return wait
+
+            if self._requests is not None:
+                self._requests.level -= 1.0
+            if self._tokens is not None:
+                self._tokens.level -= token_amount
+            return 0.0
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait (asynchronously) until a request of `tokens` estimated tokens may be sent."""
+        while (wait := self._try_acquire(tokens)) > 0:
+            logger.debug(f"Rate limit reached. Waiting {wait:.2f}s.")
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int = 0) -> None:
+        """Blocking variant of `acquire` for synchronous callers."""
+        while (wait := self._try_acquire(tokens)) > 0:
+            logger.debug(f"Rate limit reached. Waiting {wait:.2f}s.")
+            time.sleep(wait)
@@ -0,0 +1,143 @@
+"""
+Shared base for the persistent SQLite key/value caches.
+Owns the database engine, the `key`/`last_used` columns, thread-safe hit/miss counters
+and LRU size-bounded eviction; subclasses add their value columns and lookup methods.
+"""
+
+import logging
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Self
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Float,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    create_engine,
+    delete,
+    func,
+    select,
+    text,
+    update,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """
+    SQLite-backed key/value cache with LRU eviction.
+
+    Every entry has a `key` primary key and an indexed `last_used` timestamp. The entry
+    count is tracked as a running upper bound, so writes only run a COUNT(*) once that
+    bound exceeds `max_entries`; the least recently used entries are then evicted.
+    Hit/miss counters are safe to update from worker threads.
+    """
+
+    # Plural noun for the cached values, used in log messages
+    entry_label = "entries"
+
+    def __init__(
+        self,
+        db_path: Path,
+        table_name: str,
+        value_columns: Sequence[Column[Any]],
+        max_entries: int,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite cache file (created if missing).
+            table_name: Name of the cache table.
+            value_columns: Columns stored alongside `key` and `last_used`.
+            max_entries: Maximum number of entries before LRU eviction.
+        """
+        if max_entries < 1:
+            msg = "max_entries must be at least 1."
+            raise ValueError(msg)
+
+        self.db_path = db_path.absolute()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.engine = create_engine(f"sqlite:///{self.db_path}")
+        with self.engine.begin() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL;"))
+            conn.execute(text("PRAGMA synchronous=NORMAL;"))
+
+        metadata = MetaData()
+        self.table = Table(
+            table_name,
+            metadata,
+            Column("key", String, primary_key=True),
+            *value_columns,
+            Column("last_used", Float, nullable=False, index=True),
+        )
+        metadata.create_all(self.engine)
+
+        # Upper bound on the entry count, so eviction doesn't need a COUNT(*) on every write
+        self._approx_count = len(self)
+
+    def _record_lookups(self, hits: int, misses: int) -> None:
+        """Add to the hit/miss counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _touch(self, conn: Connection, keys: Sequence[str], now: float) -> None:
+        """Refresh the LRU timestamp of the given keys."""
+        stmt = (
+            update(self.table)
+            .where(self.table.c.key == bindparam("k"))
+            .values(last_used=bindparam("ts"))
+        )
+        conn.execute(stmt, [{"k": key, "ts": now} for key in keys])
+
+    def _entries_added(self, count: int) -> None:
+        """Account for `count` written entries and evict if the cache may be over capacity."""
+        with self._lock:
+            self._approx_count += count
+            over_capacity = self._approx_count > self.max_entries
+        if over_capacity:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries if the cache is over capacity."""
+        with self.engine.begin() as conn:
+            count = conn.execute(select(func.count()).select_from(self.table)).scalar() or 0
+            overflow = count - self.max_entries
+            if overflow > 0:
+                oldest = select(self.table.c.key).order_by(self.table.c.last_used).limit(overflow)
+                conn.execute(delete(self.table).where(self.table.c.key.in_(oldest)))
+        with self._lock:
+            self._approx_count = min(count, self.max_entries)
+        if overflow > 0:
+            logger.debug(f"Evicted {overflow} {self.entry_label} from cache.")
+
+    def __len__(self) -> int:
+        with self.engine.connect() as conn:
+            return int(conn.execute(select(func.count()).select_from(self.table)).scalar() or 0)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters for this cache instance."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Dispose of the database engine."""
+        self.engine.dispose()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        self.close()
@@ -1,25 +1,40 @@
+import itertools
 import json
 import logging
 import shutil
 import tempfile
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+import numpy as np
 from sqlalchemy import (
     Column,
+    ColumnElement,
+    Connection,
+    Index,
+    Integer,
+    LargeBinary,
     MetaData,
     String,
     Table,
     Text,
+    bindparam,
     create_engine,
+    delete,
+    func,
     insert,
+    literal_column,
+    null,
     select,
     text,
     update,
 )
 
-from domain_models.manifest import Chunk, SummaryNode
+from domain_models.manifest import Chunk, Cluster, DocumentTree, SummaryNode
+from domain_models.types import NodeID
+from matome.utils.compat import batched
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +43,46 @@ TABLE_NODES = "nodes"
 COL_ID = "id"
 COL_TYPE = "type"
 COL_CONTENT = "content"  # Stores JSON of the node (excluding embedding)
-COL_EMBEDDING = "embedding"  # Stores JSON of the embedding list
+COL_EMBEDDING = "embedding"  # Legacy: JSON of the embedding list (migrated to COL_EMBEDDING_BLOB)
+COL_EMBEDDING_BLOB = "embedding_blob"  # Raw little-endian float32/float16 bytes
+
+# Max IDs per `IN (...)` query for bulk reads (well below SQLite's bound-parameter limit)
+QUERY_BATCH_SIZE = 1000
+
+TABLE_META = "store_meta"
+META_EMBEDDING_DTYPE = "embedding_dtype"
+META_RUN_INPUT_DIGEST = "run_input_digest"
+
+# Run manifest: per-level inputs/clusters and per-cluster summaries of a RAPTOR build
+TABLE_RUN_LEVELS = "run_levels"
+TABLE_RUN_SUMMARIES = "run_summaries"
+
+# Tree structure of the finished build (indexed, so reloading skips node JSON)
+TABLE_TREE_NODES = "tree_nodes"
+TABLE_TREE_EDGES = "tree_edges"
+META_TREE_ROOT_ID = "tree_root_id"
+META_TREE_METADATA = "tree_metadata"
+
+EmbeddingDType = Literal["float32", "float16"]
+ALLOWED_EMBEDDING_DTYPES: set[str] = {"float32", "float16"}
+
+# Summary nodes kept in memory by a StoredSummaryNodes view
+DEFAULT_NODE_CACHE_SIZE = 256
+
+
+def encode_embedding(embedding: list[float] | np.ndarray, dtype: EmbeddingDType) -> bytes:
+    """Serialize an embedding vector to raw little-endian bytes of the given dtype."""
+    return np.asarray(embedding, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def decode_embedding(blob: bytes, dtype: EmbeddingDType) -> np.ndarray:
+    """
+    Deserialize raw embedding bytes into a float32 NumPy array.
+
+    float32 blobs are returned as a read-only zero-copy view over the bytes.
+    """
+    arr = np.frombuffer(blob, dtype=np.dtype(dtype).newbyteorder("<"))
+    return arr if dtype == "float32" else arr.astype(np.float32)
 
 
 class DiskChunkStore:
@@ -40,16 +94,30 @@ class DiskChunkStore:
         id: String PK
         type: String ('chunk' or 'summary')
         content: Text (JSON representation of the node, potentially excluding embedding)
-        embedding: Text (JSON representation of the embedding list, allowing independent updates)
+        embedding: Text (legacy JSON embedding; migrated to embedding_blob on open)
+        embedding_blob: BLOB (raw float32/float16 vector, allowing independent updates)
+
+    The run manifest (`run_levels`, `run_summaries`) records the progress of a RAPTOR
+    build so an interrupted run can be resumed. The tree tables (`tree_nodes`,
+    `tree_edges`) record the finished tree so it can be reloaded without a re-run.
     """
 
-    def __init__(self, db_path: Path | None = None) -> None:
+    def __init__(
+        self, db_path: Path | None = None, embedding_dtype: EmbeddingDType = "float32"
+    ) -> None:
         """
         Initialize the store.
 
         Args:
             db_path: Optional path to the database file. If None, a secure temporary file is created.
+            embedding_dtype: Storage precision for embeddings ("float32" or "float16").
+                             For an existing database, the dtype it was created with takes precedence.
         """
+        if embedding_dtype not in ALLOWED_EMBEDDING_DTYPES:
+            msg = f"Unsupported embedding dtype '{embedding_dtype}'. Allowed: {sorted(ALLOWED_EMBEDDING_DTYPES)}"
+            raise ValueError(msg)
+        self.embedding_dtype: EmbeddingDType = embedding_dtype
+
         if db_path:
             self.temp_dir = None
             # Security: Resolve to absolute path to handle relative paths and '..' safely
@@ -76,7 +144,7 @@ class DiskChunkStore:
         self._setup_db()
 
     def _setup_db(self) -> None:
-        """Initialize the database schema."""
+        """Initialize the database schema and migrate legacy data."""
         with self.engine.begin() as conn:
             # Enable WAL mode for performance
             conn.execute(text("PRAGMA journal_mode=WAL;"))
@@ -91,10 +159,119 @@ class DiskChunkStore:
             Column(COL_ID, String, primary_key=True),
             Column(COL_TYPE, String),
             Column(COL_CONTENT, Text),  # Main node data
-            Column(COL_EMBEDDING, Text),  # Embedding separated for efficient updates
+            Column(COL_EMBEDDING, Text),  # Legacy JSON embeddings (pre-BLOB databases)
+            Column(COL_EMBEDDING_BLOB, LargeBinary),  # Embedding separated for efficient updates
+        )
+        self.meta_table = Table(
+            TABLE_META,
+            metadata,
+            Column("key", String, primary_key=True),
+            Column("value", Text),
+        )
+        self.run_levels_table = Table(
+            TABLE_RUN_LEVELS,
+            metadata,
+            Column("level", Integer, primary_key=True),
+            Column("node_ids", Text),  # JSON list of the level's node IDs, in order
+            Column("clusters", Text),  # JSON list of the level's clusters
+        )
+        self.run_summaries_table = Table(
+            TABLE_RUN_SUMMARIES,
+            metadata,
+            Column("level", Integer, primary_key=True),
+            Column("cluster_pos", Integer, primary_key=True),  # Position in the level's clusters
+            Column("summary_id", String),
+        )
+        self.tree_nodes_table = Table(
+            TABLE_TREE_NODES,
+            metadata,
+            Column("id", String, primary_key=True),
+            Column("level", Integer, nullable=False),
+            Column("position", Integer, nullable=False),  # Order within the level
+            Index("ix_tree_nodes_level_position", "level", "position"),
+        )
+        self.tree_edges_table = Table(
+            TABLE_TREE_EDGES,
+            metadata,
+            Column("parent_id", String, primary_key=True),
+            Column("position", Integer, primary_key=True),  # Order among the parent's children
+            Column("child_id", String, nullable=False),
+            Index("ix_tree_edges_child", "child_id"),
         )
         metadata.create_all(self.engine)
 
+        self._ensure_blob_column()
+        self._load_embedding_dtype()
+        self._migrate_json_embeddings()
+
+    def _ensure_blob_column(self) -> None:
+        """Add the BLOB embedding column to databases created before it existed."""
+        with self.engine.begin() as conn:
+            columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({TABLE_NODES})"))}
+            if COL_EMBEDDING_BLOB not in columns:
+                logger.info("Adding binary embedding column to existing store.")
+                conn.execute(
+                    text(f"ALTER TABLE {TABLE_NODES} ADD COLUMN {COL_EMBEDDING_BLOB} BLOB")
+                )
+
+    def _load_embedding_dtype(self) -> None:
+        """Persist the embedding dtype on first use, or adopt the one already recorded."""
+        with self.engine.begin() as conn:
+            stored = conn.execute(
+                select(self.meta_table.c.value).where(self.meta_table.c.key == META_EMBEDDING_DTYPE)
+            ).scalar()
+
+            if stored is None:
+                conn.execute(
+                    insert(self.meta_table).values(
+                        key=META_EMBEDDING_DTYPE, value=self.embedding_dtype
+                    )
+                )
+            elif stored in ALLOWED_EMBEDDING_DTYPES:
+                if stored != self.embedding_dtype:
+                    logger.warning(
+                        f"Store was created with embedding dtype '{stored}'; "
+                        f"ignoring requested '{self.embedding_dtype}'."
+                    )
+                self.embedding_dtype = stored
+            else:
+                msg = f"Store has unsupported embedding dtype '{stored}'."
+                raise ValueError(msg)
+
+    def _migrate_json_embeddings(self) -> None:
+        """
+        One-time migration of legacy JSON embeddings to the BLOB column.
+        Processes rows in batches so large stores are not loaded into memory.
+        """
+        BATCH_SIZE = 1000
+        legacy = self.nodes_table.c.embedding
+        select_stmt = (
+            select(self.nodes_table.c.id, legacy).where(legacy.is_not(None)).limit(BATCH_SIZE)
+        )
+        update_stmt = text(
+            f"UPDATE {TABLE_NODES} SET {COL_EMBEDDING_BLOB} = :blob, {COL_EMBEDDING} = NULL "  # noqa: S608
+            f"WHERE {COL_ID} = :node_id"
+        )
+
+        migrated = 0
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(select_stmt).fetchall()
+                if not rows:
+                    break
+                params = [
+                    {
+                        "node_id": node_id,
+                        "blob": encode_embedding(json.loads(emb_json), self.embedding_dtype),
+                    }
+                    for node_id, emb_json in rows
+                ]
+                conn.execute(update_stmt, params)
+                migrated += len(rows)
+
+        if migrated:
+            logger.info(f"Migrated {migrated} JSON embeddings to binary storage.")
+
     def add_chunk(self, chunk: Chunk) -> None:
         """Store a chunk. ID is its index converted to str."""
         self.add_chunks([chunk])
@@ -120,8 +297,6 @@ class DiskChunkStore:
         # Use Core Insert with REPLACE logic for SQLite
         stmt = insert(self.nodes_table).prefix_with("OR REPLACE")
 
-        from matome.utils.compat import batched
-
         # Iterate over the input iterable using batched() to handle chunks efficiently
         # without loading the entire dataset into memory.
         for node_batch in batched(nodes, BATCH_SIZE):
@@ -131,17 +306,21 @@ class DiskChunkStore:
                 # Pydantic v2 model_dump_json supports `exclude={'embedding'}`.
                 content_json = node.model_dump_json(exclude={"embedding"})
 
-                # Embedding JSON
-                embedding_json = json.dumps(node.embedding) if node.embedding is not None else None
+                embedding_blob = (
+                    encode_embedding(node.embedding, self.embedding_dtype)
+                    if node.embedding is not None
+                    else None
+                )
 
                 node_id = str(node.index) if isinstance(node, Chunk) else node.id
 
                 buffer.append(
                     {
-                        "id": node_id,
-                        "type": node_type,
-                        "content": content_json,
-                        "embedding": embedding_json,
+                        COL_ID: node_id,
+                        COL_TYPE: node_type,
+                        COL_CONTENT: content_json,
+                        COL_EMBEDDING: None,
+                        COL_EMBEDDING_BLOB: embedding_blob,
                     }
                 )
 
@@ -149,7 +328,9 @@ class DiskChunkStore:
             with self.engine.begin() as conn:
                 conn.execute(stmt, buffer)
 
-    def update_node_embedding(self, node_id: int | str, embedding: list[float]) -> None:
+    def update_node_embedding(
+        self, node_id: int | str, embedding: list[float] | np.ndarray
+    ) -> None:
         """
         Update the embedding of an existing node efficiently.
         Executes a direct UPDATE without fetching the node first.
@@ -157,23 +338,125 @@ class DiskChunkStore:
         if embedding is None:
             return
 
-        embedding_json = json.dumps(embedding)
+        embedding_blob = encode_embedding(embedding, self.embedding_dtype)
 
         # Use SQLAlchemy Core expression for parameterized update
         stmt = (
             update(self.nodes_table)
             .where(self.nodes_table.c.id == str(node_id))
-            .values(embedding=embedding_json)
+            .values({COL_EMBEDDING_BLOB: embedding_blob, COL_EMBEDDING: None})
         )
 
         with self.engine.begin() as conn:
             conn.execute(stmt)
 
+    def update_node_embeddings(
+        self, updates: Iterable[tuple[int | str, list[float] | np.ndarray]]
+    ) -> int:
+        """
+        Update the embeddings of many existing nodes.
+
+        Uses one `executemany` UPDATE and a single transaction (one WAL commit) per batch
+        of 1000 rows instead of one transaction per node. Streaming safe.
+        Entries with a None embedding are skipped.
+
+        Returns:
+            The number of embeddings written.
+        """
+        BATCH_SIZE = 1000
+        stmt = (
+            update(self.nodes_table)
+            .where(self.nodes_table.c.id == bindparam("node_id"))
+            .values({COL_EMBEDDING_BLOB: bindparam("blob"), COL_EMBEDDING: None})
+        )
+
+        written = 0
+        for update_batch in batched(updates, BATCH_SIZE):
+            params = [
+                {"node_id": str(node_id), "blob": encode_embedding(emb, self.embedding_dtype)}
+                for node_id, emb in update_batch
+                if emb is not None
+            ]
+            if not params:
+                continue
+            with self.engine.begin() as conn:
+                conn.execute(stmt, params)
+            written += len(params)
+        return written
+
+    def update_chunk_contents(self, chunks: Iterable[Chunk]) -> None:
+        """
+        Rewrite the stored content (text, offsets, metadata) of existing chunks.
+
+        Stored embeddings are left untouched. Streaming safe.
+        """
+        stmt = (
+            update(self.nodes_table)
+            .where(self.nodes_table.c.id == bindparam("node_id"))
+            .values({COL_CONTENT: bindparam("content")})
+        )
+        for chunk_batch in batched(chunks, QUERY_BATCH_SIZE):
+            params = [
+                {
+                    "node_id": str(chunk.index),
+                    "content": chunk.model_dump_json(exclude={"embedding"}),
+                }
+                for chunk in chunk_batch
+            ]
+            with self.engine.begin() as conn:
+                conn.execute(stmt, params)
+
+    def delete_nodes(self, node_ids: Iterable[int | str]) -> None:
+        """Delete nodes by ID (unknown IDs are ignored)."""
+        for batch in batched((str(nid) for nid in node_ids), QUERY_BATCH_SIZE):
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.nodes_table).where(self.nodes_table.c.id.in_(batch)))
+
+    def get_embedding(self, node_id: int | str) -> np.ndarray | None:
+        """
+        Retrieve only the embedding of a node as a float32 NumPy array.
+        Avoids deserializing the node content and any Python list round trip.
+        """
+        stmt = select(self.nodes_table.c.embedding_blob).where(
+            self.nodes_table.c.id == str(node_id)
+        )
+
+        with self.engine.connect() as conn:
+            blob = conn.execute(stmt).scalar()
+
+        if blob is None:
+            return None
+        return decode_embedding(blob, self.embedding_dtype)
+
+    def iter_embedding_blocks(self, node_ids: Iterable[int | str]) -> Iterator[np.ndarray]:
+        """
+        Stream the embeddings of the given nodes as (n, dim) float32 blocks in input order.
+
+        One `IN (...)` query per batch; node content is not read.
+
+        Raises:
+            ValueError: If a node is missing or has no embedding.
+        """
+        table = self.nodes_table
+        for batch in batched((str(nid) for nid in node_ids), QUERY_BATCH_SIZE):
+            stmt = select(table.c.id, table.c.embedding_blob).where(
+                table.c.id.in_(batch), table.c.embedding_blob.is_not(None)
+            )
+            with self.engine.connect() as conn:
+                blobs: dict[str, bytes] = {row.id: row.embedding_blob for row in conn.execute(stmt)}
+            missing = [nid for nid in batch if nid not in blobs]
+            if missing:
+                msg = f"No stored embedding for nodes: {missing[:5]}"
+                raise ValueError(msg)
+            yield np.stack([decode_embedding(blobs[nid], self.embedding_dtype) for nid in batch])
+
     def get_node(self, node_id: int | str) -> Chunk | SummaryNode | None:
         """Retrieve a node by ID."""
         # Use SQLAlchemy Core expression for parameterized select
         stmt = select(
-            self.nodes_table.c.type, self.nodes_table.c.content, self.nodes_table.c.embedding
+            self.nodes_table.c.type,
+            self.nodes_table.c.content,
+            self.nodes_table.c.embedding_blob,
         ).where(self.nodes_table.c.id == str(node_id))
 
         with self.engine.connect() as conn:
@@ -183,31 +466,354 @@ class DiskChunkStore:
             if not row:
                 return None
 
-            node_type, content_json, embedding_json = row
+            node_type, content_json, embedding_blob = row
+            return self._row_to_node(node_id, node_type, content_json, embedding_blob)
 
-            try:
-                # Deserialize embedding first
-                embedding = json.loads(embedding_json) if embedding_json else None
-
-                if node_type == "chunk":
-                    # Parse JSON then validate to ensure strict type compliance
-                    data = json.loads(content_json)
-                    if embedding is not None:
-                        data["embedding"] = embedding
-                    return Chunk.model_validate(data)
-
-                if node_type == "summary":
-                    data = json.loads(content_json)
-                    if embedding is not None:
-                        data["embedding"] = embedding
-                    return SummaryNode.model_validate(data)
-
-            except Exception:
-                logger.exception(f"Failed to deserialize node {node_id}")
-                return None
+    def get_nodes(
+        self, node_ids: Iterable[int | str], with_embeddings: bool = True
+    ) -> list[Chunk | SummaryNode | None]:
+        """
+        Retrieve multiple nodes by ID using batched `IN (...)` queries.
+
+        Args:
+            node_ids: IDs to fetch.
+            with_embeddings: If False, embeddings are not read or decoded.
+
+        Returns:
+            Nodes aligned with the input order; None where an ID was not found.
+        """
+        ids = [str(nid) for nid in node_ids]
+        found: dict[str, Chunk | SummaryNode] = {}
+        for batch in batched(ids, QUERY_BATCH_SIZE):
+            found.update(self._fetch_batch(batch, with_embeddings))
+        return [found.get(nid) for nid in ids]
+
+    def iter_nodes(
+        self,
+        node_ids: Iterable[int | str] | None = None,
+        *,
+        level: int | None = None,
+        node_type: str | None = None,
+        with_embeddings: bool = True,
+    ) -> Iterator[Chunk | SummaryNode]:
+        """
+        Stream nodes from the store in batches.
+
+        Exactly one selector should be used:
+            node_ids: Yields the given nodes in input order (missing IDs are skipped).
+            level: Yields all nodes of a tree level (0 = chunks) in insertion order.
+            node_type: Yields all nodes of a type ('chunk' or 'summary') in insertion order.
+
+        Only one batch of rows is held in memory at a time.
+        """
+        if node_ids is not None:
+            yield from self._iter_by_ids(node_ids, with_embeddings)
+            return
+
+        if level is not None:
+            node_type = "chunk" if level == 0 else "summary"
+
+        if node_type is None:
+            msg = "iter_nodes requires node_ids, level or node_type."
+            raise ValueError(msg)
+
+        yield from self._iter_by_type(node_type, level, with_embeddings)
+
+    def _iter_by_ids(
+        self, node_ids: Iterable[int | str], with_embeddings: bool
+    ) -> Iterator[Chunk | SummaryNode]:
+        """Yield nodes for the given IDs in input order, one `IN (...)` query per batch."""
+        for batch in batched((str(nid) for nid in node_ids), QUERY_BATCH_SIZE):
+            found = self._fetch_batch(batch, with_embeddings)
+            for nid in batch:
+                node = found.get(nid)
+                if node is not None:
+                    yield node
+
+    def _iter_by_type(
+        self, node_type: str, level: int | None, with_embeddings: bool
+    ) -> Iterator[Chunk | SummaryNode]:
+        """Yield all nodes of a type (and optionally summary level) in insertion order."""
+        table = self.nodes_table
+        rowid = literal_column("rowid", Integer)
+        stmt = select(
+            rowid,
+            table.c.id,
+            table.c.type,
+            table.c.content,
+            self._embedding_column(with_embeddings),
+        ).where(table.c.type == node_type)
+        if level is not None and level > 0:
+            stmt = stmt.where(func.json_extract(table.c.content, "$.level") == level)
+
+        # Keyset pagination on rowid keeps each query short-lived.
+        last_rowid = 0
+        while True:
+            page = stmt.where(rowid > last_rowid).order_by(rowid).limit(QUERY_BATCH_SIZE)
+            with self.engine.connect() as conn:
+                rows = conn.execute(page).fetchall()
+            if not rows:
+                return
+            for _rowid, node_id, row_type, content_json, embedding_blob in rows:
+                node = self._row_to_node(node_id, row_type, content_json, embedding_blob)
+                if node is not None:
+                    yield node
+            last_rowid = rows[-1][0]
+
+    def _embedding_column(self, with_embeddings: bool) -> ColumnElement[Any]:
+        """Select the embedding BLOB, or a NULL placeholder when embeddings are not needed."""
+        return self.nodes_table.c.embedding_blob if with_embeddings else null()
+
+    def _fetch_batch(
+        self, node_ids: tuple[str, ...], with_embeddings: bool
+    ) -> dict[str, Chunk | SummaryNode]:
+        """Fetch one batch of nodes with a single `IN (...)` query, keyed by ID."""
+        table = self.nodes_table
+        stmt = select(
+            table.c.id, table.c.type, table.c.content, self._embedding_column(with_embeddings)
+        ).where(table.c.id.in_(node_ids))
+
+        nodes: dict[str, Chunk | SummaryNode] = {}
+        with self.engine.connect() as conn:
+            for node_id, node_type, content_json, embedding_blob in conn.execute(stmt):
+                node = self._row_to_node(node_id, node_type, content_json, embedding_blob)
+                if node is not None:
+                    nodes[node_id] = node
+        return nodes
+
+    def _row_to_node(
+        self,
+        node_id: int | str,
+        node_type: str,
+        content_json: str,
+        embedding_blob: bytes | None,
+    ) -> Chunk | SummaryNode | None:
+        """Deserialize a stored row into a Chunk or SummaryNode (None on failure)."""
+        try:
+            # Deserialize embedding first
+            embedding = (
+                decode_embedding(embedding_blob, self.embedding_dtype).tolist()
+                if embedding_blob is not None
+                else None
+            )
+
+            if node_type == "chunk":
+                # Parse JSON then validate to ensure strict type compliance
+                data = json.loads(content_json)
+                if embedding is not None:
+                    data["embedding"] = embedding
+                return Chunk.model_validate(data)
+
+            if node_type == "summary":
+                data = json.loads(content_json)
+                if embedding is not None:
+                    data["embedding"] = embedding
+                return SummaryNode.model_validate(data)
+
+        except Exception:
+            logger.exception(f"Failed to deserialize node {node_id}")
+            return None
 
         return None
 
+    def reset_run(self, input_digest: str | None = None) -> None:
+        """
+        Clear the run manifest and record the digest of the input of a new run.
+
+        Stored nodes are kept; only the progress records are dropped.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.run_levels_table))
+            conn.execute(delete(self.run_summaries_table))
+            conn.execute(
+                delete(self.meta_table).where(self.meta_table.c.key == META_RUN_INPUT_DIGEST)
+            )
+            if input_digest is not None:
+                conn.execute(
+                    insert(self.meta_table).values(key=META_RUN_INPUT_DIGEST, value=input_digest)
+                )
+
+    def get_run_input_digest(self) -> str | None:
+        """Digest of the input recorded by `reset_run`, if any."""
+        return self._get_meta(META_RUN_INPUT_DIGEST)
+
+    def save_run_level(self, level: int, node_ids: list[NodeID], clusters: list[Cluster]) -> None:
+        """Record the node IDs of a tree level and the clusters computed over them."""
+        stmt = insert(self.run_levels_table).prefix_with("OR REPLACE")
+        with self.engine.begin() as conn:
+            conn.execute(
+                stmt,
+                {
+                    "level": level,
+                    "node_ids": json.dumps(node_ids),
+                    "clusters": json.dumps([c.model_dump(mode="json") for c in clusters]),
+                },
+            )
+
+    def get_run_levels(self) -> dict[int, tuple[list[NodeID], list[Cluster]]]:
+        """All recorded levels: level -> (node IDs, clusters)."""
+        table = self.run_levels_table
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(table.c.level, table.c.node_ids, table.c.clusters).order_by(table.c.level)
+            ).fetchall()
+        return {
+            level: (
+                json.loads(node_ids_json),
+                [Cluster.model_validate(c) for c in json.loads(clusters_json)],
+            )
+            for level, node_ids_json, clusters_json in rows
+        }
+
+    def record_cluster_summaries(self, level: int, summaries: Iterable[tuple[int, str]]) -> None:
+        """Record (cluster position, summary ID) pairs for clusters of `level` that are done."""
+        stmt = insert(self.run_summaries_table).prefix_with("OR REPLACE")
+        for batch in batched(summaries, QUERY_BATCH_SIZE):
+            params = [
+                {"level": level, "cluster_pos": pos, "summary_id": summary_id}
+                for pos, summary_id in batch
+            ]
+            with self.engine.begin() as conn:
+                conn.execute(stmt, params)
+
+    def get_cluster_summaries(self, level: int) -> dict[int, str]:
+        """Summary IDs of the already summarized clusters of `level`, by cluster position."""
+        table = self.run_summaries_table
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(table.c.cluster_pos, table.c.summary_id).where(table.c.level == level)
+            ).fetchall()
+        return dict(rows)
+
+    def save_tree(self, tree: DocumentTree) -> None:
+        """
+        Persist the structure of a finished tree (replacing any previous one).
+
+        Records the root ID, every node's level and order, the parent/child edges and the
+        tree metadata. Node contents stay in the nodes table; the root and summary nodes
+        must already be stored there for `load_tree` to rebuild the tree.
+        """
+        summaries: Iterable[SummaryNode] = tree.all_nodes.values()
+        if tree.root_node.id not in tree.all_nodes:
+            summaries = itertools.chain(summaries, [tree.root_node])
+
+        level_positions: dict[int, int] = {}
+        node_rows: list[dict[str, Any]] = []
+        edge_rows: list[dict[str, Any]] = []
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.tree_nodes_table))
+            conn.execute(delete(self.tree_edges_table))
+            conn.execute(
+                delete(self.meta_table).where(
+                    self.meta_table.c.key.in_([META_TREE_ROOT_ID, META_TREE_METADATA])
+                )
+            )
+            leaf_rows = (
+                {"id": str(leaf_id), "level": 0, "position": pos}
+                for pos, leaf_id in enumerate(tree.leaf_chunk_ids)
+            )
+            for batch in batched(leaf_rows, QUERY_BATCH_SIZE):
+                conn.execute(insert(self.tree_nodes_table), list(batch))
+            # Summaries are streamed (possibly from this store), one batch of rows at a time
+            for node in summaries:
+                pos = level_positions.get(node.level, 0)
+                level_positions[node.level] = pos + 1
+                node_rows.append({"id": node.id, "level": node.level, "position": pos})
+                edge_rows.extend(
+                    {"parent_id": node.id, "position": child_pos, "child_id": str(child_id)}
+                    for child_pos, child_id in enumerate(node.children_indices)
+                )
+                if len(node_rows) >= QUERY_BATCH_SIZE:
+                    self._insert_tree_rows(conn, node_rows, edge_rows)
+            self._insert_tree_rows(conn, node_rows, edge_rows)
+            conn.execute(
+                insert(self.meta_table),
+                [
+                    {"key": META_TREE_ROOT_ID, "value": tree.root_node.id},
+                    {"key": META_TREE_METADATA, "value": json.dumps(tree.metadata)},
+                ],
+            )
+
+    def _insert_tree_rows(
+        self, conn: Connection, node_rows: list[dict[str, Any]], edge_rows: list[dict[str, Any]]
+    ) -> None:
+        """Insert buffered tree node and edge rows, then clear the buffers."""
+        if node_rows:
+            conn.execute(insert(self.tree_nodes_table), node_rows)
+            node_rows.clear()
+        for batch in batched(edge_rows, QUERY_BATCH_SIZE):
+            conn.execute(insert(self.tree_edges_table), list(batch))
+        edge_rows.clear()
+
+    def has_tree(self) -> bool:
+        """Whether a finished tree has been saved with `save_tree`."""
+        return self._get_meta(META_TREE_ROOT_ID) is not None
+
+    def load_tree(self) -> DocumentTree:
+        """
+        Rebuild the saved DocumentTree.
+
+        Leaf IDs and summary IDs come from the indexed tree tables, so leaf chunks are
+        never deserialized. Only the root is read up front: `all_nodes` is a
+        `StoredSummaryNodes` view that reads summary nodes (without embeddings) on access,
+        so the returned tree is only usable while this store is open.
+
+        Raises:
+            ValueError: If no tree was saved, or its root is missing from the store.
+        """
+        root_id = self._get_meta(META_TREE_ROOT_ID)
+        if root_id is None:
+            msg = "Store has no saved tree."
+            raise ValueError(msg)
+
+        table = self.tree_nodes_table
+        with self.engine.connect() as conn:
+            leaf_ids: list[NodeID] = [
+                int(node_id)
+                for node_id in conn.execute(
+                    select(table.c.id).where(table.c.level == 0).order_by(table.c.position)
+                ).scalars()
+            ]
+            summary_ids = list(
+                conn.execute(
+                    select(table.c.id)
+                    .where(table.c.level > 0)
+                    .order_by(table.c.level, table.c.position)
+                ).scalars()
+            )
+
+        all_nodes = StoredSummaryNodes(self, summary_ids)
+        root_node = all_nodes.get(root_id)
+        if root_node is None:
+            msg = f"Root node {root_id} of the saved tree is missing from the store."
+            raise ValueError(msg)
+
+        metadata_json = self._get_meta(META_TREE_METADATA)
+        return DocumentTree(
+            root_node=root_node,
+            all_nodes=all_nodes,
+            leaf_chunk_ids=leaf_ids,
+            metadata=json.loads(metadata_json) if metadata_json else {},
+        )
+
+    def get_tree_parents(self, node_ids: Iterable[NodeID]) -> dict[str, list[str]]:
+        """Parent IDs of the given nodes in the saved tree (soft clustering allows several)."""
+        table = self.tree_edges_table
+        parents: dict[str, list[str]] = {}
+        for batch in batched((str(nid) for nid in node_ids), QUERY_BATCH_SIZE):
+            stmt = select(table.c.child_id, table.c.parent_id).where(table.c.child_id.in_(batch))
+            with self.engine.connect() as conn:
+                for child_id, parent_id in conn.execute(stmt):
+                    parents.setdefault(child_id, []).append(parent_id)
+        return parents
+
+    def _get_meta(self, key: str) -> str | None:
+        """Read a value from the store metadata table."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(self.meta_table.c.value).where(self.meta_table.c.key == key)
+            ).scalar()
+
     def commit(self) -> None:
         """Explicit commit (placeholder as we use auto-commit blocks)."""
 
@@ -222,3 +828,93 @@ class DiskChunkStore:
 
     def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
         self.close()
+
+
+class StoredSummaryNodes(Mapping[str, SummaryNode]):
+    """
+    Read-only mapping of a tree's summary nodes by ID, backed by a DiskChunkStore.
+
+    Only the IDs are held in memory. Looking a node up reads it from the store and keeps
+    it in a small LRU cache; iterating `values()` or `items()` streams nodes in batches
+    without filling the cache. The mapping is only usable while the store is open.
+    """
+
+    def __init__(
+        self,
+        store: DiskChunkStore,
+        node_ids: Iterable[str],
+        *,
+        with_embeddings: bool = False,
+        cache_size: int = DEFAULT_NODE_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            store: Store holding the nodes.
+            node_ids: IDs of the summary nodes, in iteration order.
+            with_embeddings: Also read (and decode) each node's embedding.
+            cache_size: Number of recently looked up nodes kept in memory.
+        """
+        self._store = store
+        self._with_embeddings = with_embeddings
+        # Ordered and O(1) membership, without holding any node content
+        self._ids: dict[str, None] = dict.fromkeys(node_ids)
+        self._cache: OrderedDict[str, SummaryNode] = OrderedDict()
+        self._cache_size = cache_size
+
+    def __getitem__(self, node_id: str) -> SummaryNode:
+        node = self._cache.get(node_id)
+        if node is not None:
+            self._cache.move_to_end(node_id)
+            return node
+        if node_id not in self._ids:
+            raise KeyError(node_id)
+
+        [stored] = self._store.get_nodes([node_id], with_embeddings=self._with_embeddings)
+        if not isinstance(stored, SummaryNode):
+            raise KeyError(node_id)
+        self._cache[node_id] = stored
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return stored
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __repr__(self) -> str:
+        return f"<StoredSummaryNodes: {len(self)} nodes in {self._store.db_path}>"
+
+    def values(self) -> ValuesView[SummaryNode]:
+        return _StoredValues(self)
+
+    def items(self) -> ItemsView[str, SummaryNode]:
+        return _StoredItems(self)
+
+    def iter_nodes(self) -> Iterator[SummaryNode]:
+        """Stream all nodes in ID order with one store query per batch."""
+        for node in self._store.iter_nodes(self._ids, with_embeddings=self._with_embeddings):
+            if isinstance(node, SummaryNode):
+                yield node
+
+
+class _StoredValues(ValuesView[SummaryNode]):
+    """`values()` of a StoredSummaryNodes, streamed in batches."""
+
+    _mapping: StoredSummaryNodes
+
+    def __iter__(self) -> Iterator[SummaryNode]:
+        return self._mapping.iter_nodes()
+
+
+class _StoredItems(ItemsView[str, SummaryNode]):
+    """`items()` of a StoredSummaryNodes, streamed in batches."""
+
+    _mapping: StoredSummaryNodes
+
+    def __iter__(self) -> Iterator[tuple[str, SummaryNode]]:
+        return ((node.id, node) for node in self._mapping.iter_nodes())
@@ -1,11 +1,13 @@
 import re
 import unicodedata
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from functools import lru_cache
 
 # Pre-compile the sentence splitting pattern
 # Splits AFTER '。', '！', '？' followed by optional whitespace, OR on one or more newlines.
 SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[。！？])\s*|\n+")
+# A piece of text can only complete a sentence delimiter if it contains one of these.
+SENTENCE_END_PATTERN = re.compile(r"[。！？\n]")
 
 
 @lru_cache(maxsize=1024)
@@ -63,3 +65,54 @@ def iter_normalized_sentences(text: str) -> Iterator[str]:
     """
     for sentence in iter_sentences(text):
         yield normalize_text(sentence)
+
+
+def iter_sentences_from_stream(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yield sentences from text that arrives in pieces.
+
+    Yields exactly the sentences `iter_sentences` would yield for the concatenated text,
+    while only buffering the unfinished sentence at the end of the pieces seen so far.
+    A delimiter that touches the end of the buffer is held back, since the next piece
+    may extend it (more whitespace or newlines). Pieces that cannot end a sentence are
+    collected and joined once, when a piece that can arrives.
+    """
+    buffer = ""
+    parts: list[str] = []
+    scan_from = 0
+    held_back = False
+    for piece in pieces:
+        if not piece:
+            continue
+        parts.append(piece)
+        if not held_back and not SENTENCE_END_PATTERN.search(piece):
+            continue
+        buffer = "".join((buffer, *parts))
+        parts.clear()
+
+        last_idx = 0
+        next_scan = len(buffer)
+        held_back = False
+        for match in SENTENCE_SPLIT_PATTERN.finditer(buffer, scan_from):
+            if match.end() >= len(buffer):
+                next_scan = match.start()
+                held_back = True
+                break
+
+            sentence = buffer[last_idx : match.start()].strip()
+            if sentence:
+                yield sentence
+            last_idx = match.end()
+
+        buffer = buffer[last_idx:]
+        scan_from = max(0, next_scan - last_idx)
+
+    yield from iter_sentences("".join((buffer, *parts)))
+
+
+def iter_normalized_sentences_from_stream(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yield normalized (NFKC) sentences from text that arrives in pieces.
+    """
+    for sentence in iter_sentences_from_stream(pieces):
+        yield normalize_text(sentence)
@@ -20,7 +20,7 @@ def test_chunking_pipeline_integration(tmp_path: Path) -> None:
         # Mock tokenizer behavior
         mock_tokenizer = MagicMock()
         # Simple mock: 1 char = 1 token for simplicity in testing logic
-        mock_tokenizer.encode.side_effect = lambda text: [ord(c) for c in text]
+        mock_tokenizer.encode_ordinary.side_effect = lambda text: [ord(c) for c in text]
         mock_get_tokenizer.return_value = mock_tokenizer
 
         text = content
@@ -56,7 +56,7 @@ def test_chunking_pipeline_integration(tmp_path: Path) -> None:
             current_idx = expected_end
 
             # 3. Token Limit Check (Strict)
-            # count_tokens uses self.tokenizer.encode, which we mocked
+            # count_tokens uses self.tokenizer.encode_ordinary, which we mocked
             token_count = chunker.count_tokens(chunk.text)
             assert token_count <= config.max_tokens, (
                 f"Chunk {i} exceeds max tokens: {token_count} > {config.max_tokens}"
@@ -3,7 +3,9 @@ from unittest.mock import MagicMock, patch
 
 from typer.testing import CliRunner
 
+from domain_models.manifest import Chunk, DocumentTree, SummaryNode
 from matome.cli import app
+from matome.utils.store import DiskChunkStore
 
 runner = CliRunner()
 
@@ -45,11 +47,11 @@ def test_cli_run_success(
 
     mock_raptor_instance.run.return_value = mock_tree
 
-    # Mock Store get_node to return dummy nodes
+    # Mock Store get_nodes to return dummy nodes
     mock_store_instance = mock_store_cls.return_value
     mock_node = MagicMock()
     mock_node.text = "Child Text"
-    mock_store_instance.get_node.return_value = mock_node
+    mock_store_instance.get_nodes.return_value = [mock_node, mock_node]
 
     # Mock Verifier
     mock_verifier_instance = mock_verifier_cls.return_value
@@ -120,3 +122,62 @@ def test_cli_run_file_not_found() -> None:
 
         # Typer/Click argument error exit code is 2
         assert result.exit_code == 2
+
+
+def test_cli_export_reloads_saved_tree(tmp_path: Path) -> None:
+    """export rebuilds the tree from chunks.db without running the pipeline."""
+    db_path = tmp_path / "chunks.db"
+    root = SummaryNode(id="root", text="Root summary", level=1, children_indices=[0, 1])
+    with DiskChunkStore(db_path) as store:
+        store.add_chunks(
+            Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(2)
+        )
+        store.add_summary(root)
+        store.save_tree(
+            DocumentTree(root_node=root, all_nodes={"root": root}, leaf_chunk_ids=[0, 1])
+        )
+
+    output_dir = tmp_path / "export"
+    result = runner.invoke(app, ["export", str(db_path), "--output-dir", str(output_dir)])
+
+    assert result.exit_code == 0
+    markdown = (output_dir / "summary_all.md").read_text(encoding="utf-8")
+    assert "# Root summary" in markdown
+    assert "**Chunk 1**: Chunk 1" in markdown
+
+
+@patch("matome.cli.export_to_markdown", return_value="MD Content")
+@patch("matome.cli.ObsidianCanvasExporter")
+def test_cli_batch_shares_engine_across_documents(
+    mock_obs_cls: MagicMock, mock_md_func: MagicMock, tmp_path: Path
+) -> None:
+    """batch creates the models once and writes one output directory per document."""
+    input_dir = tmp_path / "docs"
+    input_dir.mkdir()
+    for name in ("a", "b", "c"):
+        (input_dir / f"{name}.txt").write_text(f"Text {name}", encoding="utf-8")
+    (input_dir / "notes.md").write_text("Not an input", encoding="utf-8")
+
+    with (
+        patch("matome.cli.RaptorEngine") as mock_raptor_cls,
+        patch("matome.cli.JapaneseTokenChunker"),
+        patch("matome.cli.EmbeddingService") as mock_embedder_cls,
+        patch("matome.cli.GMMClusterer"),
+        patch("matome.cli.SummarizationAgent") as mock_summarizer_cls,
+    ):
+        mock_raptor_cls.return_value.run.return_value = MagicMock()
+
+        output_dir = tmp_path / "results"
+        result = runner.invoke(
+            app, ["batch", str(input_dir), "--output-dir", str(output_dir), "--no-verify"]
+        )
+
+    assert result.exit_code == 0, result.stdout
+    mock_embedder_cls.assert_called_once()
+    mock_summarizer_cls.assert_called_once()
+    texts = sorted(call.args[0] for call in mock_raptor_cls.return_value.run.call_args_list)
+    assert texts == ["Text a", "Text b", "Text c"]
+    assert sorted(p.name for p in output_dir.iterdir()) == ["a", "b", "c"]
+    assert (output_dir / "a" / "summary_all.md").read_text(encoding="utf-8") == "MD Content"
+    assert mock_md_func.call_count == 3
+    assert mock_obs_cls.return_value.export.call_count == 3
@@ -1,3 +1,4 @@
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -5,6 +6,8 @@ import pytest
 
 from domain_models.config import ProcessingConfig
 from matome.engines.cluster import GMMClusterer
+from matome.engines.knn import ExactNeighborSearch
+from matome.utils.knn_cache import KNNGraphCache
 
 
 @pytest.fixture
@@ -71,6 +74,10 @@ def test_clustering_with_gmm_soft(
     # Node 2 (0.55) >= 0.4, so it should be in C1 too
     assert set(c1.node_indices) == {2, 3, 4, 5}
 
+    # Centroids are means of the original (not UMAP-reduced) embeddings
+    assert c0.centroid == pytest.approx([1.0, 1.0])
+    assert c1.centroid == pytest.approx([1.75, 1.75])
+
     # Verify calls
     mock_umap_cls.assert_called_once()
     mock_gmm_instance.predict_proba.assert_called()
@@ -125,6 +132,7 @@ def test_very_small_dataset_skip(sample_embeddings: list[list[float]]) -> None:
         assert len(clusters) == 1
         assert clusters[0].id == 0
         assert len(clusters[0].node_indices) == 5
+        assert clusters[0].centroid == pytest.approx([1.4, 1.4])
 
         # Verify engines NOT called
         mock_umap.assert_not_called()
@@ -151,3 +159,83 @@ def test_umap_config_params(
     assert call_kwargs["n_components"] == 3
     assert call_kwargs["n_neighbors"] == 5
     assert call_kwargs["min_dist"] == 0.0
+
+
+@patch("matome.engines.cluster.UMAP")
+def test_cluster_arrays_writes_blocks_to_memmap(
+    mock_umap_cls: MagicMock, sample_embeddings: list[list[float]]
+) -> None:
+    """Blocks are concatenated in order and give the same data as the list path."""
+    seen: list[np.ndarray] = []
+
+    def fit_transform(data: np.ndarray) -> np.ndarray:
+        seen.append(np.array(data))
+        return seen[-1]
+
+    mock_umap_cls.return_value.fit_transform.side_effect = fit_transform
+    config = ProcessingConfig(n_clusters=2)
+    engine = GMMClusterer()
+
+    blocks = [np.array(sample_embeddings[:4]), np.empty((0, 2)), np.array(sample_embeddings[4:])]
+    clusters = engine.cluster_arrays(iter(blocks), config)
+
+    np.testing.assert_array_equal(seen[0], np.array(sample_embeddings, dtype=np.float32))
+    assert sorted(i for c in clusters for i in c.node_indices) == list(range(6))
+
+
+def test_cluster_arrays_rejects_dimension_mismatch() -> None:
+    engine = GMMClusterer()
+    blocks = [np.ones((3, 2)), np.ones((3, 3))]
+    with pytest.raises(ValueError, match="dimension mismatch at index 3"):
+        engine.cluster_arrays(blocks, ProcessingConfig())
+
+
+@patch("matome.engines.cluster.UMAP")
+def test_umap_gets_cached_knn_graph(
+    mock_umap_cls: MagicMock, sample_embeddings: list[list[float]], tmp_path: Path
+) -> None:
+    """UMAP receives a precomputed k-NN graph, which is cached across runs on the same data."""
+    mock_umap_cls.return_value.fit_transform.return_value = np.array(sample_embeddings)
+    config = ProcessingConfig(n_clusters=2, umap_n_neighbors=3)
+    cache = KNNGraphCache(tmp_path / "knn")
+    search = ExactNeighborSearch()
+
+    with patch.object(search, "kneighbors", wraps=search.kneighbors) as kneighbors:
+        for _ in range(2):
+            GMMClusterer(neighbor_search=search, knn_cache=cache).cluster_nodes(
+                sample_embeddings, config
+            )
+
+    kneighbors.assert_called_once()
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    indices, distances = mock_umap_cls.call_args.kwargs["precomputed_knn"]
+    assert indices.shape == distances.shape == (6, 3)
+    np.testing.assert_array_equal(indices[:, 0], np.arange(6))
+
+
+@patch("matome.engines.cluster.GaussianMixture")
+def test_bic_search_stops_early_and_reuses_winner(mock_gmm_cls: MagicMock) -> None:
+    """With bic_patience, the search stops after consecutive BIC rises; the winner is not refit."""
+    mock_gmm_cls.return_value.bic.side_effect = [30.0, 20.0, 25.0, 26.0, 10.0]
+    config = ProcessingConfig(bic_patience=2)
+
+    n, gmm = GMMClusterer()._calculate_optimal_clusters(np.zeros((10, 2)), config)
+
+    # 20.0 (n=3) is followed by two rises, so n=6 (BIC 10.0) is never tried
+    assert n == 3
+    assert gmm is mock_gmm_cls.return_value
+    assert mock_gmm_cls.call_count == 4
+
+
+def test_parallel_bic_search_matches_serial() -> None:
+    rng = np.random.default_rng(0)
+    centers = [(0.0, 0.0), (5.0, 5.0), (0.0, 8.0)]
+    data = np.vstack([rng.normal(c, 0.3, size=(40, 2)) for c in centers])
+    engine = GMMClusterer()
+
+    serial, _ = engine._calculate_optimal_clusters(data, ProcessingConfig())
+    parallel, gmm = engine._calculate_optimal_clusters(data, ProcessingConfig(bic_search_workers=4))
+
+    assert serial == parallel == 3
+    assert gmm is not None
+    assert gmm.n_components == 3
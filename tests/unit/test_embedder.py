@@ -1,3 +1,4 @@
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -5,6 +6,7 @@ import numpy as np
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk
 from matome.engines.embedder import EmbeddingService
+from matome.utils.embedding_cache import EmbeddingCache
 
 
 # Scenario 05: Embedding Vector Generation
@@ -85,3 +87,101 @@ def test_embed_strings_empty() -> None:
         assert results == []
         # Encode should not be called
         mock_st.return_value.encode.assert_not_called()
+
+
+def test_embedding_cache_skips_model_on_rerun(tmp_path: Path) -> None:
+    """A second run over cached texts must not load or call the model."""
+    config = ProcessingConfig(embedding_batch_size=4)
+    texts = ["alpha", "beta", "alpha"]
+
+    with patch("matome.engines.embedder.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = lambda batch, **_: np.array(
+            [[float(len(t)), 1.0] for t in batch]
+        )
+        with EmbeddingCache(tmp_path / "emb.db") as cache:
+            first = list(EmbeddingService(config, cache=cache).embed_strings(texts))
+            assert cache.stats() == {"hits": 0, "misses": 3}
+
+        mock_st.reset_mock()
+
+        with EmbeddingCache(tmp_path / "emb.db") as cache:
+            service = EmbeddingService(config, cache=cache)
+            chunks = [
+                Chunk(index=i, text=t, start_char_idx=0, end_char_idx=len(t))
+                for i, t in enumerate(texts)
+            ]
+            second = [c.embedding for c in service.embed_chunks(chunks)]
+            assert cache.stats() == {"hits": 3, "misses": 0}
+
+        mock_st.assert_not_called()
+
+    assert second == first
+
+
+def test_adaptive_batching_splits_by_padded_tokens() -> None:
+    """Adaptive mode groups texts so padded length * count stays within the token budget."""
+    config = ProcessingConfig(
+        embedding_batch_size=8,
+        embedding_adaptive_batching=True,
+        embedding_max_batch_tokens=10,
+        embedding_memory_budget_mb=1024,
+    )
+    texts = ["aa", "bb", "cc", "dddddddd", "e"]
+
+    with patch("matome.engines.embedder.SentenceTransformer") as mock_st:
+        mock_st.return_value.max_seq_length = 512
+        mock_st.return_value.encode.side_effect = lambda batch, **_: np.array(
+            [[float(len(t)), 0.0] for t in batch], dtype=np.float64
+        )
+        service = EmbeddingService(config)
+        block = service._process_batch(texts)
+
+        calls = [c.args[0] for c in mock_st.return_value.encode.call_args_list]
+
+    assert calls == [["aa", "bb", "cc"], ["dddddddd"], ["e"]]
+    assert block.dtype == np.float32
+    assert block.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(block[:, 0], [2, 2, 2, 8, 1])
+
+
+def test_token_budget_derived_from_memory_budget() -> None:
+    config = ProcessingConfig(
+        embedding_max_batch_tokens=1000,
+        embedding_memory_budget_mb=1,
+        embedding_bytes_per_token=64 * 1024,
+    )
+    assert EmbeddingService(config)._token_budget() == 16
+
+
+def test_embed_strings_batched_yields_float32_blocks() -> None:
+    config = ProcessingConfig(embedding_batch_size=2)
+
+    with patch("matome.engines.embedder.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = lambda batch, **_: np.ones((len(batch), 4))
+        service = EmbeddingService(config)
+        blocks = list(service.embed_strings_batched(["a", "b", "c"]))
+
+    assert [b.shape for b in blocks] == [(2, 4), (1, 4)]
+    assert all(b.dtype == np.float32 for b in blocks)
+
+
+def test_length_bucketing_sorts_batches_and_restores_order() -> None:
+    config = ProcessingConfig(
+        embedding_batch_size=2, embedding_length_bucketing=True, embedding_bucket_window=4
+    )
+    texts = ["cccc", "a", "ddddd", "bb", "e"]
+    chunks = [
+        Chunk(index=i, text=t, start_char_idx=0, end_char_idx=len(t)) for i, t in enumerate(texts)
+    ]
+
+    with patch("matome.engines.embedder.SentenceTransformer") as mock_st:
+        mock_st.return_value.encode.side_effect = lambda batch, **_: np.array(
+            [[float(len(t))] for t in batch]
+        )
+        service = EmbeddingService(config)
+        result = list(service.embed_chunks(chunks))
+        calls = [c.args[0] for c in mock_st.return_value.encode.call_args_list]
+
+    assert calls == [["a", "bb"], ["cccc", "ddddd"], ["e"]]
+    assert [c.index for c in result] == [0, 1, 2, 3, 4]
+    assert [c.embedding for c in result] == [[4.0], [1.0], [5.0], [2.0], [1.0]]
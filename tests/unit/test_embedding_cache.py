@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from matome.utils.embedding_cache import EmbeddingCache, embedding_cache_key
+
+
+def test_cache_key_normalizes_text_and_includes_model() -> None:
+    # NFKC maps full-width characters to half-width; surrounding whitespace is ignored
+    assert embedding_cache_key("m", "ＡＢＣ ") == embedding_cache_key("m", "ABC")
+    assert embedding_cache_key("m1", "ABC") != embedding_cache_key("m2", "ABC")
+
+
+def test_put_and_get_roundtrip(tmp_path: Path) -> None:
+    with EmbeddingCache(tmp_path / "cache.db") as cache:
+        cache.put_many([("a", [0.5, 1.0]), ("b", np.array([2.0, 3.0]))])
+
+        found = cache.get_many(["a", "missing", "b"])
+
+        assert set(found) == {"a", "b"}
+        assert found["a"].dtype == np.float32
+        np.testing.assert_array_equal(found["b"], [2.0, 3.0])
+        assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    db_path = tmp_path / "cache.db"
+    with EmbeddingCache(db_path) as cache:
+        cache.put_many([("a", [1.0])])
+
+    with EmbeddingCache(db_path) as reopened:
+        assert len(reopened) == 1
+        assert "a" in reopened.get_many(["a"])
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    with EmbeddingCache(tmp_path / "cache.db", max_entries=2) as cache:
+        cache.put_many([("a", [1.0])])
+        cache.put_many([("b", [2.0])])
+        # Touch "a" so "b" becomes the least recently used entry
+        cache.get_many(["a"])
+        cache.put_many([("c", [3.0])])
+
+        assert len(cache) == 2
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_invalid_max_entries(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="max_entries"):
+        EmbeddingCache(tmp_path / "cache.db", max_entries=0)
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from unittest.mock import MagicMock
 
 from domain_models.manifest import Chunk, DocumentTree, SummaryNode
@@ -26,10 +27,11 @@ def test_export_to_markdown() -> None:
     # Mock store
     store = MagicMock()
 
-    def get_node_side_effect(idx: int) -> Chunk | None:
-        return {0: chunk0, 1: chunk1}.get(idx)
+    def iter_nodes_side_effect(ids: list[int], **kwargs: object) -> Iterator[Chunk]:
+        chunks = {0: chunk0, 1: chunk1}
+        return (chunks[idx] for idx in ids if idx in chunks)
 
-    store.get_node.side_effect = get_node_side_effect
+    store.iter_nodes.side_effect = iter_nodes_side_effect
 
     # Export
     md = export_to_markdown(tree, store)
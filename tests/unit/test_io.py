@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from matome.utils.io import read_file
+from matome.utils.io import SentenceSource, iter_file_text, read_file
 
 
 def test_read_file_success(tmp_path: Path) -> None:
@@ -24,3 +24,29 @@ def test_read_file_is_directory(tmp_path: Path) -> None:
     # tmp_path is a directory
     with pytest.raises(ValueError, match="Not a file"):
         read_file(tmp_path)
+
+
+def test_iter_file_text_splits_multibyte_and_crlf(tmp_path: Path) -> None:
+    """Blocks that cut UTF-8 characters or CRLF pairs decode like read_file."""
+    p = tmp_path / "test.txt"
+    p.write_bytes("日本語の文。\r\n次の文！\r\n".encode() * 50)
+
+    pieces = list(iter_file_text(p, block_size=5))
+
+    assert len(pieces) > 1
+    assert "".join(pieces) == read_file(p)
+
+
+def test_iter_file_text_empty_file(tmp_path: Path) -> None:
+    p = tmp_path / "empty.txt"
+    p.write_bytes(b"")
+    assert list(iter_file_text(p)) == []
+
+
+def test_sentence_source_rereads_file(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    p.write_text("文１。文２！\n文３", encoding="utf-8")
+    source = SentenceSource(p, block_size=4)
+
+    assert list(source) == ["文1。", "文2!", "文3"]
+    assert list(source) == ["文1。", "文2!", "文3"]
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from domain_models.config import ProcessingConfig
+from matome.engines.knn import (
+    ExactNeighborSearch,
+    NNDescentNeighborSearch,
+    default_neighbor_search,
+)
+from matome.utils.knn_cache import KNNGraphCache
+
+
+def test_exact_search_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(50, 8)).astype(np.float32)
+
+    # A tiny block size exercises the blocked path
+    indices, distances = ExactNeighborSearch(block_size=7).kneighbors(data, 5)
+
+    full = np.linalg.norm(data[:, None, :] - data[None, :, :], axis=-1)
+    expected = np.argsort(full, axis=1)[:, :5]
+    assert indices.dtype == np.int64
+    assert distances.dtype == np.float32
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_allclose(distances, np.sort(full, axis=1)[:, :5], atol=1e-4)
+
+
+def test_exact_search_puts_each_row_first_despite_duplicates() -> None:
+    data = np.zeros((4, 3), dtype=np.float32)
+
+    indices, distances = ExactNeighborSearch().kneighbors(data, 2)
+
+    np.testing.assert_array_equal(indices[:, 0], np.arange(4))
+    np.testing.assert_array_equal(distances, 0.0)
+
+
+def test_invalid_k() -> None:
+    data = np.zeros((3, 2), dtype=np.float32)
+    with pytest.raises(ValueError, match="k must be"):
+        ExactNeighborSearch().kneighbors(data, 4)
+
+
+def test_default_backend_switches_on_size() -> None:
+    config = ProcessingConfig(knn_exact_max_samples=100)
+    assert isinstance(default_neighbor_search(100, config), ExactNeighborSearch)
+    assert isinstance(default_neighbor_search(101, config), NNDescentNeighborSearch)
+
+
+def test_cache_serves_smaller_k_and_misses_larger_k(tmp_path: Path) -> None:
+    data_path = tmp_path / "data.dat"
+    data = np.arange(12, dtype=np.float32).reshape(6, 2)
+    data.tofile(data_path)
+    cache = KNNGraphCache(tmp_path / "knn")
+    digest = cache.digest(data_path, data.shape)
+    indices, distances = ExactNeighborSearch().kneighbors(data, 4)
+
+    assert cache.get(digest, "exact", 4) is None
+    cache.put(digest, "exact", indices, distances)
+
+    cached = cache.get(digest, "exact", 3)
+    assert cached is not None
+    np.testing.assert_array_equal(cached[0], indices[:, :3])
+    np.testing.assert_array_equal(cached[1], distances[:, :3])
+    assert cache.get(digest, "exact", 5) is None
+    assert cache.get(digest, "other", 3) is None
+    assert cache.stats() == {"hits": 1, "misses": 3}
+    # Same file contents with a different shape is a different matrix
+    assert cache.digest(data_path, (3, 4)) != digest
+
+
+def test_concurrent_cache_lookups_are_all_counted(tmp_path: Path) -> None:
+    cache = KNNGraphCache(tmp_path / "knn")
+    indices, distances = ExactNeighborSearch().kneighbors(np.eye(3, dtype=np.float32), 2)
+    cache.put("digest", "exact", indices, distances)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda k: cache.get("digest", "exact", k), [2, 3] * 32))
+
+    assert sum(graph is not None for graph in results) == 32
+    assert cache.stats() == {"hits": 32, "misses": 32}
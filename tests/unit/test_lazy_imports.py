@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from matome.utils.lazy import LazyImport, lazy_import
+
+# Dependencies that each cost seconds to import (torch, numba JIT setup, openai client)
+HEAVY_MODULES = (
+    "langchain_openai",
+    "numba",
+    "openai",
+    "pynndescent",
+    "sentence_transformers",
+    "sklearn",
+    "torch",
+    "transformers",
+    "umap",
+)
+# Importing matome.cli lazily takes well under a second; eager imports took 15s+.
+IMPORT_TIME_BUDGET_SECONDS = 5.0
+
+
+def import_in_subprocess(module: str) -> dict[str, object]:
+    """Import `module` in a fresh interpreter; report the time and heavy modules loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, timeout=120
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["matome.cli", "matome.engines", "matome.server"])
+def test_import_does_not_load_heavy_dependencies(module: str) -> None:
+    assert import_in_subprocess(module)["heavy"] == []
+
+
+def test_cli_import_time_budget() -> None:
+    elapsed = import_in_subprocess("matome.cli")["elapsed"]
+    assert isinstance(elapsed, float)
+    assert elapsed < IMPORT_TIME_BUDGET_SECONDS
+
+
+def test_lazy_import_resolves_on_first_use() -> None:
+    proxy = lazy_import("collections", "OrderedDict")
+    assert isinstance(proxy, LazyImport)
+    assert not proxy.is_loaded
+
+    assert proxy(a=1) == {"a": 1}
+    assert proxy.is_loaded
+    assert proxy.fromkeys("ab") == {"a": None, "b": None}
+
+    module_proxy = lazy_import("json")
+    assert module_proxy.dumps([1]) == "[1]"
+
+
+def test_engines_package_exports_classes_lazily() -> None:
+    from matome import engines
+    from matome.engines.cluster import GMMClusterer
+
+    assert engines.GMMClusterer is GMMClusterer
+    with pytest.raises(AttributeError):
+        _ = engines.NoSuchEngine
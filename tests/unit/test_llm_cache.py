@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from matome.utils.llm_cache import LLMResponseCache, llm_cache_key
+
+
+def test_cache_key_components() -> None:
+    base = llm_cache_key("gpt-4o", 0.0, "T {context}", ["prompt"])
+    assert base == llm_cache_key("gpt-4o", 0.0, "T {context}", ["prompt"])
+    assert base != llm_cache_key("gpt-4o-mini", 0.0, "T {context}", ["prompt"])
+    assert base != llm_cache_key("gpt-4o", 0.5, "T {context}", ["prompt"])
+    assert base != llm_cache_key("gpt-4o", 0.0, "Other {context}", ["prompt"])
+    assert base != llm_cache_key("gpt-4o", 0.0, "T {context}", ["prompt2"])
+
+
+def test_put_get_and_persistence(tmp_path: Path) -> None:
+    db_path = tmp_path / "llm.db"
+    with LLMResponseCache(db_path) as cache:
+        assert cache.get("k") is None
+        cache.put("k", "response")
+        assert cache.get("k") == "response"
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    with LLMResponseCache(db_path) as reopened:
+        assert reopened.get("k") == "response"
+
+
+def test_ttl_expiry(tmp_path: Path) -> None:
+    with LLMResponseCache(tmp_path / "llm.db", ttl_seconds=10) as cache:
+        with patch("matome.utils.llm_cache.time.time", return_value=1000.0):
+            cache.put("k", "response")
+        with patch("matome.utils.llm_cache.time.time", return_value=1005.0):
+            assert cache.get("k") == "response"
+        with patch("matome.utils.llm_cache.time.time", return_value=1011.0):
+            assert cache.get("k") is None
+        # Expired entries are removed
+        assert len(cache) == 0
+
+
+def test_size_bounded_eviction(tmp_path: Path) -> None:
+    with LLMResponseCache(tmp_path / "llm.db", max_entries=2) as cache:
+        with patch("matome.utils.llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("a", "A")
+            cache.put("b", "B")
+            cache.get("a")  # "b" is now least recently used
+            cache.put("c", "C")
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+
+def test_concurrent_lookups_are_all_counted(tmp_path: Path) -> None:
+    with LLMResponseCache(tmp_path / "llm.db") as cache:
+        cache.put("k", "response")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: cache.get("k"), range(64)))
+
+        assert results == ["response"] * 64
+        assert cache.stats() == {"hits": 64, "misses": 0}
+
+
+def test_invalid_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="max_entries"):
+        LLMResponseCache(tmp_path / "llm.db", max_entries=0)
+    with pytest.raises(ValueError, match="ttl_seconds"):
+        LLMResponseCache(tmp_path / "llm.db", ttl_seconds=0)
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from matome.utils.compat import batched
+from matome.utils.pipeline import pipelined
+
+
+def double(items: Iterator[int]) -> Iterator[int]:
+    for item in items:
+        yield item * 2
+
+
+def pairs(items: Iterator[int]) -> Iterator[tuple[int, int]]:
+    it = iter(items)
+    yield from zip(it, it, strict=False)
+
+
+def test_pipelined_runs_stages_in_order() -> None:
+    assert list(pipelined(range(6), [double, pairs], queue_size=2)) == [(0, 2), (4, 6), (8, 10)]
+    assert list(pipelined([], [double], queue_size=1)) == []
+
+
+def test_pipelined_stages_overlap() -> None:
+    seen: list[str] = []
+
+    def slow_source() -> Iterator[int]:
+        for i in range(3):
+            time.sleep(0.02)
+            seen.append(f"produced {i}")
+            yield i
+
+    def record(items: Iterator[int]) -> Iterator[int]:
+        for item in items:
+            seen.append(f"consumed {item}")
+            yield item
+
+    assert list(pipelined(slow_source(), [record], queue_size=1)) == [0, 1, 2]
+    assert seen.index("consumed 0") < seen.index("produced 2")
+
+
+def test_pipelined_reraises_stage_errors() -> None:
+    def failing(items: Iterator[int]) -> Iterator[int]:
+        for item in items:
+            if item == 3:
+                msg = "bad item"
+                raise ValueError(msg)
+            yield item
+
+    results: list[int] = []
+    with pytest.raises(ValueError, match="bad item"):
+        results.extend(pipelined(range(100), [failing, double], queue_size=1))
+    assert results == [0, 2, 4]
+
+
+def test_pipelined_stages_finish_items_received_before_a_failure() -> None:
+    def failing_source() -> Iterator[int]:
+        yield from range(3)
+        msg = "source down"
+        raise RuntimeError(msg)
+
+    results: list[tuple[int, ...]] = []
+    with pytest.raises(RuntimeError, match="source down"):
+        results.extend(pipelined(failing_source(), [lambda items: batched(items, 10)], 4))
+    # The partial batch was still emitted before the error surfaced
+    assert results == [(0, 1, 2)]
+
+
+def test_pipelined_stops_threads_when_abandoned() -> None:
+    before = threading.active_count()
+    stream = pipelined(iter(range(10_000)), [double], queue_size=1)
+    assert next(stream) == 0
+    stream.close()
+    assert threading.active_count() == before
+
+    with pytest.raises(ValueError, match="queue_size"):
+        list(pipelined(range(3), [double], queue_size=0))
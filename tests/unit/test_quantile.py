@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from matome.utils.quantile import P2Quantile
+
+
+def test_exact_for_first_observations() -> None:
+    estimator = P2Quantile(0.9)
+    for x in [0.3, 0.1, 0.2]:
+        estimator.add(x)
+    assert estimator.value() == pytest.approx(np.percentile([0.3, 0.1, 0.2], 90))
+
+
+def test_tracks_percentile_of_long_stream() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0.0, 1.0, size=20_000)
+
+    estimator = P2Quantile(0.9)
+    for x in data:
+        estimator.add(float(x))
+
+    assert estimator.value() == pytest.approx(np.percentile(data, 90), abs=0.02)
+
+
+def test_extremes_are_exact() -> None:
+    data = [5.0, 1.0, 9.0, 3.0, 7.0, 2.0, 8.0]
+    low, high = P2Quantile(0.0), P2Quantile(1.0)
+    for x in data:
+        low.add(x)
+        high.add(x)
+    assert low.value() == 1.0
+    assert high.value() == 9.0
+
+
+def test_invalid_usage() -> None:
+    with pytest.raises(ValueError, match="Quantile"):
+        P2Quantile(1.5)
+    with pytest.raises(ValueError, match="No observations"):
+        P2Quantile(0.5).value()
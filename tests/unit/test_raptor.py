@@ -1,20 +1,27 @@
-from collections.abc import Iterator
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from unittest.mock import MagicMock, create_autospec
 
+import numpy as np
 import pytest
 
 from domain_models.config import ProcessingConfig
 from domain_models.manifest import Chunk, Cluster, DocumentTree
+from matome.engines.cluster import GMMClusterer
 from matome.engines.embedder import EmbeddingService
 from matome.engines.raptor import RaptorEngine
+from matome.engines.token_chunker import JapaneseTokenChunker
 from matome.interfaces import Chunker, Clusterer, Summarizer
+from matome.utils.store import DiskChunkStore, StoredSummaryNodes
 
 
 @pytest.fixture
 def mock_dependencies() -> tuple[MagicMock, MagicMock, MagicMock, MagicMock]:
     chunker = create_autospec(Chunker, instance=True)
     embedder = create_autospec(EmbeddingService, instance=True)
-    clusterer = create_autospec(Clusterer, instance=True)
+    clusterer = create_autospec(GMMClusterer, instance=True)
     summarizer = create_autospec(Summarizer, instance=True)
     return chunker, embedder, clusterer, summarizer
 
@@ -111,28 +118,22 @@ def test_raptor_run_recursive(
     embedder.embed_chunks.side_effect = side_effect_embed_chunks
 
     # Mock embedding for summary nodes (strings)
-    # Must yield one embedding per input text.
-    def side_effect_embed_strings(texts: list[str]) -> Iterator[list[float]]:
-        for _ in texts:
-            yield [0.2] * 768
+    # Must yield one (n, dim) block row per input text.
+    def side_effect_embed_strings_batched(texts: tuple[str, ...]) -> Iterator[np.ndarray]:
+        yield np.full((len(texts), 768), 0.2, dtype=np.float32)
 
-    embedder.embed_strings.side_effect = side_effect_embed_strings
+    embedder.embed_strings_batched.side_effect = side_effect_embed_strings_batched
 
     # Clustering Logic
-    # Call 1 (Level 0 Chunks): Returns 2 clusters (needs reducing)
+    # Level 0 Chunks (cluster_nodes): Returns 2 clusters (needs reducing)
     # Cluster 0: [0, 1], Cluster 1: [2]
     cluster_l0_0 = Cluster(id=0, level=0, node_indices=[0, 1])
     cluster_l0_1 = Cluster(id=1, level=0, node_indices=[2])
 
-    # Call 2 (Level 1 Summaries): Returns 1 cluster (Root)
+    # Level 1 Summaries (cluster_arrays): Returns 1 cluster (Root)
     # Cluster 0: [0, 1] (Indices into the list of summaries from L0 clusters)
     cluster_l1_0 = Cluster(id=0, level=1, node_indices=[0, 1])  # Summaries of c0 and c1
 
-    clusterer.cluster_nodes.side_effect = [
-        [cluster_l0_0, cluster_l0_1],  # First pass
-        [cluster_l1_0],  # Second pass
-    ]
-
     # Summarization
     summarizer.summarize.side_effect = [
         "Summary L1-0",  # Summary of Cluster L0-0
@@ -144,27 +145,22 @@ def test_raptor_run_recursive(
     # We must simulate the consumption of generator inside cluster_nodes mock side effect
     # to trigger the side effect that populates leaf_chunks.
 
-    original_side_effect = [
-        [cluster_l0_0, cluster_l0_1],  # First pass
-        [cluster_l1_0],  # Second pass
-    ]
+    def consuming_cluster_nodes(
+        embeddings: Iterator[list[float]], config: ProcessingConfig
+    ) -> list[Cluster]:
+        list(embeddings)
+        return [cluster_l0_0, cluster_l0_1]
 
-    # Use closure for stateful side effect
-    iter_count = 0
+    l1_blocks: list[np.ndarray] = []
 
-    def consuming_side_effect(
-        embeddings: Iterator[list[float]] | list[list[float]], config: ProcessingConfig
+    def consuming_cluster_arrays(
+        blocks: Iterator[np.ndarray], config: ProcessingConfig
     ) -> list[Cluster]:
-        nonlocal iter_count
-        # Iterate over embeddings if it's an iterator
-        if isinstance(embeddings, Iterator):
-            list(embeddings)
+        l1_blocks.extend(blocks)
+        return [cluster_l1_0]
 
-        result = original_side_effect[iter_count]
-        iter_count += 1
-        return result
-
-    clusterer.cluster_nodes.side_effect = consuming_side_effect
+    clusterer.cluster_nodes.side_effect = consuming_cluster_nodes
+    clusterer.cluster_arrays.side_effect = consuming_cluster_arrays
 
     tree = engine.run("Long text")
 
@@ -181,3 +177,358 @@ def test_raptor_run_recursive(
     # Verify we have all nodes
     # Root + 2 L1 nodes = 3 nodes
     assert len(tree.all_nodes) == 3
+    # The temporary store is gone after the run, so the nodes were loaded into memory
+    assert isinstance(tree.all_nodes, dict)
+    assert {node.text for node in tree.all_nodes.values()} == {
+        "Summary L1-0",
+        "Summary L1-1",
+        "Root Summary",
+    }
+
+    # Level 1 embeddings reached the clusterer as one (2, dim) block
+    assert [b.shape for b in l1_blocks] == [(2, 768)]
+
+
+def test_list_only_embedder_and_clusterer_are_supported(config: ProcessingConfig) -> None:
+    """Embedders without embed_strings_batched and clusterers without cluster_arrays still work."""
+
+    class ListEmbedder:
+        def embed_chunks(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+            for chunk in chunks:
+                chunk.embedding = [0.1, 0.2]
+                yield chunk
+
+        def embed_strings(self, texts: Iterable[str]) -> Iterator[list[float]]:
+            for _ in texts:
+                yield [0.3, 0.4]
+
+    chunker = create_autospec(Chunker, instance=True)
+    clusterer = create_autospec(Clusterer, instance=True)
+    summarizer = create_autospec(Summarizer, instance=True)
+    chunker.split_text.return_value = iter(
+        [Chunk(index=i, text=f"Chunk {i}", start_char_idx=i, end_char_idx=i + 1) for i in range(3)]
+    )
+    summarizer.summarize.side_effect = ["S0", "S1", "Root"]
+
+    levels: list[list[list[float]]] = []
+
+    def cluster_nodes(embeddings: Iterator[list[float]], config: ProcessingConfig) -> list[Cluster]:
+        levels.append(list(embeddings))
+        if len(levels) == 1:
+            return [
+                Cluster(id=0, level=0, node_indices=[0, 1]),
+                Cluster(id=1, level=0, node_indices=[2]),
+            ]
+        return [Cluster(id=0, level=1, node_indices=[0, 1])]
+
+    clusterer.cluster_nodes.side_effect = cluster_nodes
+    engine = RaptorEngine(chunker, ListEmbedder(), clusterer, summarizer, config)  # type: ignore[arg-type]
+
+    tree = engine.run("Long text")
+
+    assert tree.root_node.text == "Root"
+    assert levels[1] == [pytest.approx([0.3, 0.4])] * 2
+
+
+def test_summarize_clusters_concurrent_preserves_order(
+    mock_dependencies: tuple[MagicMock, ...],
+) -> None:
+    """Concurrent summarization must emit SummaryNodes in cluster order."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    config = ProcessingConfig(summarization_concurrency=4)
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def slow_summarize(text: str, config: ProcessingConfig) -> str:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Earlier clusters finish later, so completion order is reversed.
+        time.sleep(0.01 * (10 - int(text.rsplit(maxsplit=1)[-1])))
+        with lock:
+            in_flight -= 1
+        return f"Summary of {text}"
+
+    summarizer.summarize.side_effect = slow_summarize
+
+    with DiskChunkStore() as store:
+        chunks = [
+            Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(10)
+        ]
+        store.add_chunks(chunks)
+        clusters = [Cluster(id=i, level=0, node_indices=[i]) for i in range(10)]
+
+        results = list(engine._summarize_clusters(clusters, list(range(10)), store, level=1))
+
+    assert [pos for pos, _ in results] == list(range(10))
+    nodes = [n for _, n in results]
+    assert [n.metadata["cluster_id"] for n in nodes] == list(range(10))
+    assert [n.text for n in nodes] == [f"Summary of Chunk {i}" for i in range(10)]
+    assert [n.children_indices for n in nodes] == [[i] for i in range(10)]
+    assert 1 < max_in_flight <= 4
+
+
+def test_level_zero_keeps_pooled_chunk_embeddings(
+    mock_dependencies: tuple[MagicMock, ...],
+) -> None:
+    """With pooled embeddings, only chunks without an embedding go to the embedder."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    config = ProcessingConfig(semantic_chunking_pool_embeddings=True)
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+
+    pooled = Chunk(index=0, text="a", start_char_idx=0, end_char_idx=1, embedding=[1.0, 0.0])
+    plain = Chunk(index=1, text="b", start_char_idx=1, end_char_idx=2)
+
+    def embed_chunks(chunks: list[Chunk]) -> Iterator[Chunk]:
+        for chunk in chunks:
+            chunk.embedding = [0.0, 1.0]
+            yield chunk
+
+    embedder.embed_chunks.side_effect = embed_chunks
+
+    result = list(engine._embed_level_zero(iter([pooled, plain])))
+
+    assert [c.index for c in result] == [0, 1]
+    assert [c.embedding for c in result] == [[1.0, 0.0], [0.0, 1.0]]
+    embedder.embed_chunks.assert_called_once_with([plain])
+
+
+def test_run_stream_feeds_file_sentences_to_chunker(
+    mock_dependencies: tuple[MagicMock, ...], config: ProcessingConfig, tmp_path: Path
+) -> None:
+    """run_stream passes the file's sentences lazily to split_sentences."""
+    _, embedder, clusterer, summarizer = mock_dependencies
+    chunker = create_autospec(JapaneseTokenChunker, instance=True)
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+    source = tmp_path / "input.txt"
+    source.write_text("文１。\n文２。", encoding="utf-8")
+
+    def split_sentences(sentences: Iterable[str], config: ProcessingConfig) -> Iterator[Chunk]:
+        text = "".join(sentences)
+        yield Chunk(index=0, text=text, start_char_idx=0, end_char_idx=len(text))
+
+    chunker.split_sentences.side_effect = split_sentences
+
+    def embed_chunks(chunks: Iterator[Chunk]) -> Iterator[Chunk]:
+        for chunk in chunks:
+            chunk.embedding = [0.1, 0.2]
+            yield chunk
+
+    embedder.embed_chunks.side_effect = embed_chunks
+    clusterer.cluster_nodes.side_effect = lambda embeddings, config: [
+        Cluster(id=0, level=0, node_indices=[0]) for _ in embeddings
+    ]
+
+    tree = engine.run_stream(source)
+
+    chunker.split_text.assert_not_called()
+    assert tree.root_node.text == "文1。文2。"
+    assert tree.leaf_chunk_ids == [0]
+
+
+def test_run_stream_falls_back_to_split_text(
+    mock_dependencies: tuple[MagicMock, ...], config: ProcessingConfig
+) -> None:
+    """Chunkers without split_sentences get the joined sentences through split_text."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+    chunker.split_text.return_value = iter(
+        [Chunk(index=0, text="文1。", start_char_idx=0, end_char_idx=3, embedding=[0.1, 0.2])]
+    )
+    embedder.embed_chunks.side_effect = iter
+    clusterer.cluster_nodes.side_effect = lambda embeddings, config: [
+        Cluster(id=0, level=0, node_indices=[0]) for _ in embeddings
+    ]
+
+    engine.run_stream(iter(["文１。", "文２"]))
+
+    assert chunker.split_text.call_args.args[0] == "文1。\n文2"
+
+
+def test_resume_skips_finished_levels_and_clusters(
+    mock_dependencies: tuple[MagicMock, ...], tmp_path: Path
+) -> None:
+    """A run that died during Level 1 summarization resumes without redoing earlier work."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    config = ProcessingConfig(chunk_buffer_size=1)
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+
+    chunker.split_text.side_effect = lambda text, config: iter(
+        Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(3)
+    )
+
+    def embed_chunks(chunks: Iterator[Chunk]) -> Iterator[Chunk]:
+        for c in chunks:
+            c.embedding = [0.1, 0.2]
+            yield c
+
+    embedder.embed_chunks.side_effect = embed_chunks
+    embedder.embed_strings_batched.side_effect = lambda texts: iter(
+        [np.full((len(texts), 2), 0.2, dtype=np.float32)]
+    )
+    embedder.embed_strings.side_effect = lambda texts: iter([[0.3, 0.4] for _ in texts])
+
+    def cluster_nodes(embeddings: Iterator[list[float]], config: ProcessingConfig) -> list[Cluster]:
+        list(embeddings)
+        return [
+            Cluster(id=0, level=0, node_indices=[0, 1]),
+            Cluster(id=1, level=0, node_indices=[2]),
+        ]
+
+    def cluster_arrays(blocks: Iterator[np.ndarray], config: ProcessingConfig) -> list[Cluster]:
+        list(blocks)
+        return [Cluster(id=0, level=1, node_indices=[0, 1])]
+
+    clusterer.cluster_nodes.side_effect = cluster_nodes
+    clusterer.cluster_arrays.side_effect = cluster_arrays
+    summarizer.summarize.side_effect = ["Summary A", RuntimeError("LLM down")]
+
+    with DiskChunkStore(tmp_path / "chunks.db") as store:
+        with pytest.raises(RuntimeError, match="LLM down"):
+            engine.run("Long text", store=store)
+
+        summarizer.summarize.side_effect = ["Summary B", "Root Summary"]
+        tree = engine.run("Long text", store=store, resume=True)
+
+        assert tree.root_node.text == "Root Summary"
+        assert isinstance(tree.all_nodes, StoredSummaryNodes)
+        assert [node.text for node in tree.all_nodes.values()] == [
+            "Summary A",
+            "Summary B",
+            "Root Summary",
+        ]
+        level_1 = [store.get_node(nid) for nid in tree.root_node.children_indices]
+        assert [n.text for n in level_1 if n] == ["Summary A", "Summary B"]
+        assert sorted(store.get_run_levels()) == [0, 1, 2]
+
+        # Chunking, Level 0 clustering and the first cluster ran only once
+        assert chunker.split_text.call_count == 2  # generator created, not consumed on resume
+        assert embedder.embed_chunks.call_count == 1
+        assert clusterer.cluster_nodes.call_count == 1
+        assert summarizer.summarize.call_count == 4
+
+        with pytest.raises(ValueError, match="different input"):
+            engine.run("Other text", store=store, resume=True)
+
+
+def test_update_resummarizes_only_dirty_paths(
+    mock_dependencies: tuple[MagicMock, ...], tmp_path: Path
+) -> None:
+    """An edited chunk joins the nearest cluster; only its cluster and ancestors are redone."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, ProcessingConfig())
+
+    def split_text(text: str, config: ProcessingConfig) -> Iterator[Chunk]:
+        for i, part in enumerate(text.split()):
+            yield Chunk(index=i, text=part, start_char_idx=0, end_char_idx=len(part))
+
+    def embed_chunks(chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        for c in chunks:
+            c.embedding = [1.0, 0.0] if c.text.startswith("a") else [0.0, 1.0]
+            yield c
+
+    def cluster_nodes(embeddings: Iterator[list[float]], config: ProcessingConfig) -> list[Cluster]:
+        list(embeddings)
+        return [
+            Cluster(id=0, level=0, node_indices=[0, 1], centroid=[1.0, 0.0]),
+            Cluster(id=1, level=0, node_indices=[2, 3], centroid=[0.0, 1.0]),
+        ]
+
+    def cluster_arrays(blocks: Iterator[np.ndarray], config: ProcessingConfig) -> list[Cluster]:
+        list(blocks)
+        return [Cluster(id=0, level=0, node_indices=[0, 1], centroid=[0.5, 0.5])]
+
+    chunker.split_text.side_effect = split_text
+    embedder.embed_chunks.side_effect = embed_chunks
+    embedder.embed_strings_batched.side_effect = lambda texts: iter(
+        [np.full((len(texts), 2), 0.5, dtype=np.float32)]
+    )
+    clusterer.cluster_nodes.side_effect = cluster_nodes
+    clusterer.cluster_arrays.side_effect = cluster_arrays
+    summarizer.summarize.side_effect = lambda text, config: "S(" + text.replace("\n\n", "+") + ")"
+
+    with DiskChunkStore(tmp_path / "chunks.db") as store:
+        tree = engine.run("a1 a2 b1 b2", store=store)
+        assert tree.root_node.text == "S(S(a1+a2)+S(b1+b2))"
+        kept_summary_id = tree.root_node.children_indices[0]
+        summarizer.summarize.reset_mock()
+        embedder.embed_chunks.reset_mock()
+
+        tree = engine.update("a1 a2 b1 b3", store=store)
+
+        assert tree.root_node.text == "S(S(a1+a2)+S(b1+b3))"
+        assert tree.root_node.children_indices[0] == kept_summary_id
+        assert tree.leaf_chunk_ids == [0, 1, 2, 4]
+        assert summarizer.summarize.call_count == 2
+        [changed] = embedder.embed_chunks.call_args.args[0]
+        assert changed.text == "b3"
+        assert store.get_node(3) is None  # Removed leaf is deleted
+        assert store.load_tree().root_node.id == tree.root_node.id
+
+        summarizer.summarize.reset_mock()
+        assert engine.update("a1 a2 b1 b3", store=store).root_node.id == tree.root_node.id
+        summarizer.summarize.assert_not_called()
+
+
+def test_pipelined_levels_embed_while_summarizing(
+    mock_dependencies: tuple[MagicMock, ...], tmp_path: Path
+) -> None:
+    """With pipeline_levels, summaries are embedded as they arrive, not after the level."""
+    chunker, embedder, clusterer, summarizer = mock_dependencies
+    config = ProcessingConfig(pipeline_levels=True, embedding_batch_size=1, chunk_buffer_size=1)
+    engine = RaptorEngine(chunker, embedder, clusterer, summarizer, config)
+
+    chunker.split_text.return_value = iter(
+        Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(6)
+    )
+
+    def embed_chunks(chunks: Iterator[Chunk]) -> Iterator[Chunk]:
+        for c in chunks:
+            c.embedding = [0.1, 0.2]
+            yield c
+
+    events: list[str] = []
+
+    def embed_strings_batched(texts: tuple[str, ...]) -> Iterator[np.ndarray]:
+        events.extend(f"embed {text}" for text in texts)
+        yield np.asarray([[float(len(events)), 0.5] for _ in texts], dtype=np.float32)
+
+    def summarize(text: str, config: ProcessingConfig) -> str:
+        time.sleep(0.05)
+        events.append(f"summarize {text}")
+        return f"Summary of {text}"
+
+    def cluster_nodes(embeddings: Iterator[list[float]], config: ProcessingConfig) -> list[Cluster]:
+        list(embeddings)
+        return [Cluster(id=i, level=0, node_indices=[2 * i, 2 * i + 1]) for i in range(3)]
+
+    l1_blocks: list[np.ndarray] = []
+
+    def cluster_arrays(blocks: Iterator[np.ndarray], config: ProcessingConfig) -> list[Cluster]:
+        l1_blocks.extend(blocks)
+        return [Cluster(id=0, level=1, node_indices=[0, 1, 2])]
+
+    embedder.embed_chunks.side_effect = embed_chunks
+    embedder.embed_strings_batched.side_effect = embed_strings_batched
+    summarizer.summarize.side_effect = summarize
+    clusterer.cluster_nodes.side_effect = cluster_nodes
+    clusterer.cluster_arrays.side_effect = cluster_arrays
+
+    with DiskChunkStore(tmp_path / "chunks.db") as store:
+        tree = engine.run("Long text", store=store)
+        level_1 = tree.root_node.children_indices
+        stored = np.concatenate(list(store.iter_embedding_blocks(level_1)))
+        nodes = [tree.all_nodes[str(nid)] for nid in level_1]
+
+    assert tree.root_node.text.startswith("Summary of")
+    # The first summary was embedded before the last Level 0 cluster was summarized
+    first_summary = "Summary of Chunk 0\n\nChunk 1"
+    assert events.index(f"embed {first_summary}") < events.index("summarize Chunk 4\n\nChunk 5")
+    # Level 1 was clustered from the stored embeddings, without embedding it again
+    assert sum(event.startswith("embed Summary of Chunk") for event in events) == 3
+    np.testing.assert_array_equal(np.concatenate(l1_blocks), stored)
+    np.testing.assert_array_equal([node.embedding for node in nodes], stored)
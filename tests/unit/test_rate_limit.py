@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+from domain_models.config import ProcessingConfig
+from matome.utils.rate_limit import TokenBucketRateLimiter, estimate_tokens
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("abcd" * 10) == 10
+    # Japanese characters are 3 bytes in UTF-8
+    assert estimate_tokens("あ" * 4) == 3
+
+
+def test_request_bucket_refills_over_time() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(requests_per_minute=2, clock=clock)
+
+    assert limiter._try_acquire(0) == 0.0
+    assert limiter._try_acquire(0) == 0.0
+    # Bucket is empty: one request refills in 30s
+    assert limiter._try_acquire(0) == pytest.approx(30.0)
+
+    clock.now = 30.0
+    assert limiter._try_acquire(0) == 0.0
+
+
+def test_token_bucket_limits_and_clamps() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(tokens_per_minute=600, clock=clock)
+
+    assert limiter._try_acquire(500) == 0.0
+    # 100 tokens left, 10 tokens/second refill
+    assert limiter._try_acquire(200) == pytest.approx(10.0)
+
+    # Oversized requests are clamped to capacity instead of waiting forever
+    clock.now = 60.0
+    assert limiter._try_acquire(10_000) == 0.0
+
+
+def test_from_config() -> None:
+    assert TokenBucketRateLimiter.from_config(ProcessingConfig()) is None
+    limiter = TokenBucketRateLimiter.from_config(ProcessingConfig(llm_requests_per_minute=10))
+    assert isinstance(limiter, TokenBucketRateLimiter)
+
+
+def test_invalid_limits() -> None:
+    with pytest.raises(ValueError, match="requests_per_minute"):
+        TokenBucketRateLimiter(requests_per_minute=0)
+
+
+def test_async_acquire_shared_between_tasks() -> None:
+    """Concurrent tasks draw from one budget and are delayed once it is exhausted."""
+    # 6000 tokens/min = 100 tokens/s
+    limiter = TokenBucketRateLimiter(tokens_per_minute=6000)
+
+    async def run() -> float:
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(3000) for _ in range(2)))
+        await limiter.acquire(20)
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert elapsed >= 0.15
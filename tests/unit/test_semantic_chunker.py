@@ -1,5 +1,7 @@
-from unittest.mock import MagicMock
+from collections.abc import Iterable, Iterator
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from domain_models.config import ProcessingConfig
@@ -9,7 +11,7 @@ from matome.engines.semantic_chunker import JapaneseSemanticChunker
 
 @pytest.fixture
 def mock_embedder() -> MagicMock:
-    # Mock embed_strings to return simple vectors
+    # Mock embed_strings_batched to return simple vector blocks
     return MagicMock(spec=EmbeddingService)
 
 
@@ -21,7 +23,9 @@ def test_semantic_chunker_merging_percentile(mock_embedder: MagicMock) -> None:
     text = "文1。文2。文3。"
 
     # Return vectors: S1=[1,0], S2=[1,0], S3=[0,1]
-    mock_embedder.embed_strings.return_value = [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]
+    mock_embedder.embed_strings_batched.return_value = [
+        np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+    ]
 
     chunker = JapaneseSemanticChunker(mock_embedder)
 
@@ -42,7 +46,7 @@ def test_semantic_chunker_max_tokens(mock_embedder: MagicMock) -> None:
     # Setup: 2 sentences, similar, but max_tokens limits merging.
     text = "長い文1。長い文2。"
 
-    mock_embedder.embed_strings.return_value = [[1.0, 0.0], [1.0, 0.0]]
+    mock_embedder.embed_strings_batched.return_value = [np.array([[1.0, 0.0], [1.0, 0.0]])]
 
     chunker = JapaneseSemanticChunker(mock_embedder)
     # len("長い文1。") + len("長い文2。") = 10.
@@ -83,9 +87,8 @@ def test_split_text_special_characters(mock_embedder: MagicMock) -> None:
     # Special characters
     text = "Test! @#$%^&*()_+ 123.\nAnother line."
 
-    mock_embedder.embed_strings.return_value = [
-        [1.0, 0.0],
-        [0.0, 1.0],
+    mock_embedder.embed_strings_batched.return_value = [
+        np.array([[1.0, 0.0], [0.0, 1.0]]),
     ]
 
     chunks = list(chunker.split_text(text, config))
@@ -94,3 +97,126 @@ def test_split_text_special_characters(mock_embedder: MagicMock) -> None:
     # With 90th percentile of [1.0], threshold is 1.0. 1.0 > 1.0 is False.
     assert "Test!" in chunks[0].text
     assert "Another line." in chunks[0].text
+
+
+def test_streaming_mode_matches_two_pass_within_warmup(mock_embedder: MagicMock) -> None:
+    """Streaming mode embeds each sentence once and gives the two-pass chunks for short texts."""
+    text = "文1。文2。文3。"
+    vectors = {"文1。": [1.0, 0.0], "文2。": [1.0, 0.0], "文3。": [0.0, 1.0]}
+    calls: list[list[str]] = []
+
+    def embed_strings_batched(sentences: Iterable[str]) -> Iterator[np.ndarray]:
+        batch = list(sentences)
+        calls.append(batch)
+        yield np.array([vectors[sentence] for sentence in batch])
+
+    mock_embedder.embed_strings_batched.side_effect = embed_strings_batched
+    chunker = JapaneseSemanticChunker(mock_embedder)
+    config = ProcessingConfig(
+        semantic_chunking_percentile=90, max_tokens=100, semantic_chunking_streaming=True
+    )
+
+    chunks = list(chunker.split_text(text, config))
+
+    assert [c.text for c in chunks] == ["文1。文2。", "文3。"]
+    assert calls == [["文1。", "文2。", "文3。"]]
+
+
+def test_streaming_mode_single_sentence(mock_embedder: MagicMock) -> None:
+    mock_embedder.embed_strings_batched.side_effect = lambda sentences: iter(
+        [np.ones((len(list(sentences)), 1))]
+    )
+    chunker = JapaneseSemanticChunker(mock_embedder)
+    config = ProcessingConfig(semantic_chunking_streaming=True)
+
+    chunks = list(chunker.split_text("文1。", config))
+
+    assert [(c.text, c.start_char_idx, c.end_char_idx) for c in chunks] == [("文1。", 0, 3)]
+
+
+def test_distances_carry_across_block_boundaries(mock_embedder: MagicMock) -> None:
+    """Distances from split blocks match one block, including the pair across the boundary."""
+    vectors = np.array([[1.0, 0.0], [3.0, 0.0], [0.0, 2.0], [1.0, 1.0], [0.0, 0.0]])
+    chunker = JapaneseSemanticChunker(mock_embedder)
+
+    mock_embedder.embed_strings_batched.return_value = [vectors]
+    whole = chunker._calculate_semantic_distances(["s"] * 5, ProcessingConfig())
+
+    mock_embedder.embed_strings_batched.return_value = [vectors[:2], vectors[2:3], vectors[3:]]
+    split = chunker._calculate_semantic_distances(["s"] * 5, ProcessingConfig())
+
+    expected = [0.0, 1.0, 1.0 - np.sqrt(0.5), 1.0]
+    np.testing.assert_allclose(whole, expected)
+    np.testing.assert_allclose(split, expected)
+
+
+def test_distances_reject_dimension_mismatch(mock_embedder: MagicMock) -> None:
+    mock_embedder.embed_strings_batched.return_value = [np.ones((2, 2)), np.ones((1, 3))]
+    chunker = JapaneseSemanticChunker(mock_embedder)
+
+    with pytest.raises(ValueError, match="dimension mismatch"):
+        chunker._calculate_semantic_distances(["s"] * 3, ProcessingConfig())
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_pooled_chunk_embeddings(mock_embedder: MagicMock, streaming: bool) -> None:
+    """Chunk embeddings are the length-weighted, re-normalized mean of sentence vectors."""
+    text = "文1。長い文2。文3。"
+    mock_embedder.embed_strings_batched.side_effect = lambda sentences: iter(
+        [np.array([[2.0, 0.0], [0.0, 1.0], [0.0, -1.0]])[: len(list(sentences))]]
+    )
+    chunker = JapaneseSemanticChunker(mock_embedder)
+    config = ProcessingConfig(
+        semantic_chunking_percentile=50,
+        max_tokens=100,
+        semantic_chunking_streaming=streaming,
+        semantic_chunking_pool_embeddings=True,
+    )
+
+    chunks = list(chunker.split_text(text, config))
+
+    assert [c.text for c in chunks] == ["文1。長い文2。", "文3。"]
+    # Weights 3 and 5 over [1, 0] and [0, 1], then normalized.
+    np.testing.assert_allclose(chunks[0].embedding, np.array([3.0, 5.0]) / np.sqrt(34))
+    np.testing.assert_allclose(chunks[1].embedding, [0.0, -1.0])
+    mock_embedder.embed_chunks.assert_not_called()
+
+
+def test_pooling_never_runs_two_pass(mock_embedder: MagicMock) -> None:
+    """Pooling chunks in one pass, so no sentence vectors are held for a second pass."""
+    mock_embedder.embed_strings_batched.side_effect = lambda sentences: iter(
+        [np.ones((len(list(sentences)), 2))]
+    )
+    chunker = JapaneseSemanticChunker(mock_embedder)
+    config = ProcessingConfig(semantic_chunking_pool_embeddings=True)
+
+    with patch.object(chunker, "_calculate_semantic_distances") as two_pass:
+        chunks = list(chunker.split_text("文1。文2。", config))
+
+    two_pass.assert_not_called()
+    assert all(c.embedding is not None for c in chunks)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_embed_strings_only_subclass_is_honored(streaming: bool) -> None:
+    """An EmbeddingService subclass that overrides only embed_strings is used for sentences."""
+
+    class ListEmbedder(EmbeddingService):
+        def embed_strings(self, texts: Iterable[str]) -> Iterator[list[float]]:
+            for text in texts:
+                yield [0.0, 1.0] if "3" in text else [1.0, 0.0]
+
+    config = ProcessingConfig(
+        semantic_chunking_percentile=90,
+        max_tokens=100,
+        semantic_chunking_streaming=streaming,
+        semantic_chunking_warmup=1,
+        embedding_batch_size=2,
+    )
+    chunker = JapaneseSemanticChunker(ListEmbedder(config))
+
+    with patch.object(EmbeddingService, "embed_strings_batched") as base_path:
+        chunks = list(chunker.split_text("文1。文2。文3。", config))
+
+    base_path.assert_not_called()
+    assert [c.text for c in chunks] == ["文1。文2。", "文3。"]
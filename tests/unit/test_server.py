@@ -0,0 +1,125 @@
+import http.client
+import json
+import logging
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from domain_models.config import ProcessingConfig
+from domain_models.manifest import Chunk, DocumentTree, SummaryNode
+from matome.engines.raptor import RaptorEngine
+from matome.server import JobManager, create_server
+from matome.utils.store import DiskChunkStore
+
+
+def fake_run(text: str, store: DiskChunkStore) -> DocumentTree:
+    """Stand-in for RaptorEngine.run: stores one chunk and a root summary."""
+    logging.getLogger("matome.engines.raptor").info("Processing Level 0. Node count: 1")
+    if text == "boom":
+        msg = "LLM down"
+        raise RuntimeError(msg)
+    store.add_chunk(Chunk(index=0, text=text, start_char_idx=0, end_char_idx=len(text)))
+    root = SummaryNode(id="root", text=f"Summary of {text}", level=1, children_indices=[0])
+    store.add_summary(root)
+    return DocumentTree(
+        root_node=root, all_nodes={"root": root}, leaf_chunk_ids=[0], metadata={"levels": 1}
+    )
+
+
+@pytest.fixture
+def server_address(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> Iterator[tuple[str, int]]:
+    caplog.set_level(logging.INFO, logger="matome")
+    engine = MagicMock(spec=RaptorEngine)
+    engine.config = ProcessingConfig()
+    engine.run.side_effect = fake_run
+
+    manager = JobManager(engine, workers=2, output_dir=tmp_path)
+    server = create_server(manager, port=0)
+    manager.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield str(host), int(port)
+    server.shutdown()
+    server.server_close()
+    manager.shutdown()
+
+
+def request(
+    address: tuple[str, int], method: str, path: str, payload: object = None
+) -> tuple[int, list[bytes]]:
+    """Send a request and return the status and the response body lines."""
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else None
+        conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, [line for line in response if line.strip()]
+    finally:
+        conn.close()
+
+
+def post_job(address: tuple[str, int], text: str) -> dict[str, object]:
+    status, [body] = request(address, "POST", "/jobs", {"text": text})
+    assert status == 202
+    return json.loads(body)
+
+
+def read_events(address: tuple[str, int], job_id: object) -> list[dict[str, object]]:
+    status, lines = request(address, "GET", f"/jobs/{job_id}/events")
+    assert status == 200
+    return [json.loads(line) for line in lines]
+
+
+def test_job_streams_progress_and_result(server_address: tuple[str, int], tmp_path: Path) -> None:
+    job = post_job(server_address, "Hello")
+    assert job["status"] == "queued"
+
+    events = read_events(server_address, job["id"])
+    kinds = [event["event"] for event in events]
+    assert kinds[:2] == ["queued", "started"]
+    assert {"event": "progress", "message": "Processing Level 0. Node count: 1"} in events
+    assert kinds[-1] == "done"
+
+    result = events[-1]["result"]
+    assert isinstance(result, dict)
+    assert result["root_summary"] == "Summary of Hello"
+    assert "# Summary of Hello" in str(result["markdown"])
+    assert (tmp_path / str(job["id"]) / "summary_all.md").exists()
+
+    status, [body] = request(server_address, "GET", f"/jobs/{job['id']}")
+    assert json.loads(body)["status"] == "done"
+
+
+def test_failed_job_reports_error(server_address: tuple[str, int]) -> None:
+    job = post_job(server_address, "boom")
+    events = read_events(server_address, job["id"])
+    assert events[-1]["event"] == "failed"
+    assert events[-1]["error"] == "LLM down"
+
+
+def test_invalid_requests(server_address: tuple[str, int]) -> None:
+    assert request(server_address, "POST", "/jobs", {"text": "  "})[0] == 400
+    assert request(server_address, "GET", "/jobs/unknown")[0] == 404
+
+    status, [body] = request(server_address, "GET", "/health")
+    assert status == 200
+    assert json.loads(body) == {"status": "ok", "workers": 2, "queued": 0}
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_invalid_content_length(server_address: tuple[str, int], content_length: str) -> None:
+    """A malformed or negative Content-Length is rejected instead of hanging the handler."""
+    conn = http.client.HTTPConnection(*server_address, timeout=10)
+    try:
+        conn.putrequest("POST", "/jobs")
+        conn.putheader("Content-Length", content_length)
+        conn.endheaders()
+        response = conn.getresponse()
+        assert response.status == 400
+        assert "Content-Length" in json.loads(response.read())["error"]
+    finally:
+        conn.close()
@@ -1,10 +1,13 @@
+import sqlite3
 from collections.abc import Iterator
 from pathlib import Path
 
+import numpy as np
+import pytest
 from sqlalchemy import text
 
-from domain_models.manifest import Chunk
-from matome.utils.store import TABLE_NODES, DiskChunkStore
+from domain_models.manifest import Chunk, Cluster, DocumentTree, SummaryNode
+from matome.utils.store import QUERY_BATCH_SIZE, TABLE_NODES, DiskChunkStore, StoredSummaryNodes
 
 
 def test_add_chunks_streaming(tmp_path: Path) -> None:
@@ -45,7 +48,7 @@ def test_update_node_embedding_direct(tmp_path: Path) -> None:
     # Fetch and verify
     fetched = store.get_node(chunk.index)
     assert fetched is not None
-    assert fetched.embedding == embedding
+    assert fetched.embedding == pytest.approx(embedding)
 
     # Verify content JSON didn't change (still lacks embedding if we stripped it, or has old one)
     # But get_node re-assembles it.
@@ -53,11 +56,12 @@ def test_update_node_embedding_direct(tmp_path: Path) -> None:
     # Check DB internals
     with store.engine.connect() as conn:
         row = conn.execute(
-            text(f"SELECT embedding FROM {TABLE_NODES} WHERE id=:id"),  # noqa: S608
+            text(f"SELECT embedding, embedding_blob FROM {TABLE_NODES} WHERE id=:id"),  # noqa: S608
             {"id": "0"},
         ).fetchone()
         assert row is not None
-        assert "[0.1, 0.2, 0.3]" in row[0]  # Stored as JSON string
+        assert row[0] is None  # No JSON copy
+        assert row[1] == np.array(embedding, dtype="<f4").tobytes()  # Stored as raw float32
 
     store.close()
 
@@ -72,17 +76,262 @@ def test_chunk_with_embedding_roundtrip(tmp_path: Path) -> None:
 
     fetched = store.get_node(1)
     assert fetched is not None
-    assert fetched.embedding == [0.9, 0.9]
+    assert fetched.embedding == pytest.approx([0.9, 0.9])
 
     # Verify separation in DB
     with store.engine.connect() as conn:
         row = conn.execute(
-            text(f"SELECT content, embedding FROM {TABLE_NODES} WHERE id=:id"),  # noqa: S608
+            text(f"SELECT content, embedding_blob FROM {TABLE_NODES} WHERE id=:id"),  # noqa: S608
             {"id": "1"},
         ).fetchone()
         assert row is not None
-        content_json, embedding_json = row
+        content_json, embedding_blob = row
         assert "embedding" not in content_json  # We excluded it
-        assert embedding_json == "[0.9, 0.9]"
+        assert len(embedding_blob) == 2 * 4  # Two float32 values
 
     store.close()
+
+
+def test_get_embedding_returns_float32_array(tmp_path: Path) -> None:
+    """Embeddings can be read back as NumPy arrays without deserializing the node."""
+    store = DiskChunkStore(tmp_path / "np_store.db")
+    store.add_chunk(
+        Chunk(index=0, text="Test", start_char_idx=0, end_char_idx=4, embedding=[0.5, -1.0])
+    )
+    store.add_chunk(Chunk(index=1, text="No vec", start_char_idx=0, end_char_idx=6))
+
+    vec = store.get_embedding(0)
+    assert isinstance(vec, np.ndarray)
+    assert vec.dtype == np.float32
+    np.testing.assert_array_equal(vec, [0.5, -1.0])
+    assert store.get_embedding(1) is None
+    assert store.get_embedding("missing") is None
+
+    store.close()
+
+
+def test_float16_storage_persists_dtype(tmp_path: Path) -> None:
+    """float16 stores halve the blob size and keep their dtype when reopened."""
+    db_path = tmp_path / "f16_store.db"
+    store = DiskChunkStore(db_path, embedding_dtype="float16")
+    store.add_chunk(
+        Chunk(index=0, text="Test", start_char_idx=0, end_char_idx=4, embedding=[0.25] * 8)
+    )
+    with store.engine.connect() as conn:
+        blob = conn.execute(text(f"SELECT embedding_blob FROM {TABLE_NODES}")).scalar()  # noqa: S608
+    assert len(blob) == 8 * 2
+    store.close()
+
+    # Reopening with the default dtype still decodes as float16
+    reopened = DiskChunkStore(db_path)
+    assert reopened.embedding_dtype == "float16"
+    vec = reopened.get_embedding(0)
+    assert vec is not None
+    assert vec.dtype == np.float32
+    np.testing.assert_array_equal(vec, [0.25] * 8)
+    reopened.close()
+
+
+def test_invalid_embedding_dtype() -> None:
+    with pytest.raises(ValueError, match="Unsupported embedding dtype"):
+        DiskChunkStore(embedding_dtype="int8")  # type: ignore[arg-type]
+
+
+def test_migrates_legacy_json_embeddings(tmp_path: Path) -> None:
+    """Databases written with JSON text embeddings are migrated to BLOBs on open."""
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            f"CREATE TABLE {TABLE_NODES} (id VARCHAR PRIMARY KEY, type VARCHAR, "
+            "content TEXT, embedding TEXT)"
+        )
+        chunk = Chunk(index=0, text="Legacy", start_char_idx=0, end_char_idx=6)
+        conn.execute(
+            f"INSERT INTO {TABLE_NODES} VALUES (?, ?, ?, ?)",  # noqa: S608
+            ("0", "chunk", chunk.model_dump_json(exclude={"embedding"}), "[0.5, 0.25]"),
+        )
+
+    store = DiskChunkStore(db_path)
+
+    fetched = store.get_node(0)
+    assert fetched is not None
+    assert fetched.text == "Legacy"
+    assert fetched.embedding == [0.5, 0.25]
+
+    with store.engine.connect() as conn:
+        row = conn.execute(
+            text(f"SELECT embedding, embedding_blob FROM {TABLE_NODES}")  # noqa: S608
+        ).fetchone()
+        assert row is not None
+        assert row[0] is None
+        assert row[1] is not None
+
+    store.close()
+
+
+def test_get_nodes_preserves_order_and_missing(tmp_path: Path) -> None:
+    """get_nodes returns results aligned with the requested IDs."""
+    store = DiskChunkStore(tmp_path / "bulk.db")
+    store.add_chunks(
+        Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7, embedding=[float(i)])
+        for i in range(5)
+    )
+    store.add_summary(SummaryNode(id="s1", text="Summary", level=1, children_indices=[0, 1]))
+
+    nodes = store.get_nodes([3, "s1", 42, 0])
+    assert [n.text if n else None for n in nodes] == ["Chunk 3", "Summary", None, "Chunk 0"]
+    assert nodes[0] is not None
+    assert nodes[0].embedding == [3.0]
+
+    text_only = store.get_nodes([1], with_embeddings=False)
+    assert text_only[0] is not None
+    assert text_only[0].embedding is None
+
+    store.close()
+
+
+def test_iter_nodes_batches_by_ids_level_and_type(tmp_path: Path) -> None:
+    """iter_nodes streams across multiple query batches for every selector."""
+    store = DiskChunkStore(tmp_path / "iter.db")
+    n_chunks = QUERY_BATCH_SIZE + 5
+    store.add_chunks(
+        Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(n_chunks)
+    )
+    store.add_summaries(
+        [
+            SummaryNode(id="a", text="A", level=1, children_indices=[0]),
+            SummaryNode(id="b", text="B", level=2, children_indices=["a"]),
+            SummaryNode(id="c", text="C", level=1, children_indices=[1]),
+        ]
+    )
+
+    ids = list(reversed(range(n_chunks)))
+    by_ids = list(store.iter_nodes(ids))
+    assert [n.index for n in by_ids if isinstance(n, Chunk)] == ids
+
+    level0 = list(store.iter_nodes(level=0))
+    assert len(level0) == n_chunks
+
+    level1 = list(store.iter_nodes(level=1))
+    assert [n.text for n in level1] == ["A", "C"]
+
+    summaries = list(store.iter_nodes(node_type="summary"))
+    assert [n.text for n in summaries] == ["A", "B", "C"]
+
+    with pytest.raises(ValueError, match="requires"):
+        list(store.iter_nodes())
+
+    store.close()
+
+
+def test_update_node_embeddings_batch(tmp_path: Path) -> None:
+    """Bulk embedding updates accept generators and skip None vectors."""
+    store = DiskChunkStore(tmp_path / "bulk_update.db")
+    store.add_chunks(
+        Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(3)
+    )
+
+    written = store.update_node_embeddings(
+        (i, np.full(4, i, dtype=np.float32) if i != 1 else None) for i in range(3)
+    )
+
+    assert written == 2
+    np.testing.assert_array_equal(store.get_embedding(0), [0.0] * 4)
+    assert store.get_embedding(1) is None
+    np.testing.assert_array_equal(store.get_embedding(2), [2.0] * 4)
+
+    store.close()
+
+
+def test_run_manifest_roundtrip(tmp_path: Path) -> None:
+    """Levels and per-cluster summaries persist across store instances and reset cleanly."""
+    store_path = tmp_path / "manifest.db"
+    clusters = [
+        Cluster(id=0, level=0, node_indices=[0, 2]),
+        Cluster(id=1, level=0, node_indices=[1]),
+    ]
+
+    with DiskChunkStore(store_path) as store:
+        store.reset_run("digest-1")
+        store.save_run_level(0, [0, 1, 2], clusters)
+        store.record_cluster_summaries(0, [(1, "summary-b")])
+
+    with DiskChunkStore(store_path) as store:
+        assert store.get_run_input_digest() == "digest-1"
+        assert store.get_run_levels() == {0: ([0, 1, 2], clusters)}
+        assert store.get_cluster_summaries(0) == {1: "summary-b"}
+
+        store.reset_run(None)
+        assert store.get_run_input_digest() is None
+        assert store.get_run_levels() == {}
+        assert store.get_cluster_summaries(0) == {}
+
+
+def test_save_and_load_tree(tmp_path: Path) -> None:
+    """The saved tree structure reloads into an equivalent DocumentTree."""
+    store_path = tmp_path / "tree.db"
+    chunks = [Chunk(index=i, text=f"Chunk {i}", start_char_idx=0, end_char_idx=7) for i in range(3)]
+    mid_a = SummaryNode(id="a", text="A", level=1, children_indices=[0, 1])
+    mid_b = SummaryNode(id="b", text="B", level=1, children_indices=[1, 2])
+    root = SummaryNode(id="r", text="Root", level=2, children_indices=["a", "b"])
+    tree = DocumentTree(
+        root_node=root,
+        all_nodes={"a": mid_a, "b": mid_b, "r": root},
+        leaf_chunk_ids=[0, 1, 2],
+        metadata={"levels": 2},
+    )
+
+    with DiskChunkStore(store_path) as store:
+        store.add_chunks(chunks)
+        store.add_summaries([mid_a, mid_b, root])
+        assert not store.has_tree()
+        store.save_tree(tree)
+
+    with DiskChunkStore(store_path) as store:
+        loaded = store.load_tree()
+        assert loaded.root_node == root
+        assert loaded.all_nodes == tree.all_nodes
+        assert loaded.leaf_chunk_ids == [0, 1, 2]
+        assert loaded.metadata == {"levels": 2}
+        assert store.get_tree_parents([1, "a"]) == {"1": ["a", "b"], "a": ["r"]}
+
+        # Re-saving a store-backed tree streams its nodes back out of the store
+        store.save_tree(loaded)
+        assert store.load_tree().all_nodes == tree.all_nodes
+
+
+def test_stored_summary_nodes_reads_on_access(tmp_path: Path) -> None:
+    """The lazy node mapping holds only IDs and caches a bounded number of nodes."""
+    nodes = [
+        SummaryNode(id=f"s{i}", text=f"S{i}", level=1, children_indices=[i], embedding=[0.5])
+        for i in range(5)
+    ]
+    with DiskChunkStore(tmp_path / "lazy.db") as store:
+        store.add_summaries(nodes)
+        store.add_chunk(Chunk(index=0, text="Chunk", start_char_idx=0, end_char_idx=5))
+        view = StoredSummaryNodes(store, ["s0", "s1", "s2", "s3", "s4", "0"], cache_size=2)
+
+        assert len(view) == 6
+        assert "s3" in view
+        assert "s9" not in view
+        assert view["s1"].text == "S1"
+        assert view["s1"].embedding is None  # embeddings stay in the store
+        assert view["s1"] is view["s1"]
+        with pytest.raises(KeyError):
+            _ = view["s9"]
+        with pytest.raises(KeyError):
+            _ = view["0"]  # chunks are not summary nodes
+
+        for node_id in ("s2", "s3", "s4"):
+            _ = view[node_id]
+        assert len(view._cache) == 2
+        assert [node.id for node in view.values()] == ["s0", "s1", "s2", "s3", "s4"]
+        assert dict(view.items())["s4"].text == "S4"
+
+
+def test_load_tree_without_saved_tree(tmp_path: Path) -> None:
+    with (
+        DiskChunkStore(tmp_path / "empty.db") as store,
+        pytest.raises(ValueError, match="no saved tree"),
+    ):
+        store.load_tree()
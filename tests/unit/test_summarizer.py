@@ -2,9 +2,11 @@
 Unit tests for the SummarizationAgent.
 """
 
-from collections.abc import Generator
-from typing import cast
-from unittest.mock import MagicMock, patch
+import asyncio
+from collections.abc import Coroutine, Generator
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.messages import AIMessage
@@ -12,7 +14,9 @@ from langchain_core.messages import AIMessage
 from domain_models.config import ProcessingConfig
 from matome.agents.summarizer import SummarizationAgent
 from matome.exceptions import SummarizationError
+from matome.utils.llm_cache import LLMResponseCache
 from matome.utils.prompts import COD_TEMPLATE
+from matome.utils.rate_limit import TokenBucketRateLimiter
 
 
 @pytest.fixture
@@ -149,3 +153,88 @@ def test_summarize_long_input_dos_prevention(
 
 # We removed test_summarize_retry_behavior as mocking tenacity is complex
 # and integration test covers error handling (test_pipeline_errors.py)
+
+
+def test_asummarize_uses_ainvoke(agent: SummarizationAgent, config: ProcessingConfig) -> None:
+    """The async API awaits llm.ainvoke and shares the response processing."""
+    llm_mock = cast(MagicMock, agent.llm)
+    llm_mock.ainvoke = AsyncMock(return_value=AIMessage(content="Async summary"))
+
+    results = asyncio.run(
+        _gather(agent.asummarize("context one", config), agent.asummarize("context two", config))
+    )
+
+    assert results == ["Async summary", "Async summary"]
+    assert llm_mock.ainvoke.await_count == 2
+    llm_mock.invoke.assert_not_called()
+
+
+def test_asummarize_waits_on_rate_limiter(config: ProcessingConfig) -> None:
+    """Each async request acquires from the shared rate limiter."""
+    limiter = MagicMock(spec=TokenBucketRateLimiter)
+    limiter.acquire = AsyncMock()
+    with patch("matome.agents.summarizer.get_openrouter_api_key", return_value=None):
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(return_value=AIMessage(content="ok"))
+        agent = SummarizationAgent(config, llm=llm, rate_limiter=limiter)
+
+    assert asyncio.run(agent.asummarize("context", config)) == "ok"
+    limiter.acquire.assert_awaited_once()
+    (tokens,), _ = limiter.acquire.await_args
+    assert tokens > config.max_summary_tokens
+
+
+async def _gather(*coros: Coroutine[Any, Any, str]) -> list[str]:
+    return list(await asyncio.gather(*coros))
+
+
+def test_summarize_uses_response_cache(config: ProcessingConfig, tmp_path: Path) -> None:
+    """Identical requests are served from the response cache without hitting the LLM."""
+    llm = MagicMock()
+    llm.invoke.return_value = AIMessage(content="Cached summary")
+
+    with LLMResponseCache(tmp_path / "llm.db") as cache:
+        agent = SummarizationAgent(config, llm=llm, response_cache=cache)
+        assert agent.summarize("same context", config) == "Cached summary"
+
+        # A fresh agent (e.g. a re-run) reuses the persisted response
+        rerun_agent = SummarizationAgent(config, llm=llm, response_cache=cache)
+        assert rerun_agent.summarize("same context", config) == "Cached summary"
+        llm.ainvoke = AsyncMock()
+        assert asyncio.run(rerun_agent.asummarize("same context", config)) == "Cached summary"
+
+        # Different input is a miss
+        rerun_agent.summarize("other context", config)
+
+        assert llm.invoke.call_count == 2
+        llm.ainvoke.assert_not_called()
+        assert cache.stats() == {"hits": 2, "misses": 2}
+
+
+def test_response_cache_key_uses_llm_temperature(tmp_path: Path) -> None:
+    """Summarizers whose LLMs sample at different temperatures don't share cache entries."""
+    cold_config = ProcessingConfig(llm_temperature=0.0)
+    warm_config = ProcessingConfig(llm_temperature=0.7)
+    cold_llm = MagicMock()
+    cold_llm.invoke.return_value = AIMessage(content="Cold summary")
+    warm_llm = MagicMock()
+    warm_llm.invoke.return_value = AIMessage(content="Warm summary")
+
+    with (
+        LLMResponseCache(tmp_path / "llm.db") as cache,
+        patch("matome.agents.summarizer.get_openrouter_api_key", return_value="sk-test-key"),
+        patch("matome.agents.summarizer.ChatOpenAI", side_effect=[cold_llm, warm_llm]),
+    ):
+        cold_agent = SummarizationAgent(cold_config, response_cache=cache)
+        warm_agent = SummarizationAgent(warm_config, response_cache=cache)
+
+        # The same per-call config must not make the two agents collide
+        assert cold_agent.summarize("same context", cold_config) == "Cold summary"
+        assert warm_agent.summarize("same context", cold_config) == "Warm summary"
+        assert len(cache) == 2
+
+    # An injected LLM brings its own temperature
+    injected = MagicMock()
+    injected.temperature = 0.7
+    agent = SummarizationAgent(cold_config, llm=injected)
+    assert agent.llm_temperature == 0.7
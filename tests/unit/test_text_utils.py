@@ -1,4 +1,11 @@
-from matome.utils.text import iter_sentences, normalize_text, split_sentences
+import numpy as np
+
+from matome.utils.text import (
+    iter_sentences,
+    iter_sentences_from_stream,
+    normalize_text,
+    split_sentences,
+)
 
 
 def test_iter_sentences_basic() -> None:
@@ -69,3 +76,23 @@ def test_normalize_text() -> None:
     assert normalize_text("ＡＢＣ") == "ABC"
     # Katakana might stay same?
     assert normalize_text("アイウ") == "アイウ"
+
+
+def test_iter_sentences_from_stream_matches_whole_text() -> None:
+    """Pieces split inside sentences, after punctuation and inside newline runs."""
+    text = "文１。  文２！\n\n\n文３？文４\n文５。"
+    pieces = ["文１", "。", " ", " 文２！\n", "\n", "\n文３？文", "４\n文５。"]
+
+    assert list(iter_sentences_from_stream(pieces)) == list(iter_sentences(text))
+    assert list(iter_sentences_from_stream([])) == []
+
+
+def test_iter_sentences_from_stream_random_splits() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        text = "".join(rng.choice(list("ab。！ \n"), size=rng.integers(0, 40)))
+        n_cuts = min(len(text) + 1, int(rng.integers(0, 8)))
+        cuts = sorted(rng.choice(len(text) + 1, size=n_cuts, replace=False).tolist())
+        pieces = [text[i:j] for i, j in zip([0, *cuts], [*cuts, len(text)], strict=True)]
+
+        assert list(iter_sentences_from_stream(pieces)) == list(iter_sentences(text))
@@ -138,3 +138,21 @@ def test_chunker_count_tokens() -> None:
     # Very long string case
     long_text = "word " * 1000
     assert chunker.count_tokens(long_text) > 0
+
+
+def test_chunker_batch_mode_matches_sequential() -> None:
+    """Windowed batch tokenization yields the same chunks as per-sentence encoding."""
+    chunker = JapaneseTokenChunker()
+    text = "これはテストです。" * 50 + "Hello world. 日本語もOKですか？はい。" * 20
+
+    sequential = list(chunker.split_text(text, ProcessingConfig(max_tokens=60)))
+    batched = list(
+        chunker.split_text(
+            text,
+            ProcessingConfig(max_tokens=60, tokenizer_batch_mode=True, tokenizer_batch_window=7),
+        )
+    )
+
+    assert [(c.text, c.start_char_idx) for c in batched] == [
+        (c.text, c.start_char_idx) for c in sequential
+    ]
@@ -1,5 +1,7 @@
+import asyncio
 import json
-from unittest.mock import MagicMock
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from langchain_core.messages import AIMessage
@@ -8,6 +10,8 @@ from domain_models.config import ProcessingConfig
 from domain_models.verification import VerificationResult
 from matome.agents.verifier import VerifierAgent
 from matome.exceptions import VerificationError
+from matome.utils.llm_cache import LLMResponseCache
+from matome.utils.rate_limit import TokenBucketRateLimiter
 
 
 @pytest.fixture
@@ -87,3 +91,54 @@ def test_verify_malformed_json(config: ProcessingConfig, mock_llm: MagicMock) ->
 
     with pytest.raises(VerificationError):
         agent.verify("summary", "source")
+
+
+def test_averify_success(config: ProcessingConfig, mock_llm: MagicMock) -> None:
+    mock_llm.ainvoke = AsyncMock(return_value=mock_llm.invoke.return_value)
+    agent = VerifierAgent(config, llm=mock_llm)
+
+    result = asyncio.run(agent.averify("The sky is blue.", "The sky is blue."))
+
+    assert result.score == 1.0
+    mock_llm.ainvoke.assert_awaited_once()
+    mock_llm.invoke.assert_not_called()
+
+
+def test_averify_shares_rate_limiter(config: ProcessingConfig, mock_llm: MagicMock) -> None:
+    mock_llm.ainvoke = AsyncMock(return_value=mock_llm.invoke.return_value)
+    limiter = TokenBucketRateLimiter(requests_per_minute=60)
+    agent = VerifierAgent(config, llm=mock_llm, rate_limiter=limiter)
+
+    assert agent.rate_limiter is limiter
+    asyncio.run(agent.averify("The sky is blue.", "The sky is blue."))
+    # One request has been drawn from the shared bucket
+    assert limiter._requests is not None
+    assert limiter._requests.level < 60
+
+
+def test_averify_malformed_json(config: ProcessingConfig, mock_llm: MagicMock) -> None:
+    mock_llm.ainvoke = AsyncMock(return_value=AIMessage(content="This is not JSON."))
+    agent = VerifierAgent(config, llm=mock_llm)
+
+    with pytest.raises(VerificationError):
+        asyncio.run(agent.averify("summary", "source"))
+
+
+def test_verify_does_not_cache_invalid_json(
+    config: ProcessingConfig, mock_llm: MagicMock, tmp_path: Path
+) -> None:
+    """Malformed replies are not cached, valid ones are."""
+    with LLMResponseCache(tmp_path / "llm.db") as cache:
+        agent = VerifierAgent(config, llm=mock_llm, response_cache=cache)
+        valid_reply = mock_llm.invoke.return_value
+
+        mock_llm.invoke.return_value = AIMessage(content="This is not JSON.")
+        with pytest.raises(VerificationError):
+            agent.verify("summary", "source")
+        assert len(cache) == 0
+
+        mock_llm.invoke.return_value = valid_reply
+        assert agent.verify("summary", "source").score == 1.0
+        assert agent.verify("summary", "source").score == 1.0
+        assert mock_llm.invoke.call_count == 2
+        assert len(cache) == 1